@@ -0,0 +1,186 @@
+import ssl
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Connections kept open to one host, and requests in flight to it
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 64
+
+# Seconds one request may take, connecting included
+DEFAULT_TIMEOUT = 30.0
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+async def read_head(reader: asyncio.StreamReader) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    The start line and headers, by lower-case name, of an HTTP/1.x message,
+    or None if the stream ended before it
+    """
+    start_line = await reader.readline()
+    if not start_line:
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n'):
+            break
+        if not line:
+            raise ConnectionResetError("Connection closed in the message headers")
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.strip().lower()
+        headers[name] = f"{headers[name]}, {value.strip()}" if name in headers else value.strip()
+    return start_line.decode('latin-1').rstrip('\r\n'), headers
+
+
+async def read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> Optional[bytes]:
+    """The body of a message framed by chunked encoding or Content-Length, or None if it is neither"""
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';', 1)[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append((await reader.readexactly(size + 2))[:-2])
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    return None
+
+
+class HTTPResponse:
+    """A response: status, headers by lower-case name, body, and seconds from sending to the last byte"""
+    __slots__ = ('status', 'headers', 'body', 'seconds')
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes, seconds: float = 0.0):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.seconds = seconds
+
+
+class _Connection:
+    __slots__ = ('reader', 'writer')
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class PooledHTTPClient:
+    """
+    A minimal asyncio HTTP/1.1 client that keeps connections alive and reuses
+    them, with at most max_connections_per_host requests in flight to each
+    host. A request that fails on a reused connection, which the server may
+    have closed while it sat idle, is retried once on a new connection.
+    """
+
+    def __init__(self, max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+                 timeout: float = DEFAULT_TIMEOUT, ssl_context: Optional[ssl.SSLContext] = None):
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._ssl_context = ssl_context
+        self._idle: Dict[Tuple[str, str, int], Deque[_Connection]] = {}
+        self._slots: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+
+    async def request(self, method: str, url: str, headers: Optional[List[Tuple[str, str]]] = None,
+                      body: bytes = b'') -> HTTPResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in _DEFAULT_PORTS or not parts.hostname:
+            raise ValueError(f"Not an http or https URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or _DEFAULT_PORTS[parts.scheme])
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        message = self._message(method, target, parts.netloc, headers or [], body)
+
+        slots = self._slots.get(key)
+        if slots is None:
+            slots = self._slots[key] = asyncio.Semaphore(self.max_connections_per_host)
+        async with slots:
+            started = time.perf_counter()
+            idle = self._idle.setdefault(key, deque())
+            while True:
+                reused = bool(idle)
+                connection = idle.pop() if reused else await self._connect(key)
+                try:
+                    response, keep_alive = await asyncio.wait_for(
+                        self._exchange(connection, message, method), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                if keep_alive:
+                    idle.append(connection)
+                else:
+                    connection.close()
+                response.seconds = time.perf_counter() - started
+                return response
+
+    async def _connect(self, key: Tuple[str, str, int]) -> _Connection:
+        scheme, host, port = key
+        context = None
+        if scheme == 'https':
+            context = self._ssl_context or ssl.create_default_context()
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port, ssl=context), self.timeout)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    @staticmethod
+    def _message(method: str, target: str, host: str, headers: List[Tuple[str, str]], body: bytes) -> bytes:
+        names = {name.lower() for name, _ in headers}
+        lines = [f"{method} {target} HTTP/1.1"]
+        if 'host' not in names:
+            lines.append(f"Host: {host}")
+        lines.extend(f"{name}: {value}" for name, value in headers if name.lower() != 'content-length')
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            lines.append(f"Content-Length: {len(body)}")
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+    @staticmethod
+    async def _exchange(connection: _Connection, message: bytes, method: str) -> Tuple[HTTPResponse, bool]:
+        connection.writer.write(message)
+        await connection.writer.drain()
+
+        reader = connection.reader
+        head = await read_head(reader)
+        if head is None:
+            raise ConnectionResetError("Connection closed before the response")
+        status_line, headers = head
+        version, status = status_line.split(None, 2)[:2]
+
+        status = int(status)
+        connection_header = headers.get('connection', '').lower()
+        keep_alive = 'close' not in connection_header and (version == 'HTTP/1.1' or 'keep-alive' in connection_header)
+        if method == 'HEAD' or status in (204, 304) or status < 200:
+            body = b''
+        else:
+            body = await read_body(reader, headers)
+            if body is None:
+                body = await reader.read()
+                keep_alive = False
+        return HTTPResponse(status, headers, body), keep_alive
+
+    async def close(self) -> None:
+        """Close every idle connection"""
+        for idle in self._idle.values():
+            while idle:
+                idle.pop().close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,246 @@
+import os
+import json
+import asyncio
+import logging
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from readyapi_project_parser import ProjectFilter, parse_project_bytes, parse_project_stream
+from project_archives import is_zip_path, list_archive_projects, open_archive_member, unique_stem
+from main_converter_runner import (
+    COLLECTION_SUFFIX,
+    ENVIRONMENT_SUFFIX,
+    build_collection_for_project,
+    build_environment,
+)
+
+logger = logging.getLogger(__name__)
+
+# Projects between reading and writing at once; each holds its XML and collection in memory
+DEFAULT_MAX_IN_FLIGHT = 2
+
+# Threads reading and writing files
+DEFAULT_IO_WORKERS = 4
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _write_text(path: str, text: str) -> None:
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def convert_project_bytes(data: bytes, project_filter: Optional[ProjectFilter]) -> Tuple[str, str, str]:
+    """
+    Process pool entry point: parse and convert one project, which may be gzip-compressed.
+
+    Returns the project name and the collection and environment, already
+    serialized so the parent only has to write them out.
+    """
+    return _serialized_conversion(parse_project_bytes(data, project_filter))
+
+
+def convert_archive_member(zip_path: str, member: str, project_filter: Optional[ProjectFilter]) -> Tuple[str, str, str]:
+    """Process pool entry point: like convert_project_bytes, streaming the project out of a zip archive"""
+    with zipfile.ZipFile(zip_path) as archive, open_archive_member(archive, member) as stream:
+        project = parse_project_stream(stream, project_filter)
+    return _serialized_conversion(project)
+
+
+def _serialized_conversion(project) -> Tuple[str, str, str]:
+    project_name, collection = build_collection_for_project(project)
+    return (project_name,
+            json.dumps(collection, indent=2),
+            json.dumps(build_environment(project_name), indent=2))
+
+
+class ProjectResult:
+    """Outcome of converting one project in a batch; member names the project inside a zip input_file"""
+    __slots__ = ('input_file', 'member', 'output_file', 'env_file', 'project_name', 'error')
+
+    def __init__(self, input_file: str, output_file: Optional[str] = None, env_file: Optional[str] = None,
+                 project_name: Optional[str] = None, error: Optional[BaseException] = None,
+                 member: Optional[str] = None):
+        self.input_file = input_file
+        self.member = member
+        self.output_file = output_file
+        self.env_file = env_file
+        self.project_name = project_name
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        outcome = f"error={self.error!r}" if self.error else f"output_file={self.output_file!r}"
+        member = f", member={self.member!r}" if self.member else ""
+        return f"ProjectResult({self.input_file!r}{member}, {outcome})"
+
+
+class BatchOrchestrator:
+    """
+    Convert ReadyAPI projects concurrently with asyncio.
+
+    Files are read and written on a thread pool, parsing and conversion run
+    on a process pool, and a semaphore bounds the number of projects in
+    flight so memory stays bounded however many are queued. Use it as an
+    async context manager so both pools are shut down:
+
+        async with BatchOrchestrator('out') as orchestrator:
+            result = await orchestrator.convert_project('project.xml')
+    """
+
+    def __init__(self, output_dir: str, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 process_workers: Optional[int] = None, io_workers: int = DEFAULT_IO_WORKERS,
+                 write_environment: bool = True, project_filter: Optional[ProjectFilter] = None):
+        self.output_dir = output_dir
+        self.max_in_flight = max_in_flight
+        self.write_environment = write_environment
+        self.project_filter = project_filter if project_filter is not None else ProjectFilter()
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='batch-io')
+        self._process_pool = ProcessPoolExecutor(max_workers=process_workers or os.cpu_count() or 1)
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._stems: Set[str] = set()
+        self._output_stems: Dict[Tuple[str, Optional[str]], str] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it belongs to the running event loop
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        return self._in_flight
+
+    def output_paths(self, path: str, member: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Collection and environment paths for a project file, or a member of a
+        zip archive. Projects sharing a file name get a '_' suffix, in the
+        order their paths are first asked for.
+        """
+        key = (os.path.abspath(path), member)
+        stem = self._output_stems.get(key)
+        if stem is None:
+            stem = self._output_stems[key] = unique_stem(member or path, self._stems)
+        return (os.path.join(self.output_dir, stem + COLLECTION_SUFFIX),
+                os.path.join(self.output_dir, stem + ENVIRONMENT_SUFFIX))
+
+    async def convert_project(self, path: str, output_file: Optional[str] = None,
+                              env_file: Optional[str] = None, member: Optional[str] = None) -> ProjectResult:
+        """
+        Convert one project, waiting for a free slot first. With member, the
+        project is that member of the zip archive at path. Output paths
+        default to output_paths(path, member); raises if the conversion fails.
+        """
+        default_output, default_env = self.output_paths(path, member)
+        output_file = output_file or default_output
+        env_file = (env_file or default_env) if self.write_environment else None
+        loop = asyncio.get_running_loop()
+
+        async with self._semaphore():
+            if member is None:
+                logger.info(f"Converting {path}")
+                data = await loop.run_in_executor(self._io_pool, _read_bytes, path)
+                project_name, collection_text, environment_text = await loop.run_in_executor(
+                    self._process_pool, convert_project_bytes, data, self.project_filter)
+                del data
+            else:
+                # The worker streams the member out of the archive itself
+                logger.info(f"Converting {member} from {path}")
+                project_name, collection_text, environment_text = await loop.run_in_executor(
+                    self._process_pool, convert_archive_member, path, member, self.project_filter)
+
+            os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+            writes = [loop.run_in_executor(self._io_pool, _write_text, output_file, collection_text)]
+            if env_file:
+                writes.append(loop.run_in_executor(self._io_pool, _write_text, env_file, environment_text))
+            await asyncio.gather(*writes)
+
+        logger.info(f"Postman collection for {member or path} written to {output_file}")
+        return ProjectResult(path, output_file, env_file, project_name, member=member)
+
+    async def convert_all(self, paths: Iterable[str]) -> List[ProjectResult]:
+        """
+        Convert every project, in flight max_in_flight at a time; zip archives
+        contribute every project XML inside them. Failures are logged and
+        reported in the results instead of being raised.
+        """
+        loop = asyncio.get_running_loop()
+        jobs = []
+        results = {}
+        for path in paths:
+            if not is_zip_path(path):
+                jobs.append((path, None))
+                continue
+            try:
+                members = await loop.run_in_executor(self._io_pool, list_archive_projects, path)
+            except (OSError, zipfile.BadZipFile) as e:
+                logger.error(f"Failed to read archive {path}: {str(e)}")
+                results[(path, None)] = ProjectResult(path, error=e)
+                jobs.append((path, None))
+                continue
+            jobs.extend((path, member) for member in members)
+
+        pending = [job for job in jobs if job not in results]
+        outcomes = await asyncio.gather(*(self.convert_project(path, member=member) for path, member in pending),
+                                        return_exceptions=True)
+        for (path, member), outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Failed to convert {member or path}: {str(outcome)}")
+                outcome = ProjectResult(path, error=outcome, member=member)
+            results[(path, member)] = outcome
+        return [results[job] for job in jobs]
+
+    def close(self) -> None:
+        self._io_pool.shutdown()
+        self._process_pool.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+def find_projects(paths: Iterable[str]) -> List[str]:
+    """Expand directories to the project files (.xml, .xml.gz) and zip archives directly inside them"""
+    projects = []
+    for path in paths:
+        if os.path.isdir(path):
+            projects.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                   if name.lower().endswith(('.xml', '.xml.gz', '.zip'))))
+        else:
+            projects.append(path)
+    return projects
+
+
+# Entry point
+if __name__ == '__main__':
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert many ReadyAPI projects to Postman collections concurrently')
+    parser.add_argument('inputs', nargs='+',
+                        help='Project XML files (.xml, .xml.gz), zip archives of them, or directories containing either')
+    parser.add_argument('--output-dir', required=True, help='Directory for the collections and environments')
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help='Projects converted at once; bounds memory use')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Conversion processes (0 uses every CPU)')
+    parser.add_argument('--io-workers', type=int, default=DEFAULT_IO_WORKERS,
+                        help='Threads reading and writing files')
+    parser.add_argument('--no-env', action='store_true', help='Do not write environment files')
+    args = parser.parse_args()
+
+    async def main() -> List[ProjectResult]:
+        async with BatchOrchestrator(args.output_dir, max_in_flight=args.max_in_flight,
+                                     process_workers=args.workers or None, io_workers=args.io_workers,
+                                     write_environment=not args.no_env) as orchestrator:
+            return await orchestrator.convert_all(find_projects(args.inputs))
+
+    results = asyncio.run(main())
+    failed = [result for result in results if not result.ok]
+    print(f"\n✅ Converted {len(results) - len(failed)} of {len(results)} projects into {args.output_dir}")
+    sys.exit(1 if failed else 0)
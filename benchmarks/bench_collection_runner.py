@@ -0,0 +1,96 @@
+"""
+Wall time of running a converted synthetic collection against a local
+mock_server, with collection_runner one folder at a time and with
+concurrent folders, and with Newman when it is on the PATH.
+
+    python benchmarks/bench_collection_runner.py --suites 20 --cases 10 --steps 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from collection_runner import run_collection  # noqa: E402
+from main_converter_runner import run_readyapi_to_postman  # noqa: E402
+from synthetic_project import write_synthetic_project  # noqa: E402
+
+# The synthetic project's requests all POST to the root of its endpoint
+MOCK_SERVICES = {"mock_services": [{"name": "Synthetic", "type": "rest", "port": 0, "path": "/", "operations": [
+    {"name": "items", "method": "POST", "path": "/", "dispatch": "default", "default_response": 0,
+     "responses": [{"name": "ok", "status": 200, "headers": [["Content-Type", "application/json"]],
+                    "body": '{"status": "OK"}'}]}]}]}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(port: int) -> None:
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("Mock server did not start")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time collection_runner against Newman on a synthetic collection")
+    parser.add_argument("--suites", type=int, default=20)
+    parser.add_argument("--cases", type=int, default=10, help="Test cases per suite")
+    parser.add_argument("--steps", type=int, default=10, help="Test steps per case")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = os.path.join(tmp, "project.xml")
+        collection_path = os.path.join(tmp, "collection.json")
+        mocks_path = os.path.join(tmp, "mocks.json")
+        total = write_synthetic_project(xml_path, args.suites, args.cases, args.steps, step_types=("restrequest",))
+        run_readyapi_to_postman(xml_path, collection_path)
+        with open(collection_path) as f:
+            collection = json.load(f)
+        with open(mocks_path, "w") as f:
+            json.dump(MOCK_SERVICES, f)
+
+        port = free_port()
+        target = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, "mock_server.py"), mocks_path,
+                                   "--port", str(port)], stderr=subprocess.DEVNULL)
+        try:
+            wait_for(port)
+            results = {}
+            for mode, concurrency in (("sequential", 1), ("concurrent", 8)):
+                report = asyncio.run(run_collection(collection, {}, target, concurrency))
+                results[mode] = (report["seconds"], report["summary"]["count"])
+            if shutil.which("newman"):
+                # Newman sends to the collection's own URLs; point them at the mock server
+                with open(collection_path) as f:
+                    retargeted = f.read().replace("https://api.example.com", target)
+                newman_path = os.path.join(tmp, "newman.json")
+                with open(newman_path, "w") as f:
+                    f.write(retargeted)
+                started = time.perf_counter()
+                subprocess.run(["newman", "run", newman_path, "--reporters", "cli", "--reporter-cli-no-summary"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                results["newman"] = (time.perf_counter() - started, total)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"steps: {total}")
+    for mode, (seconds, count) in results.items():
+        print(f"{mode:<11} {seconds:7.2f}s  {count / seconds:8.0f} requests/s  ({count} requests)")
+    if "newman" not in results:
+        print("newman      not on PATH, skipped")
@@ -0,0 +1,48 @@
+"""
+Parsing a composite (directory-format) project serially and with worker
+processes, against parsing its largest single file.
+
+    python benchmarks/bench_composite_parse.py --steps 200000 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from readyapi_project_parser import parse_project_file  # noqa: E402
+from synthetic_project import split_into_composite, write_synthetic_project  # noqa: E402
+
+
+def largest_file(project_dir: str) -> str:
+    paths = [os.path.join(directory, name) for directory, _, names in os.walk(project_dir) for name in names]
+    return max(paths, key=os.path.getsize)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare serial and parallel parsing of a composite project")
+    parser.add_argument("--steps", type=int, default=200000)
+    parser.add_argument("--suites", type=int, default=40)
+    parser.add_argument("--cases", type=int, default=50, help="Test cases per suite")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = os.path.join(tmp, "project.xml")
+        project_dir = os.path.join(tmp, "composite")
+        steps_per_case = max(1, args.steps // (args.suites * args.cases))
+        count = write_synthetic_project(xml_path, args.suites, args.cases, steps_per_case)
+        split_into_composite(xml_path, project_dir)
+        print(f"{count} steps in {args.suites * args.cases} case files")
+
+        started = time.perf_counter()
+        ET.parse(largest_file(project_dir))
+        print(f"largest file:            {time.perf_counter() - started:.2f}s")
+        for workers in (1, args.workers):
+            started = time.perf_counter()
+            project = parse_project_file(project_dir, workers=workers)
+            assert len(project.test_suites) == args.suites
+            print(f"composite, {workers:>2} worker(s): {time.perf_counter() - started:.2f}s")
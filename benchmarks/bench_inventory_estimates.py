@@ -0,0 +1,100 @@
+"""
+Calibrate the conversion cost model of project_inventory.py.
+
+Converts synthetic projects of one step type each with the command line,
+fits start-up time, seconds per MB parsed, seconds per converted step and collection bytes
+per step and per body byte, then checks the estimate on a mixed project.
+
+    python benchmarks/bench_inventory_estimates.py --steps 20000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from project_inventory import take_inventory  # noqa: E402
+from synthetic_project import write_synthetic_project  # noqa: E402
+
+SMALL_PAYLOAD = 200
+LARGE_PAYLOAD = 2000
+
+
+def convert(xml_path: str, output_file: str) -> float:
+    """Seconds taken by a command-line conversion, as a user would run it"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "main_converter_runner.py"),
+                    "--input", xml_path, "--output", output_file],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def measure(tmp: str, step_types, steps: int, payload_size: int):
+    xml_path = os.path.join(tmp, f"{'_'.join(step_types)}_{steps}_{payload_size}.xml")
+    output_file = xml_path + ".json"
+    write_synthetic_project(xml_path, suites=10, cases_per_suite=20, steps_per_case=max(1, steps // 200),
+                            step_types=step_types, payload_size=payload_size)
+    inventory = take_inventory(xml_path)
+    seconds = convert(xml_path, output_file)
+    content_bytes = inventory.request_body_bytes + inventory.groovy_bytes
+    return inventory, seconds, os.path.getsize(output_file), content_bytes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate the inventory's conversion estimates")
+    parser.add_argument("--steps", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Skipped steps are parsed but not converted: three runs give start-up time,
+        # parse rate and the cost of skipping a step
+        runs = [measure(tmp, ["jdbc"], steps, payload)
+                for steps, payload in ((args.steps, SMALL_PAYLOAD), (args.steps, LARGE_PAYLOAD),
+                                       (2 * args.steps, SMALL_PAYLOAD))]
+        (base, base_seconds, _, _), (larger, larger_seconds, _, _), (longer, longer_seconds, _, _) = runs
+        seconds_per_mb = (larger_seconds - base_seconds) / ((larger.input_bytes - base.input_bytes) / (1 << 20))
+        skip_seconds = ((longer_seconds - base_seconds
+                         - seconds_per_mb * (longer.input_bytes - base.input_bytes) / (1 << 20))
+                        / (longer.steps - base.steps))
+        startup_seconds = base_seconds - seconds_per_mb * base.input_bytes / (1 << 20) - skip_seconds * base.steps
+        print(f"STARTUP_SECONDS = {startup_seconds:.2f}")
+        print(f"PARSE_SECONDS_PER_MB = {seconds_per_mb:.3f}")
+        print(f"SKIPPED_SECONDS_PER_STEP = {skip_seconds:.5f}")
+
+        requests = None
+        for step_type in ("restrequest", "groovy", "properties"):
+            # A Groovy script is carried by the request after it, so Groovy steps are measured
+            # between requests and the requests' share, fitted first, is taken off
+            step_types = [step_type, "restrequest"] if step_type == "groovy" else [step_type]
+            fits = []
+            for payload in (SMALL_PAYLOAD, LARGE_PAYLOAD):
+                inventory, seconds, output, content = measure(tmp, step_types, args.steps, payload)
+                seconds -= startup_seconds + seconds_per_mb * inventory.input_bytes / (1 << 20)
+                if step_type == "groovy":
+                    request_steps = inventory.step_types["restrequest"]
+                    seconds -= requests[0] * request_steps
+                    output -= requests[1] * request_steps + requests[2] * inventory.request_body_bytes
+                    content = inventory.groovy_bytes
+                fits.append((inventory.step_types[step_type], seconds, output, content))
+            # output = steps * per_step_bytes + content_bytes * per_content_byte, solved from both sizes
+            (steps, small_seconds, small_output, small_content), (_, large_seconds, large_output, large_content) = fits
+            per_step = max(0.0, (small_seconds + large_seconds) / 2 / steps)
+            per_content_byte = ((large_output - small_output) / (large_content - small_content)
+                                if large_content != small_content else 0.0)
+            per_step_bytes = (small_output - per_content_byte * small_content) / steps
+            if step_type == "restrequest":
+                requests = (per_step, per_step_bytes, per_content_byte)
+            print(f"{step_type:<12} seconds/step {per_step:.5f}  "
+                  f"bytes/step {per_step_bytes:.0f}  bytes/content byte {per_content_byte:.2f}")
+
+        mixed_path = os.path.join(tmp, "mixed.xml")
+        write_synthetic_project(mixed_path, suites=10, cases_per_suite=20, steps_per_case=max(1, args.steps // 200))
+        inventory = take_inventory(mixed_path)
+        estimated_seconds, estimated_bytes = inventory.estimate()
+        seconds = convert(mixed_path, mixed_path + ".json")
+        print(f"mixed project: estimated {estimated_seconds:.1f}s / {estimated_bytes / (1 << 20):.1f} MB, "
+              f"actual {seconds:.1f}s / {os.path.getsize(mixed_path + '.json') / (1 << 20):.1f} MB")
@@ -0,0 +1,81 @@
+"""
+Eager vs. lazy (mmap-backed) step configs on a project dominated by skipped steps.
+
+Each mode runs in a fresh child process so that peak RSS is not shared:
+the child parses the project and then walks every step the way
+main_converter_runner does, loading configs only for steps it would convert.
+
+    python benchmarks/bench_lazy_configs.py --steps 200000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+# Four skipped steps for every REST request
+SKIPPED_MIX = ("jdbc", "mockresponse", "loadtest", "jdbc", "restrequest")
+
+
+def run_child(xml_path: str, lazy: bool) -> dict:
+    from readyapi_project_parser import parse_project_file
+    from step_conversion_logger import SKIPPED_TYPES
+
+    started = time.perf_counter()
+    project = parse_project_file(xml_path, lazy_configs=lazy)
+    parsed = time.perf_counter()
+    loaded = 0
+    for suite in project.test_suites:
+        for case in suite.test_cases:
+            for step in case.test_steps:
+                if step.step_type.lower() in SKIPPED_TYPES:
+                    continue
+                loaded += step.config is not None
+    finished = time.perf_counter()
+    return {
+        "parse_seconds": parsed - started,
+        "total_seconds": finished - started,
+        "configs_loaded": loaded,
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def measure(xml_path: str, lazy: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", xml_path] + (["--lazy"] if lazy else []),
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare eager and lazy step configs")
+    parser.add_argument("--steps", type=int, default=200000)
+    parser.add_argument("--payload-size", type=int, default=400)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--lazy", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.lazy)))
+        sys.exit(0)
+
+    from synthetic_project import write_synthetic_project
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = os.path.join(tmp, "skipped.xml")
+        total = write_synthetic_project(xml_path, max(1, args.steps // 500), 50, 10, SKIPPED_MIX,
+                                        payload_size=args.payload_size)
+        size_mib = os.path.getsize(xml_path) / 2**20
+        results = {mode: measure(xml_path, mode == "lazy") for mode in ("eager", "lazy")}
+
+    print(f"steps: {total}  file: {size_mib:.1f} MiB  skipped share: {1 - 1 / len(SKIPPED_MIX):.0%}")
+    for mode, r in results.items():
+        print(f"{mode:6s} parse {r['parse_seconds']:6.2f}s  total {r['total_seconds']:6.2f}s  "
+              f"peak RSS {r['peak_rss_mib']:7.1f} MiB  configs loaded {r['configs_loaded']}")
@@ -0,0 +1,74 @@
+"""
+Route lookup time of mock_server's precompiled routes against a linear scan
+of regular expressions, one per operation, as a mock server matching each
+request against its operations in turn would do.
+
+    python benchmarks/bench_mock_routing.py --operations 5000 --lookups 20000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mock_server import MockRoutes  # noqa: E402
+
+
+def mock_services(operations: int):
+    """A REST mock service with a mix of static and templated operation paths"""
+    methods = ("GET", "POST", "PUT", "DELETE")
+    definitions = []
+    for i in range(operations):
+        path = f"/resource{i // 4}/items/{{id}}/detail{i % 7}" if i % 2 else f"/resource{i // 4}/list{i % 7}"
+        definitions.append({"name": f"op{i}", "method": methods[i % 4], "path": path, "dispatch": "sequence",
+                            "default_response": 0,
+                            "responses": [{"name": "ok", "status": 200, "headers": [], "body": "{}"}]})
+    return [{"name": "Bench", "type": "rest", "port": 0, "path": "/api", "operations": definitions}]
+
+
+def linear_routes(services):
+    routes = []
+    for service in services:
+        for operation in service["operations"]:
+            pattern = re.sub(r"\\{[^/]+?\\}", "[^/]+", re.escape(service["path"] + operation["path"]))
+            routes.append((operation["method"], re.compile(pattern + "/?$"), operation["name"]))
+    return routes
+
+
+def linear_match(routes, method, path):
+    for route_method, pattern, name in routes:
+        if route_method == method and pattern.match(path):
+            return name
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare mock route lookup with a linear scan")
+    parser.add_argument("--operations", type=int, default=5000, help="Mocked operations")
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    services = mock_services(args.operations)
+    random.seed(1)
+    requests = []
+    for _ in range(args.lookups):
+        operation = random.choice(services[0]["operations"])
+        requests.append((operation["method"], "/api" + operation["path"].replace("{id}", str(random.randint(1, 999)))))
+
+    started = time.perf_counter()
+    routes = MockRoutes(services)
+    compile_seconds = time.perf_counter() - started
+    linear = linear_routes(services)
+
+    timings = {}
+    for mode, match in (("compiled", lambda method, path: routes.rest.match(method, path)),
+                        ("linear", lambda method, path: linear_match(linear, method, path))):
+        started = time.perf_counter()
+        misses = sum(match(method, path) is None for method, path in requests)
+        timings[mode] = (time.perf_counter() - started) / len(requests) * 1e6
+        print(f"{mode:<10} {timings[mode]:10.2f} µs/lookup  ({misses} misses)")
+    print(f"compile    {compile_seconds * 1000:10.1f} ms for {args.operations} operations")
+    print(f"speed-up   {timings['linear'] / timings['compiled']:10.1f}x")
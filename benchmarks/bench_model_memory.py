@@ -0,0 +1,120 @@
+"""
+Per-step memory of the parsed project model.
+
+Parses a synthetic project with tracemalloc running, once with the slotted
+model from readyapi_project_parser and once with the previous dict-based
+classes patched in, and reports the memory retained by each model.
+
+    python benchmarks/bench_model_memory.py --steps 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import readyapi_project_parser  # noqa: E402
+from synthetic_project import write_synthetic_project  # noqa: E402
+
+
+class LegacyInterface:
+    def __init__(self, name, path, method, endpoint, media_type, headers=None, body=None, description=None):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.endpoint = endpoint
+        self.media_type = media_type
+        self.headers = headers or {}
+        self.body = body or ""
+        self.description = description or ""
+
+
+class LegacyTestStep:
+    def __init__(self, step_type, name, config, properties=None):
+        self.step_type = step_type
+        self.name = name
+        self.config = config
+        if properties is not None:
+            self.properties = properties
+
+
+class LegacyTestCase:
+    def __init__(self, name):
+        self.name = name
+        self.test_steps = []
+        self.properties = {}
+
+
+class LegacyTestSuite:
+    def __init__(self, name):
+        self.name = name
+        self.test_cases = []
+        self.resources = []
+
+
+class LegacyProject:
+    def __init__(self, name):
+        self.name = name
+        self.interfaces = []
+        self.test_suites = []
+        self.properties = {}
+
+
+LEGACY_MODEL = {
+    "ReadyAPIInterface": LegacyInterface,
+    "ReadyAPITestStep": LegacyTestStep,
+    "ReadyAPITestCase": LegacyTestCase,
+    "ReadyAPITestSuite": LegacyTestSuite,
+    "ReadyAPIProject": LegacyProject,
+}
+
+
+def retained_bytes(xml_path: str) -> int:
+    """Bytes still allocated once parsing has finished and the tree is gone"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    project = readyapi_project_parser.parse_project_file(xml_path)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del project
+    return retained
+
+
+def measure(xml_path: str, use_legacy: bool) -> int:
+    if not use_legacy:
+        return retained_bytes(xml_path)
+    originals = {name: getattr(readyapi_project_parser, name) for name in LEGACY_MODEL}
+    try:
+        for name, cls in LEGACY_MODEL.items():
+            setattr(readyapi_project_parser, name, cls)
+        return retained_bytes(xml_path)
+    finally:
+        for name, cls in originals.items():
+            setattr(readyapi_project_parser, name, cls)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-step memory of the parsed project model")
+    parser.add_argument("--steps", type=int, default=100000, help="Total number of synthetic test steps")
+    parser.add_argument("--steps-per-case", type=int, default=10)
+    parser.add_argument("--cases-per-suite", type=int, default=50)
+    parser.add_argument("--payload-size", type=int, default=200)
+    args = parser.parse_args()
+
+    suites = max(1, args.steps // (args.steps_per_case * args.cases_per_suite))
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = os.path.join(tmp, "synthetic.xml")
+        total = write_synthetic_project(xml_path, suites, args.cases_per_suite, args.steps_per_case,
+                                        payload_size=args.payload_size)
+        legacy = measure(xml_path, use_legacy=True)
+        slotted = measure(xml_path, use_legacy=False)
+
+    print(f"steps:              {total}")
+    print(f"legacy model:       {legacy / total:8.1f} bytes/step ({legacy / 2**20:.1f} MiB)")
+    print(f"slotted model:      {slotted / total:8.1f} bytes/step ({slotted / 2**20:.1f} MiB)")
+    print(f"saving:             {(legacy - slotted) / total:8.1f} bytes/step ({100 * (1 - slotted / legacy):.1f}%)")
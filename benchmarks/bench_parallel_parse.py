@@ -0,0 +1,44 @@
+"""
+Serial vs. suite-parallel parsing of one large project.
+
+    python benchmarks/bench_parallel_parse.py --steps 200000 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from readyapi_project_parser import parse_project_file  # noqa: E402
+from synthetic_project import write_synthetic_project  # noqa: E402
+
+
+def timed_parse(xml_path: str, workers: int) -> float:
+    started = time.perf_counter()
+    project = parse_project_file(xml_path, workers=workers)
+    elapsed = time.perf_counter() - started
+    assert project.test_suites
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare serial and suite-parallel parsing")
+    parser.add_argument("--steps", type=int, default=200000)
+    parser.add_argument("--suites", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    cases_per_suite = 50
+    steps_per_case = max(1, args.steps // (args.suites * cases_per_suite))
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = os.path.join(tmp, "large.xml")
+        total = write_synthetic_project(xml_path, args.suites, cases_per_suite, steps_per_case)
+        size_mib = os.path.getsize(xml_path) / 2**20
+        serial = timed_parse(xml_path, 1)
+        parallel = timed_parse(xml_path, args.workers)
+
+    print(f"steps: {total}  suites: {args.suites}  file: {size_mib:.1f} MiB  cpus: {os.cpu_count()}")
+    print(f"serial             {serial:6.2f}s")
+    print(f"parallel ({args.workers:2d} proc) {parallel:6.2f}s  speedup {serial / parallel:.2f}x")
@@ -0,0 +1,67 @@
+"""
+Stage-by-stage vs. streaming conversion of a whole project.
+
+Each mode runs main_converter_runner in a fresh child process. The parent
+polls the output file to record the time to the first byte written, and
+reads the child's peak RSS once it exits.
+
+    python benchmarks/bench_streaming_pipeline.py --steps 100000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+POLL_INTERVAL = 0.01
+
+
+def measure(xml_path: str, output_path: str, stream: bool) -> dict:
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    command = [sys.executable, os.path.join(ROOT, "main_converter_runner.py"),
+               "--input", xml_path, "--output", output_path] + (["--stream"] if stream else [])
+    started = time.perf_counter()
+    child = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT)
+    first_byte = None
+    while True:
+        pid, status, usage = os.wait4(child.pid, os.WNOHANG)
+        if pid:
+            break
+        if first_byte is None and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            first_byte = time.perf_counter() - started
+        time.sleep(POLL_INTERVAL)
+    finished = time.perf_counter() - started
+    if os.waitstatus_to_exitcode(status):
+        raise RuntimeError(f"Conversion failed with status {os.waitstatus_to_exitcode(status)}")
+    return {
+        "first_byte_seconds": first_byte if first_byte is not None else finished,
+        "total_seconds": finished,
+        "peak_rss_mib": usage.ru_maxrss / 1024,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare stage-by-stage and streaming conversion")
+    parser.add_argument("--steps", type=int, default=100000)
+    parser.add_argument("--payload-size", type=int, default=200)
+    args = parser.parse_args()
+
+    from synthetic_project import write_synthetic_project
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_path = os.path.join(tmp, "project.xml")
+        output_path = os.path.join(tmp, "collection.json")
+        total = write_synthetic_project(xml_path, max(1, args.steps // 500), 50, 10,
+                                        payload_size=args.payload_size)
+        size_mib = os.path.getsize(xml_path) / 2**20
+        results = {mode: measure(xml_path, output_path, mode == "stream") for mode in ("staged", "stream")}
+
+    print(f"steps: {total}  file: {size_mib:.1f} MiB")
+    for mode, r in results.items():
+        print(f"{mode:6s} first byte {r['first_byte_seconds']:6.2f}s  total {r['total_seconds']:6.2f}s  "
+              f"peak RSS {r['peak_rss_mib']:7.1f} MiB")
@@ -0,0 +1,124 @@
+"""
+Execution time per request of the annotated and optimized test scripts that
+convert_rest_request generates, run in node against a minimal stand-in for
+the Postman sandbox. Like postman-collection's Response, the stand-in decodes
+the body on every pm.response.text() and parses it on every pm.response.json().
+
+    python benchmarks/bench_test_scripts.py --contains 3 --body-kb 64 --requests 5000
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from converters.rest_request_converter import convert_rest_request  # noqa: E402
+
+CON_NAMESPACE = "http://eviware.com/soapui/config"
+
+HARNESS = r"""
+const fs = require('fs');
+const [scriptsFile, bodyKb, requests] = [process.argv[2], +process.argv[3], +process.argv[4]];
+const scripts = JSON.parse(fs.readFileSync(scriptsFile, 'utf8'));
+const items = [];
+for (let i = 0; items.length < bodyKb * 1024 / 40; i++) items.push({id: i, name: 'item' + i, token: 'abc' + i});
+const body = Buffer.from(JSON.stringify({status: 'OK', marker: 'needle-0', items}));
+
+function expect(value, message) {
+    const fail = (what) => { throw new Error((message ? message + ': ' : '') + what); };
+    const chain = {
+        to: null, be: null, have: null,
+        equal(expected) { if (value !== expected) fail(`expected ${expected}`); return chain; },
+        include(expected) { if (!value.includes(expected)) fail(`expected to include ${expected}`); return chain; },
+        below(limit) { if (!(value < limit)) fail(`expected below ${limit}`); return chain; },
+        an(type) { if (typeof value !== type) fail(`expected ${type}`); return chain; },
+        get ok() { if (!value) fail('expected truthy'); return chain; },
+        status(code) { if (value.code !== code) fail(`expected status ${code}`); return chain; },
+    };
+    chain.to = chain.be = chain.have = chain;
+    return chain;
+}
+expect.fail = (message) => { throw new Error(message); };
+
+function run(code) {
+    const compiled = new Function('pm', 'console', code);
+    let failures = 0;
+    const started = process.hrtime.bigint();
+    for (let i = 0; i < requests; i++) {
+        const response = {
+            code: 200, responseTime: 120, stream: body,
+            text() { return this.stream.toString('utf8'); },
+            json() { return JSON.parse(this.text()); },
+        };
+        response.to = {have: {status: (code) => expect(response).to.have.status(code)}};
+        const pm = {
+            response,
+            expect,
+            test(name, fn) { try { fn(); } catch (e) { failures++; } },
+        };
+        compiled(pm, console);
+    }
+    const micros = Number(process.hrtime.bigint() - started) / 1000 / requests;
+    return {micros, failures};
+}
+
+const results = {};
+for (const [mode, code] of Object.entries(scripts)) {
+    run(code);  // warm up
+    results[mode] = run(code);
+}
+console.log(JSON.stringify(results));
+"""
+
+
+def test_step_config(contains: int) -> str:
+    assertions = ['<con:assertion type="Valid HTTP Status Codes" name="Status" codes="200"/>',
+                  '<con:assertion type="Response SLA" name="SLA" timeout="2000"/>']
+    assertions += [f'<con:assertion type="Simple Contains" name="Contains {i}" content="needle-{i % 1}"/>'
+                   for i in range(contains)]
+    return (f'<con:config xmlns:con="{CON_NAMESPACE}"><con:restRequest method="GET">'
+            '<con:endpoint>https://api.example.com</con:endpoint><con:request/>'
+            f'{"".join(assertions)}</con:restRequest></con:config>')
+
+
+class _TestStep:
+    def __init__(self, config: str):
+        self.name = "bench"
+        self.config = config
+
+
+def generated_scripts(contains: int):
+    step = _TestStep(test_step_config(contains))
+    return {
+        mode: "\n".join(convert_rest_request(step, optimized_scripts=optimized)["event"][0]["script"]["exec"])
+        for mode, optimized in (("annotated", False), ("optimized", True))
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare generated test script execution time in node")
+    parser.add_argument("--contains", type=int, default=3, help="Contains assertions per request")
+    parser.add_argument("--body-kb", type=int, default=64, help="Response body size")
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    node = shutil.which("node")
+    if node is None:
+        sys.exit("node is required to run the generated scripts")
+    with tempfile.TemporaryDirectory() as tmp:
+        harness = os.path.join(tmp, "harness.js")
+        scripts = os.path.join(tmp, "scripts.json")
+        with open(harness, "w") as f:
+            f.write(HARNESS)
+        with open(scripts, "w") as f:
+            json.dump(generated_scripts(args.contains), f)
+        output = subprocess.run([node, harness, scripts, str(args.body_kb), str(args.requests)],
+                                check=True, capture_output=True, text=True).stdout
+    results = json.loads(output)
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['micros']:8.1f} µs/request  ({result['failures']} failed tests)")
+    print(f"speed-up   {results['annotated']['micros'] / results['optimized']['micros']:8.1f}x")
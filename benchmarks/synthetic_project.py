@@ -0,0 +1,194 @@
+"""
+Synthetic ReadyAPI project generator used by the benchmarks.
+
+Projects are written straight to disk so that very large inputs (hundreds of
+thousands of steps) can be produced without holding them in memory.
+"""
+import argparse
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Sequence
+from xml.sax.saxutils import escape
+
+PROJECT_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<con:soapui-project xmlns:con="http://eviware.com/soapui/config" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" name="{name}" resourceRoot="">
+  <con:settings/>
+  <con:interface xsi:type="con:RestService" name="Synthetic" type="rest_ex">
+    <con:endpoints>
+      <con:endpoint>https://api.example.com</con:endpoint>
+    </con:endpoints>
+    <con:resource name="items" path="/v1/items">
+      <con:method name="Method 1" method="POST">
+        <con:request name="Request 1" mediaType="application/json">
+          <con:endpoint>https://api.example.com</con:endpoint>
+          <con:request/>
+        </con:request>
+      </con:method>
+    </con:resource>
+  </con:interface>
+"""
+
+PROJECT_FOOTER = """  <con:properties>
+    <con:property><con:name>env</con:name><con:value>DEV</con:value></con:property>
+  </con:properties>
+</con:soapui-project>
+"""
+
+REST_STEP = """      <con:testStep type="restrequest" name="{name}">
+        <con:settings/>
+        <con:config service="Synthetic" resourcePath="/v1/items" methodName="Method 1">
+          <con:restRequest name="{name}" mediaType="application/json" method="POST">
+            <con:settings/>
+            <con:endpoint>https://api.example.com</con:endpoint>
+            <con:request>{body}</con:request>
+            <con:assertion type="Valid HTTP Status Codes" name="Valid HTTP Status Codes">
+              <con:configuration><codes>200</codes></con:configuration>
+            </con:assertion>
+            <con:assertion type="Simple Contains" name="Contains">
+              <con:configuration><token>itemId</token></con:configuration>
+            </con:assertion>
+          </con:restRequest>
+        </con:config>
+      </con:testStep>
+"""
+
+GROOVY_STEP = """      <con:testStep type="groovy" name="{name}">
+        <con:settings/>
+        <con:config>
+          <script>{script}</script>
+        </con:config>
+      </con:testStep>
+"""
+
+PROPERTIES_STEP = """      <con:testStep type="properties" name="{name}">
+        <con:settings/>
+        <con:config>
+          <con:properties>
+            <con:property><con:name>itemId</con:name><con:value>{index}</con:value></con:property>
+          </con:properties>
+        </con:config>
+      </con:testStep>
+"""
+
+SKIPPED_STEP = """      <con:testStep type="{step_type}" name="{name}"{disabled}>
+        <con:settings/>
+        <con:config>
+          <query>{payload}</query>
+        </con:config>
+      </con:testStep>
+"""
+
+DEFAULT_MIX = ("restrequest", "groovy", "properties")
+
+
+def _step_xml(step_type: str, name: str, index: int, payload_size: int, disabled: bool) -> str:
+    if step_type == "restrequest":
+        body = escape('{"itemId": %d, "payload": "%s"}' % (index, "x" * payload_size))
+        return REST_STEP.format(name=name, body=body)
+    if step_type == "groovy":
+        script = "\n".join(
+            'def value%d = context.expand(\'${#Project#env}\')' % line for line in range(max(1, payload_size // 40))
+        )
+        return GROOVY_STEP.format(name=name, script=escape(script))
+    if step_type == "properties":
+        return PROPERTIES_STEP.format(name=name, index=index)
+    return SKIPPED_STEP.format(
+        step_type=step_type,
+        name=name,
+        disabled=' disabled="true"' if disabled else "",
+        payload=escape("SELECT * FROM items WHERE payload = '%s'" % ("x" * payload_size)),
+    )
+
+
+def write_synthetic_project(path: str, suites: int = 10, cases_per_suite: int = 10, steps_per_case: int = 10,
+                            step_types: Sequence[str] = DEFAULT_MIX, payload_size: int = 200,
+                            disabled_ratio: float = 0.0, name: str = "SyntheticProject") -> int:
+    """
+    Write a synthetic ReadyAPI project and return the number of test steps written.
+
+    Step types are assigned round-robin from ``step_types``; ``disabled_ratio``
+    marks roughly that share of the steps using other (skipped) types as
+    ``disabled="true"``.
+    """
+    total = 0
+    disabled_every = int(round(1 / disabled_ratio)) if disabled_ratio else 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(PROJECT_HEADER.format(name=name))
+        for s in range(suites):
+            f.write('  <con:testSuite name="Suite_%d">\n    <con:settings/>\n' % s)
+            for c in range(cases_per_suite):
+                f.write('    <con:testCase name="Case_%d_%d">\n      <con:settings/>\n' % (s, c))
+                for i in range(steps_per_case):
+                    step_type = step_types[total % len(step_types)]
+                    disabled = bool(disabled_every) and total % disabled_every == 0
+                    f.write(_step_xml(step_type, "step_%d" % total, total, payload_size, disabled))
+                    total += 1
+                f.write('      <con:properties>\n'
+                        '        <con:property><con:name>caseId</con:name><con:value>%d</con:value></con:property>\n'
+                        '      </con:properties>\n    </con:testCase>\n' % c)
+            f.write('  </con:testSuite>\n')
+        f.write(PROJECT_FOOTER)
+    return total
+
+
+CON_NAMESPACE = "http://eviware.com/soapui/config"
+
+
+def _file_name(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", name) or "_"
+
+
+def _write_element(element: ET.Element, path: str) -> None:
+    ET.ElementTree(element).write(path, encoding="UTF-8", xml_declaration=True)
+
+
+def split_into_composite(xml_path: str, project_dir: str) -> None:
+    """
+    Rewrite a single-file project as a composite project directory: one file
+    per interface, one directory per suite with one file per test case.
+    """
+    ET.register_namespace("con", CON_NAMESPACE)
+    ET.register_namespace("xsi", "http://www.w3.org/2001/XMLSchema-instance")
+    root = ET.parse(xml_path).getroot()
+    os.makedirs(project_dir, exist_ok=True)
+    order = []
+    for child in list(root):
+        if child.tag == "{%s}interface" % CON_NAMESPACE:
+            name = _file_name(child.get("name", "")) + ".xml"
+            _write_element(child, os.path.join(project_dir, name))
+        elif child.tag == "{%s}testSuite" % CON_NAMESPACE:
+            name = _file_name(child.get("name", ""))
+            suite_dir = os.path.join(project_dir, name)
+            os.makedirs(suite_dir, exist_ok=True)
+            case_order = []
+            for case in child.findall("{%s}testCase" % CON_NAMESPACE):
+                case_order.append(_file_name(case.get("name", "")) + ".xml")
+                _write_element(case, os.path.join(suite_dir, case_order[-1]))
+                child.remove(case)
+            _write_element(child, os.path.join(suite_dir, "settings.xml"))
+            with open(os.path.join(suite_dir, "element.order"), "w") as f:
+                f.write("\n".join(case_order) + "\n")
+        else:
+            continue
+        order.append(name)
+        root.remove(child)
+    _write_element(root, os.path.join(project_dir, "settings.xml"))
+    with open(os.path.join(project_dir, "element.order"), "w") as f:
+        f.write("\n".join(order) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic ReadyAPI project for benchmarking")
+    parser.add_argument("--output", required=True, help="Path of the XML file to write")
+    parser.add_argument("--suites", type=int, default=10)
+    parser.add_argument("--cases", type=int, default=10, help="Test cases per suite")
+    parser.add_argument("--steps", type=int, default=10, help="Test steps per case")
+    parser.add_argument("--types", default=",".join(DEFAULT_MIX), help="Comma separated step types (round-robin)")
+    parser.add_argument("--payload-size", type=int, default=200)
+    parser.add_argument("--disabled-ratio", type=float, default=0.0)
+    args = parser.parse_args()
+
+    count = write_synthetic_project(args.output, args.suites, args.cases, args.steps,
+                                    args.types.split(","), args.payload_size, args.disabled_ratio)
+    print(f"Wrote {count} steps to {args.output}")
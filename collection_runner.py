@@ -0,0 +1,205 @@
+"""
+Run the requests of a converted Postman collection without Node or Newman.
+
+Requests are sent with their variables resolved from the collection, the
+environment and the Properties steps before them, over pooled keep-alive
+connections. The Setup folder runs first; the other top-level folders are
+independent and run concurrently, each in order. Scripts are not run: the
+runner checks that requests, URLs and bodies are wired correctly, and that
+each response has the status its test script expects:
+
+    python collection_runner.py collection.json --env environment.json --target http://127.0.0.1:8080
+"""
+import re
+import json
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from async_http_client import DEFAULT_TIMEOUT, PooledHTTPClient
+from converters.groovy_script_converter import is_script_step
+from load_runner import PERCENTILES, StepStats
+from postman_collection_builder import SETUP_FOLDER_NAME
+from postman_request_resolver import load_environment, prepare_request, unresolved_variables
+
+logger = logging.getLogger(__name__)
+
+# Top-level folders run at once
+DEFAULT_CONCURRENCY = 8
+
+# Status checks of the converted test scripts, annotated and optimized
+_STATUS_CHECKS = (
+    re.compile(r"pm\.response\.to\.have\.status\((\d{3})\)"),
+    re.compile(r"pm\.expect\(pm\.response\.code(?:,\s*'[^']*')?\)\.to\.equal\((\d{3})\)"),
+    re.compile(r"pm\.expect\(\[([\d,\s]+)\](?:,\s*'[^']*')?\)\.to\.include\(pm\.response\.code\)"),
+)
+
+
+def expected_statuses(item: Dict[str, Any]) -> List[Set[int]]:
+    """The status codes each status check of an item's test script accepts"""
+    checks = []
+    for event in item.get("event", []):
+        if event.get("listen") != "test":
+            continue
+        exec_lines = event.get("script", {}).get("exec", [])
+        script = "\n".join(exec_lines) if isinstance(exec_lines, list) else exec_lines
+        for pattern in _STATUS_CHECKS:
+            checks.extend({int(code) for code in match.split(',')} for match in pattern.findall(script))
+    return checks
+
+
+def collection_variables(collection: Dict[str, Any]) -> Dict[str, str]:
+    return {variable["key"]: str(variable.get("value", "")) for variable in collection.get("variable", [])
+            if not variable.get("disabled")}
+
+
+def iter_folder(items: List[Dict[str, Any]], path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], Dict[str, Any]]]:
+    """Every request and Properties item under items, in run order, with the folder path to it"""
+    for item in items:
+        if "item" in item:
+            yield from iter_folder(item["item"], path + (item.get("name", ""),))
+        else:
+            yield path, item
+
+
+async def run_folder(client: PooledHTTPClient, folder: Dict[str, Any], variables: Dict[str, str],
+                     target: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Send a top-level folder's requests one after another, and return a
+    result for each. Properties items set variables for the requests after
+    them in the folder.
+    """
+    variables = dict(variables)
+    results = []
+    for path, item in iter_folder([folder]):
+        if item.get("type") == "properties":
+            variables.update((variable["key"], str(variable.get("value", "")))
+                             for variable in item.get("variables", []) if variable.get("enabled", True))
+            continue
+        request = item.get("request")
+        # Items that only carry a converted Groovy script are not sent
+        if not request or is_script_step(item):
+            continue
+
+        prepared = prepare_request(request, variables, target)
+        unresolved = sorted(set(unresolved_variables(prepared.url))
+                            | {name for _, value in prepared.headers for name in unresolved_variables(value)}
+                            | set(unresolved_variables(prepared.body.decode('utf-8', 'replace'))))
+        result = {"folder": "/".join(path), "name": item.get("name", ""), "method": prepared.method,
+                  "url": prepared.url, "status": None, "ms": None, "error": None,
+                  "expected": [sorted(codes) for codes in expected_statuses(item)], "unresolved": unresolved}
+        started = time.perf_counter()
+        try:
+            response = await client.request(prepared.method, prepared.url, prepared.headers, prepared.body)
+            result["status"] = response.status
+        except (OSError, asyncio.TimeoutError, ValueError) as e:
+            result["error"] = str(e) or type(e).__name__
+        result["ms"] = (time.perf_counter() - started) * 1000
+        result["mismatch"] = result["status"] is not None and any(
+            result["status"] not in codes for codes in result["expected"])
+        results.append(result)
+    return results
+
+
+async def run_collection(collection: Dict[str, Any], variables: Dict[str, str], target: Optional[str] = None,
+                         concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+    """
+    Run a collection's requests and return the report. variables, usually
+    the environment, override the collection's variables. The Setup folder
+    runs first, then up to concurrency other top-level folders at a time.
+    """
+    variables = {**collection_variables(collection), **variables}
+    items = collection.get("item", [])
+    setup = [item for item in items if "item" in item and item.get("name") == SETUP_FOLDER_NAME]
+    # Requests outside any folder run together, like one more folder
+    loose = [item for item in items if "item" not in item]
+    folders = [item for item in items if "item" in item and item.get("name") != SETUP_FOLDER_NAME]
+    if loose:
+        folders.append({"name": "", "item": loose})
+
+    results = []
+    started = time.perf_counter()
+    async with PooledHTTPClient(max_connections_per_host=concurrency, timeout=timeout) as client:
+        for folder in setup:
+            results.extend(await run_folder(client, folder, variables, target))
+
+        slots = asyncio.Semaphore(concurrency)
+
+        async def run_when_free(folder: Dict[str, Any]) -> List[Dict[str, Any]]:
+            async with slots:
+                return await run_folder(client, folder, variables, target)
+
+        for folder_results in await asyncio.gather(*(run_when_free(folder) for folder in folders)):
+            results.extend(folder_results)
+        connections = client.connections_opened
+    elapsed = time.perf_counter() - started
+
+    latencies = StepStats()
+    for result in results:
+        latencies.add(result["ms"] / 1000, result["error"] is not None)
+    mismatches = sum(result["mismatch"] for result in results)
+    errors = sum(result["error"] is not None for result in results)
+    return {
+        "collection": collection.get("info", {}).get("name"),
+        "seconds": elapsed,
+        "connections": connections,
+        "requests": results,
+        "summary": latencies.summary(elapsed),
+        "mismatches": mismatches,
+        "errors": errors,
+        "passed": not mismatches and not errors,
+    }
+
+
+def format_report(report: Dict[str, Any], failures_only: bool = False) -> str:
+    lines = []
+    for result in report["requests"]:
+        failed = result["mismatch"] or result["error"]
+        if failures_only and not failed:
+            continue
+        outcome = result["error"] or str(result["status"])
+        if result["mismatch"]:
+            outcome += f" (expected {' and '.join('/'.join(map(str, codes)) for codes in result['expected'])})"
+        line = f"{'FAIL' if failed else 'ok':4s} {result['ms']:8.1f}ms {result['method']:6s} {outcome:24s} " \
+               f"{result['folder']}/{result['name']}"
+        if result["unresolved"]:
+            line += f"  [unresolved: {', '.join(result['unresolved'])}]"
+        lines.append(line)
+    summary = report["summary"]
+    lines.append(f"{summary['count']} requests in {report['seconds']:.2f}s over {report['connections']} connections: "
+                 f"{report['mismatches']} status mismatches, {report['errors']} errors")
+    if summary["count"]:
+        lines.append(f"latency avg {summary['avg_ms']:.1f}ms " + " ".join(
+            f"p{p} {summary[f'p{p}_ms']:.1f}ms" for p in PERCENTILES))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the requests of a converted Postman collection")
+    parser.add_argument("collection", help="Postman collection JSON written by main_converter_runner")
+    parser.add_argument("--env", help="Postman environment JSON file with the variables the requests use")
+    parser.add_argument("--var", action="append", default=[], metavar="KEY=VALUE",
+                        help="Set a variable, overriding the environment (repeatable)")
+    parser.add_argument("--target", metavar="URL",
+                        help="Send every request to this scheme and host, e.g. a local stand-in server")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Top-level folders run at once")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds one request may take")
+    parser.add_argument("--failures-only", action="store_true", help="Only list failed requests")
+    parser.add_argument("--json", metavar="FILE", help="Also write the report as JSON to FILE")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    with open(args.collection) as f:
+        postman_collection = json.load(f)
+    run_report = asyncio.run(run_collection(postman_collection, load_environment(args.env, args.var), args.target,
+                                            max(1, args.concurrency), args.timeout))
+    print(format_report(run_report, args.failures_only))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(run_report, f, indent=2)
+    sys.exit(0 if run_report["passed"] else 1)
@@ -0,0 +1,110 @@
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Identifies the intermediate format in the header line
+IR_FORMAT = 'readyapi-postman-ir'
+
+# Bump when a record changes shape; readers reject newer versions
+IR_VERSION = 2
+
+
+class IRFormatError(ValueError):
+    """Raised when an intermediate representation file cannot be read"""
+
+
+class IRWriter:
+    """
+    Write the intermediate representation of a converted project as NDJSON.
+
+    The first line is a header naming the format, its version and the project.
+    Every following line is one record: a converted step tagged with its suite,
+    case and position in the project, an API endpoint, or an interface
+    definition document (since version 2).
+    """
+
+    def __init__(self, f: TextIO, project_name: str):
+        self._f = f
+        self._order = 0
+        self._write({"format": IR_FORMAT, "version": IR_VERSION, "project": project_name})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._f.write(json.dumps(record) + '\n')
+
+    def write_steps(self, steps: Iterable[Dict[str, Any]]) -> None:
+        for step in steps:
+            self._write({
+                "type": "step",
+                "order": self._order,
+                "suite": step.get("test_suite", "Default Suite"),
+                "case": step.get("test_case", "Default Case"),
+                "step": step,
+            })
+            self._order += 1
+
+    def write_endpoints(self, endpoints: Iterable[Dict[str, Any]]) -> None:
+        for endpoint in endpoints:
+            self._write({"type": "endpoint", "endpoint": endpoint})
+
+    def write_definitions(self, definitions: Dict[str, str]) -> None:
+        for name, document in definitions.items():
+            self._write({"type": "definition", "name": name, "document": document})
+
+
+def read_ir(f: TextIO) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Read an intermediate representation file.
+
+    Returns the header and an iterator over the remaining records. Steps must
+    appear in increasing order; raises IRFormatError for anything else that
+    does not match IR_VERSION.
+    """
+    first_line = f.readline()
+    try:
+        header = json.loads(first_line)
+    except ValueError:
+        raise IRFormatError("Missing intermediate representation header")
+    if not isinstance(header, dict) or header.get("format") != IR_FORMAT:
+        raise IRFormatError("Not a ReadyAPI to Postman intermediate representation")
+    version = header.get("version")
+    if not isinstance(version, int) or version > IR_VERSION:
+        raise IRFormatError(f"Unsupported intermediate representation version {version} "
+                            f"(this converter reads up to {IR_VERSION})")
+    return header, _iter_records(f)
+
+
+def _iter_records(f: TextIO) -> Iterator[Dict[str, Any]]:
+    last_order: Optional[int] = None
+    for line_number, line in enumerate(f, start=2):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise IRFormatError(f"Line {line_number}: {str(e)}")
+        record_type = record.get("type")
+        if record_type == "step":
+            order = record.get("order")
+            if not isinstance(order, int) or (last_order is not None and order <= last_order):
+                raise IRFormatError(f"Line {line_number}: step order {order} follows {last_order}")
+            last_order = order
+        elif record_type not in ("endpoint", "definition"):
+            raise IRFormatError(f"Line {line_number}: unknown record type {record_type!r}")
+        yield record
+
+
+# Example usage
+if __name__ == '__main__':
+    import io
+
+    out = io.StringIO()
+    writer = IRWriter(out, "Example")
+    writer.write_steps([{"name": "Login", "test_suite": "Suite", "test_case": "Case"}])
+    writer.write_endpoints([{"name": "Login endpoint"}])
+    print(out.getvalue())
+
+    out.seek(0)
+    header, records = read_ir(out)
+    print(header["project"], [record["type"] for record in records])
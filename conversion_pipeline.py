@@ -0,0 +1,141 @@
+import json
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, TextIO
+
+from readyapi_project_parser import ReadyAPITestSuite
+
+logger = logging.getLogger(__name__)
+
+# How many items a stage may run ahead of the stage consuming its output
+PIPELINE_QUEUE_SIZE = 4
+
+# Seconds a blocked producer waits before checking whether the consumer went away
+_PUT_TIMEOUT = 0.1
+
+_DONE = object()
+
+
+class _StageFailure:
+    __slots__ = ('error',)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def threaded_stage(items: Iterable, maxsize: int = PIPELINE_QUEUE_SIZE) -> Iterator:
+    """
+    Consume items in a background thread and yield them through a bounded queue.
+
+    The producing stage runs at most maxsize items ahead of the consumer. An
+    exception raised while producing is re-raised in the consumer, and the
+    producer stops once the consumer closes the generator.
+    """
+    handoff = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                handoff.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_StageFailure(e))
+
+    thread = threading.Thread(target=produce, name='conversion-pipeline-stage', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+
+
+def convert_suites(items: Iterable, convert_case: Callable) -> Iterator:
+    """
+    Convert stage: replace each ReadyAPITestSuite with the list of its
+    converted steps. Any other item (the project) is passed through.
+    """
+    for item in items:
+        if not isinstance(item, ReadyAPITestSuite):
+            yield item
+            continue
+        logger.info(f"Processing test suite: {item.name}")
+        converted_steps = []
+        for test_case in item.test_cases:
+            converted_steps.extend(convert_case(item, test_case))
+        yield converted_steps
+
+
+def _nested_json(value: Any, depth: int) -> str:
+    """value as json.dump(..., indent=2) would write it at the given nesting depth"""
+    return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * depth)
+
+
+def serialize_item(item: Dict[str, Any]) -> str:
+    """A top-level collection item as CollectionWriter writes it, for callers caching serialized folders"""
+    return _nested_json(item, 2)
+
+
+class CollectionWriter:
+    """
+    Write a Postman collection one top-level item at a time.
+
+    The output is identical to json.dump(collection, f, indent=2) of the
+    assembled collection, but only the item being written is held in memory.
+    """
+
+    def __init__(self, f: TextIO, info: Dict[str, Any]):
+        self._f = f
+        self._items = 0
+        f.write('{\n  "info": ' + _nested_json(info, 1) + ',\n  "item": [')
+
+    def write_item(self, item: Dict[str, Any]) -> None:
+        self.write_serialized_item(serialize_item(item))
+
+    def write_serialized_item(self, text: str) -> None:
+        """Write an item already serialized with serialize_item"""
+        self._f.write((',' if self._items else '') + '\n    ' + text)
+        self._items += 1
+        self._f.flush()
+
+    def close(self, fields: Dict[str, Any]) -> None:
+        """Close the item list and write the remaining top-level fields in order"""
+        self._f.write('\n  ]' if self._items else ']')
+        for key, value in fields.items():
+            self._f.write(',\n  ' + json.dumps(key) + ': ' + _nested_json(value, 1))
+        self._f.write('\n}')
+        self._f.flush()
+
+
+# Example usage
+if __name__ == '__main__':
+    import io
+
+    def count_up(limit: int) -> Iterator[int]:
+        for i in range(limit):
+            yield i
+
+    print(list(threaded_stage(count_up(10), maxsize=2)))
+
+    out = io.StringIO()
+    writer = CollectionWriter(out, {"name": "Example"})
+    writer.write_item({"name": "Suite", "item": []})
+    writer.close({"variable": []})
+    print(out.getvalue())
@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from xml.etree.ElementTree import ParseError
+
+from readyapi_project_parser import PARSER_VERSION, ProjectFilter
+from batch_orchestrator import convert_project_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+# Largest accepted upload
+DEFAULT_MAX_UPLOAD_BYTES = 256 << 20
+
+# Bounds of the result cache
+DEFAULT_CACHE_ENTRIES = 64
+DEFAULT_CACHE_BYTES = 512 << 20
+
+# Latencies kept for the percentiles reported by /metrics
+LATENCY_WINDOW = 1000
+
+
+class ResultCache:
+    """Thread-safe LRU cache of response bodies, bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = body
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+
+class ServiceMetrics:
+    """Request counts, cache hit rate and latency of /convert requests"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, cache_hit: Optional[bool], error: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            if cache_hit is not None:
+                self.cache_hits += cache_hit
+                self.cache_misses += not cache_hit
+            self._latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+                "latency_seconds": {
+                    "count": len(latencies),
+                    "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+                    "p50": _percentile(latencies, 0.50),
+                    "p95": _percentile(latencies, 0.95),
+                    "max": latencies[-1] if latencies else 0.0,
+                },
+            }
+
+
+def _percentile(ordered, fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def project_filter_from_query(query: Dict[str, list]) -> ProjectFilter:
+    """Build a ProjectFilter from ?suite=&case=&include_step_type=&exclude_step_type=&keep_disabled="""
+    return ProjectFilter(suites=query.get('suite'), cases=query.get('case'),
+                         include_step_types=query.get('include_step_type'),
+                         exclude_step_types=query.get('exclude_step_type'),
+                         skip_disabled=query.get('keep_disabled', ['false'])[-1].lower() not in ('1', 'true', 'yes'))
+
+
+class _ConversionRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'ReadyAPIConversionService/1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, body: bytes, cache_status: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if cache_status:
+            self.send_header('X-Cache', cache_status)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send(status, json.dumps({"error": message}).encode('utf-8'))
+
+    def do_GET(self):
+        service = self.server.service
+        path = urlsplit(self.path).path
+        if path == '/metrics':
+            self._send(200, json.dumps(service.metrics_snapshot(), indent=2).encode('utf-8'))
+        elif path == '/health':
+            self._send(200, b'{"status": "ok"}')
+        else:
+            self._send_error(404, f"No such endpoint: {path}")
+
+    def do_POST(self):
+        service = self.server.service
+        url = urlsplit(self.path)
+        if url.path != '/convert':
+            self._send_error(404, f"No such endpoint: {url.path}")
+            return
+
+        started = time.perf_counter()
+        cache_hit = None
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length <= 0:
+            status, body = 400, b'{"error": "Request body must be a ReadyAPI project XML"}'
+        elif length > service.max_upload_bytes:
+            status, body = 413, json.dumps({"error": f"Upload exceeds {service.max_upload_bytes} bytes"}).encode()
+        else:
+            data = self.rfile.read(length)
+            status, body, cache_hit = service.convert(data, project_filter_from_query(parse_qs(url.query)))
+
+        service.metrics.record(time.perf_counter() - started, cache_hit, error=status >= 400)
+        self._send(status, body, None if cache_hit is None else ('HIT' if cache_hit else 'MISS'))
+
+
+class ConversionService:
+    """
+    Local HTTP service converting ReadyAPI projects to Postman collections.
+
+    POST /convert with a project XML as the body returns
+    {"project", "collection", "environment"}; GET /metrics reports request
+    latency and cache hit rate. Conversions run in a pool of warm worker
+    processes, and responses are cached by a hash of the upload and filters.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, workers: Optional[int] = None,
+                 cache_entries: int = DEFAULT_CACHE_ENTRIES, cache_bytes: int = DEFAULT_CACHE_BYTES,
+                 max_upload_bytes: int = DEFAULT_MAX_UPLOAD_BYTES):
+        self.max_upload_bytes = max_upload_bytes
+        self.cache = ResultCache(cache_entries, cache_bytes)
+        self.metrics = ServiceMetrics()
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._warm_up()
+        self._server = ThreadingHTTPServer((host, port), _ConversionRequestHandler)
+        self._server.daemon_threads = True
+        self._server.service = self
+        self._thread: Optional[threading.Thread] = None
+
+    def _warm_up(self) -> None:
+        # Start every worker now so the first requests do not pay for process start-up
+        for future in [self._pool.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    @staticmethod
+    def cache_key(data: bytes, project_filter: ProjectFilter) -> str:
+        digest = hashlib.sha256(f"parser-v{PARSER_VERSION};{project_filter!r};".encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def convert(self, data: bytes, project_filter: ProjectFilter) -> Tuple[int, bytes, Optional[bool]]:
+        """Convert an upload, or answer from the cache; returns status, body and whether the cache hit"""
+        key = self.cache_key(data, project_filter)
+        body = self.cache.get(key)
+        if body is not None:
+            return 200, body, True
+
+        try:
+            project_name, collection_text, environment_text = self._pool.submit(
+                convert_project_bytes, data, project_filter).result()
+        except ParseError as e:
+            return 400, json.dumps({"error": f"Invalid project XML: {str(e)}"}).encode('utf-8'), False
+        except Exception as e:
+            logger.error(f"Conversion failed: {str(e)}")
+            return 500, json.dumps({"error": f"Conversion failed: {str(e)}"}).encode('utf-8'), False
+
+        body = ('{"project": ' + json.dumps(project_name) + ', "collection": ' + collection_text
+                + ', "environment": ' + environment_text + '}').encode('utf-8')
+        self.cache.put(key, body)
+        return 200, body, False
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        snapshot = self.metrics.snapshot()
+        snapshot["cache"] = self.cache.stats()
+        return snapshot
+
+    def start(self) -> None:
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='conversion-service', daemon=True)
+        self._thread.start()
+        logger.info(f"Conversion service listening on http://{self.address[0]}:{self.address[1]}")
+
+    def serve_forever(self) -> None:
+        logger.info(f"Conversion service listening on http://{self.address[0]}:{self.address[1]}")
+        self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+        self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _ready() -> bool:
+    return True
+
+
+# Entry point
+if __name__ == '__main__':
+    import argparse
+    from converted_step_store import parse_size
+
+    parser = argparse.ArgumentParser(description='Serve ReadyAPI to Postman conversions over HTTP')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to listen on')
+    parser.add_argument('--workers', type=int, default=0, help='Warm conversion processes (0 uses every CPU)')
+    parser.add_argument('--cache-entries', type=int, default=DEFAULT_CACHE_ENTRIES,
+                        help='Conversion results kept in the LRU cache')
+    parser.add_argument('--cache-size', type=parse_size, default=DEFAULT_CACHE_BYTES, metavar='SIZE',
+                        help="Total size of cached results (e.g. '512M')")
+    parser.add_argument('--max-upload', type=parse_size, default=DEFAULT_MAX_UPLOAD_BYTES, metavar='SIZE',
+                        help='Largest accepted project upload')
+    args = parser.parse_args()
+
+    service = ConversionService(args.host, args.port, workers=args.workers or None,
+                                cache_entries=args.cache_entries, cache_bytes=args.cache_size,
+                                max_upload_bytes=args.max_upload)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
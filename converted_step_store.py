@@ -0,0 +1,171 @@
+import os
+import json
+import sqlite3
+import logging
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE steps (
+    seq INTEGER PRIMARY KEY,
+    suite_order INTEGER NOT NULL,
+    case_order INTEGER NOT NULL,
+    suite TEXT NOT NULL,
+    test_case TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX steps_by_case ON steps (suite_order, case_order, seq);
+"""
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte count such as '512M', '2G' or '65536'"""
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    value = value.strip().upper().rstrip('B')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+class ConvertedStepStore:
+    """
+    Holds converted steps until the collection is built, grouped by test suite
+    and test case in order of first appearance.
+
+    Steps stay in memory until their JSON-encoded size passes memory_budget
+    bytes; from then on every step is spilled to a temporary SQLite database,
+    and iter_suites() reads them back one suite at a time.
+    """
+
+    def __init__(self, memory_budget: Optional[int] = None, spill_dir: Optional[str] = None):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self._steps: List[Dict[str, Any]] = []
+        self._buffered_bytes = 0
+        self._count = 0
+        self._suite_order: Dict[str, int] = {}
+        self._case_order: Dict[Tuple[str, str], int] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._db is not None
+
+    def __len__(self):
+        return self._count
+
+    def _keys(self, step: Dict[str, Any]) -> Tuple[str, str, int, int]:
+        suite_name = step.get("test_suite", "Default Suite")
+        case_name = step.get("test_case", "Default Case")
+        suite_order = self._suite_order.setdefault(suite_name, len(self._suite_order))
+        case_order = self._case_order.setdefault((suite_name, case_name), len(self._case_order))
+        return suite_name, case_name, suite_order, case_order
+
+    def extend(self, steps: Iterable[Dict[str, Any]]) -> None:
+        steps = list(steps)
+        self._count += len(steps)
+        if self._db is not None:
+            self._write(steps)
+            return
+        self._steps.extend(steps)
+        if self.memory_budget is not None:
+            self._buffered_bytes += sum(len(json.dumps(step)) for step in steps)
+            if self._buffered_bytes > self.memory_budget:
+                self._spill()
+
+    def append(self, step: Dict[str, Any]) -> None:
+        self.extend([step])
+
+    def _spill(self) -> None:
+        fd, self._db_path = tempfile.mkstemp(prefix='converted-steps-', suffix='.sqlite', dir=self.spill_dir)
+        os.close(fd)
+        self._db = sqlite3.connect(self._db_path)
+        # The database only lives for one conversion, so durability is not needed
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.executescript(_SCHEMA)
+        logger.info(f"Converted steps passed the memory budget of {self.memory_budget} bytes, "
+                    f"spilling to {self._db_path}")
+        steps, self._steps = self._steps, []
+        self._buffered_bytes = 0
+        self._write(steps)
+
+    def _write(self, steps: List[Dict[str, Any]]) -> None:
+        rows = []
+        for step in steps:
+            suite_name, case_name, suite_order, case_order = self._keys(step)
+            rows.append((suite_order, case_order, suite_name, case_name, json.dumps(step)))
+        self._db.executemany(
+            'INSERT INTO steps (suite_order, case_order, suite, test_case, body) VALUES (?, ?, ?, ?, ?)', rows)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Every step in insertion order"""
+        if self._db is None:
+            yield from self._steps
+            return
+        for (body,) in self._db.execute('SELECT body FROM steps ORDER BY seq'):
+            yield json.loads(body)
+
+    def case_steps(self, suite_name: str, case_name: str) -> List[Dict[str, Any]]:
+        """The steps of one test case, in insertion order"""
+        if self._db is None:
+            return [step for step in self._steps if step.get("test_suite", "Default Suite") == suite_name
+                    and step.get("test_case", "Default Case") == case_name]
+        if (suite_name, case_name) not in self._case_order:
+            return []
+        rows = self._db.execute('SELECT body FROM steps WHERE suite_order = ? AND case_order = ? ORDER BY seq',
+                                (self._suite_order[suite_name], self._case_order[(suite_name, case_name)]))
+        return [json.loads(body) for (body,) in rows]
+
+    def iter_suites(self) -> Iterator[Tuple[str, Dict[str, List[Dict[str, Any]]]]]:
+        """
+        Yield (suite name, {case name: steps}) in order of first appearance,
+        holding only one suite in memory when the store has spilled
+        """
+        if self._db is None:
+            groups: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+            for step in self._steps:
+                suite_name = step.get("test_suite", "Default Suite")
+                case_name = step.get("test_case", "Default Case")
+                groups.setdefault(suite_name, {}).setdefault(case_name, []).append(step)
+            yield from groups.items()
+            return
+
+        current_suite = None
+        cases: Dict[str, List[Dict[str, Any]]] = {}
+        rows = self._db.execute('SELECT suite, test_case, body FROM steps ORDER BY suite_order, case_order, seq')
+        for suite_name, case_name, body in rows:
+            if suite_name != current_suite:
+                if current_suite is not None:
+                    yield current_suite, cases
+                current_suite, cases = suite_name, {}
+            cases.setdefault(case_name, []).append(json.loads(body))
+        if current_suite is not None:
+            yield current_suite, cases
+
+    def close(self) -> None:
+        """Drop the steps and delete the spill database, if any"""
+        self._steps = []
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            os.remove(self._db_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Example usage
+if __name__ == '__main__':
+    with ConvertedStepStore(memory_budget=200) as store:
+        for i in range(6):
+            store.append({"name": f"Step {i}", "test_suite": f"Suite {i % 2}", "test_case": "Case"})
+        print(f"{len(store)} steps, spilled: {store.spilled}")
+        for suite_name, cases in store.iter_suites():
+            print(suite_name, {case: [s["name"] for s in steps] for case, steps in cases.items()})
@@ -0,0 +1,281 @@
+import re
+import json
+from xml.etree import ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+# Test scripts reach the runtime through this expression; a script mentioning
+# RUNTIME_NAME makes the collection install the runtime in its pre-request script
+RUNTIME_NAME = "readyapiAssertions"
+RUNTIME_ACCESS = f"globalThis.{RUNTIME_NAME}"
+
+# Collection variables holding definition documents are named after the interface
+SCHEMA_VARIABLE_PREFIX = "schema "
+
+# Collected pre-request lines naming the definitions Schema Compliance checks use
+SCHEMA_MARKER = "// Schema Compliance: "
+SCHEMA_CALL = "readyapi.validate("
+_SCHEMA_REFERENCE = re.compile(r'readyapi\.validate\(json, pm\.response\.code, ("(?:[^"\\]|\\.)*")')
+
+_NAMESPACE_DECLARATION = re.compile(r'declare\s+namespace\s+[\w.-]+\s*=\s*(?:\'[^\']*\'|"[^"]*")\s*;')
+
+# Collection-level pre-request script defining the runtime once per collection run.
+# Postman runs every script of a run in one sandbox context, whose global object
+# persists, so the runtime and its cache of compiled XPath and JSONPath
+# expressions, patterns and schema validators outlive each request. The runtime
+# is a property of the global object only, not of every object.
+ASSERTION_RUNTIME = r"""// ReadyAPI assertion runtime: expressions, patterns and schemas are compiled once per run
+if (!Object.prototype.hasOwnProperty.call(globalThis, 'readyapiAssertions')) {
+    const cache = new Map();
+    const cached = (kind, source, compile) => {
+        const key = kind + ':' + source;
+        let compiled = cache.get(key);
+        if (compiled === undefined) {
+            compiled = compile(source);
+            cache.set(key, compiled);
+        }
+        return compiled;
+    };
+    const isObject = (value) => value !== null && typeof value === 'object';
+
+    // XPath over xml2Json output: elements match by local name, attributes are under '$', text under '_'
+    const localName = (key) => key.slice(key.indexOf(':') + 1);
+    const nodeText = (node) => (isObject(node) ? (node._ === undefined ? '' : String(node._)) : String(node));
+    const childNodes = (node) => (isObject(node) ? Object.entries(node) : [])
+        .filter(([key]) => key !== '$' && key !== '_')
+        .flatMap(([key, value]) => (Array.isArray(value) ? value : [value]).map((child) => [key, child]));
+    const attribute = (node, name) => {
+        const attributes = isObject(node) && isObject(node.$) ? node.$ : {};
+        const key = Object.keys(attributes).find((k) => localName(k) === name);
+        return key === undefined ? undefined : attributes[key];
+    };
+    const xpathPredicate = (source) => {
+        let match;
+        if (/^\d+$/.test(source)) return (nodes) => nodes.slice(source - 1, +source);
+        if (source === 'last()') return (nodes) => nodes.slice(-1);
+        if ((match = /^@([\w.:-]+)\s*=\s*(['"])(.*)\2$/.exec(source))) {
+            const [, name, , value] = match;
+            return (nodes) => nodes.filter((node) => attribute(node, localName(name)) === value);
+        }
+        if ((match = /^([\w.:-]+)\s*=\s*(['"])(.*)\2$/.exec(source))) {
+            const [, name, , value] = match;
+            return (nodes) => nodes.filter((node) => childNodes(node)
+                .some(([key, child]) => localName(key) === localName(name) && nodeText(child) === value));
+        }
+        throw new Error('Unsupported XPath predicate: [' + source + ']');
+    };
+    const compileXPathSteps = (path) => {
+        const steps = [];
+        const step = /\s*(\/\/?)(?:(?:[\w.-]+|\*):)?(text\(\)|@?[\w.-]+|\*)((?:\[[^\]]*\])*)\s*/y;
+        while (step.lastIndex < path.length) {
+            const match = step.exec(path);
+            if (match === null) throw new Error('Unsupported XPath: ' + path);
+            const predicates = [...match[3].matchAll(/\[([^\]]*)\]/g)].map((p) => xpathPredicate(p[1].trim()));
+            steps.push({deep: match[1] === '//', name: match[2], predicates});
+        }
+        return (root) => steps.reduce((nodes, {deep, name, predicates}) => {
+            const selected = [];
+            const visit = (node) => {
+                if (name === 'text()') {
+                    if (!isObject(node) || node._ !== undefined) selected.push(nodeText(node));
+                } else if (name.startsWith('@')) {
+                    const value = attribute(node, name.slice(1));
+                    if (value !== undefined) selected.push(value);
+                } else {
+                    const matches = childNodes(node).filter(([key]) => name === '*' || localName(key) === name);
+                    selected.push(...predicates.reduce((found, predicate) => predicate(found), matches.map(([, c]) => c)));
+                }
+                if (deep) childNodes(node).forEach(([, child]) => visit(child));
+            };
+            nodes.forEach(visit);
+            return selected;
+        }, [root]);
+    };
+    const compileXPath = (expression) => {
+        const call = /^\s*(count|exists|boolean|string)\s*\(([\s\S]*)\)\s*$/.exec(expression);
+        const select = compileXPathSteps(call ? call[2].trim() : expression.trim());
+        if (!call) return select;
+        const reduce = {
+            count: (nodes) => nodes.length,
+            exists: (nodes) => nodes.length > 0,
+            boolean: (nodes) => nodes.length > 0,
+            string: (nodes) => (nodes.length ? nodeText(nodes[0]) : ''),
+        }[call[1]];
+        return (root) => reduce(select(root));
+    };
+
+    // JSONPath: names, wildcards, indices, recursive descent and [?(@.a.b op literal)] filters
+    const childValues = (value) => (Array.isArray(value) ? value : isObject(value) ? Object.values(value) : []);
+    const descendants = (value) => [value, ...childValues(value).flatMap(descendants)];
+    const jsonFilter = (source) => {
+        const match = /^@((?:\.[\w$-]+)+)\s*(?:(==|!=|<=|>=|<|>)\s*(.+?))?\s*$/.exec(source);
+        if (match === null) throw new Error('Unsupported JSONPath filter: ' + source);
+        const names = match[1].slice(1).split('.');
+        const read = (item) => names.reduce((value, name) => (isObject(value) ? value[name] : undefined), item);
+        if (!match[2]) return (item) => read(item) !== undefined;
+        const literal = /^'(.*)'$/.test(match[3]) ? match[3].slice(1, -1) : JSON.parse(match[3]);
+        const compare = {
+            '==': (a) => a === literal, '!=': (a) => a !== literal, '<': (a) => a < literal,
+            '<=': (a) => a <= literal, '>': (a) => a > literal, '>=': (a) => a >= literal,
+        }[match[2]];
+        return (item) => compare(read(item));
+    };
+    const compileJsonPath = (expression) => {
+        let path = expression.trim();
+        path = path.startsWith('$') ? path.slice(1) : /^[.[]/.test(path) ? path : '.' + path;
+        const steps = [];
+        const step = /(\.\.|\.)?(?:([A-Za-z_$][\w$-]*)|(\*)|\[\s*(?:(-?\d+)|'([^']*)'|"([^"]*)"|(\*)|\?\((.*?)\))\s*\])/y;
+        while (step.lastIndex < path.length) {
+            const match = step.exec(path);
+            if (match === null || (match[1] === undefined && (match[2] || match[3]))) {
+                throw new Error('Unsupported JSONPath: ' + expression);
+            }
+            const [, dots, name, star, index, quoted, doubleQuoted, bracketStar, filter] = match;
+            let select;
+            if (star || bracketStar) {
+                select = childValues;
+            } else if (index !== undefined) {
+                select = (value) => (Array.isArray(value) && value.at(+index) !== undefined ? [value.at(+index)] : []);
+            } else if (filter !== undefined) {
+                const keep = jsonFilter(filter);
+                select = (value) => childValues(value).filter(keep);
+            } else {
+                const key = name !== undefined ? name : quoted !== undefined ? quoted : doubleQuoted;
+                select = (value) => (isObject(value) && !Array.isArray(value) && key in value ? [value[key]] : []);
+            }
+            steps.push(dots === '..' ? (values) => values.flatMap(descendants).flatMap(select)
+                                     : (values) => values.flatMap(select));
+        }
+        return (root) => steps.reduce((values, apply) => apply(values), root === undefined ? [] : [root]);
+    };
+
+    // Schema Compliance: response schemas of OpenAPI/Swagger documents held in collection variables
+    let ajv;
+    const documents = new Map();
+    const responseSchemaPointer = (document, path, method, status) => {
+        const responses = (((document.paths || {})[path] || {})[method] || {}).responses || {};
+        const code = [String(status), String(status)[0] + 'XX', 'default'].find((c) => c in responses);
+        if (code === undefined) return null;
+        const pointer = ['paths', path, method, 'responses', code];
+        const response = responses[code];
+        if (response.schema) {
+            pointer.push('schema');
+        } else {
+            const content = response.content || {};
+            const mediaType = Object.keys(content).find((type) => /json/i.test(type));
+            if (mediaType === undefined || !content[mediaType].schema) return null;
+            pointer.push('content', mediaType, 'schema');
+        }
+        return '#/' + pointer.map((s) => encodeURIComponent(s.replace(/~/g, '~0').replace(/\//g, '~1'))).join('/');
+    };
+    const compileResponseSchema = (name, path, method, status, source) => {
+        if (ajv === undefined) {
+            const Ajv = require('ajv');
+            ajv = new Ajv({allErrors: true, validateSchema: false, unknownFormats: 'ignore', nullable: true, logger: false});
+        }
+        const id = 'readyapi:' + encodeURIComponent(name);
+        let document = documents.get(name);
+        if (document === undefined) {
+            const text = source();
+            if (!text) {
+                console.warn('Schema Compliance is not checked: no definition "' + name + '" in the collection variables');
+                return () => true;
+            }
+            document = JSON.parse(text);
+            ajv.addSchema(document, id);
+            documents.set(name, document);
+        }
+        const pointer = responseSchemaPointer(document, path, method, status);
+        // Responses the definition has no JSON schema for are compliant
+        return pointer === null ? () => true : ajv.getSchema(id + pointer);
+    };
+
+    const valueText = (value) => (isObject(value) ? JSON.stringify(value) : String(value));
+    Object.defineProperty(globalThis, 'readyapiAssertions', {configurable: true, value: {
+        xpath: (xml, expression) => cached('xpath', expression, compileXPath)(xml),
+        jsonPath: (json, expression) => cached('jsonpath', expression, compileJsonPath)(json),
+        pattern: (source) => cached('pattern', source, (s) => new RegExp(s, 's')),
+        // Schema errors of a response, or null; source reads the definition document on first use
+        validate: (json, status, name, path, method, source) => {
+            const key = JSON.stringify([name, path, method, status]);
+            const validate = cached('schema', key, () => compileResponseSchema(name, path, method, status, source));
+            return validate(json) ? null : ajv.errorsText(validate.errors, {dataVar: 'response'});
+        },
+        // The text ReadyAPI compares: the first node or value, or all values of a multi-valued JSONPath
+        text: (result) => (!Array.isArray(result) ? String(result)
+            : result.length === 0 ? null
+            : result.length === 1 ? (isObject(result[0]) && '_' in result[0] ? nodeText(result[0]) : valueText(result[0]))
+            : JSON.stringify(result)),
+    }});
+}""".split("\n")
+
+
+def _config_text(assertion: ET.Element, name: str, namespaces: Dict[str, str]) -> str:
+    """An assertion setting, from an attribute or from its configuration element"""
+    return (assertion.get(name) or assertion.findtext(f'.//con:{name}', '', namespaces)
+            or assertion.findtext(f'.//{name}', '') or '')
+
+
+def _wildcard_pattern(expected: str) -> str:
+    """ReadyAPI's '*' wildcard as an anchored regular expression"""
+    return '^' + '[\\s\\S]*'.join(re.escape(part) for part in expected.split('*')) + '$'
+
+
+def path_assertion_check(assertion: ET.Element, namespaces: Dict[str, str]) -> Optional[Tuple[str, str, str]]:
+    """
+    The check of an XPath or JSONPath assertion, as a pm.expect statement
+    over `xml` (xml2Json output) or `json` and the runtime as `readyapi`
+
+    Returns:
+        What the check reads ('xml' or 'json'), its name and the statement; None for other assertions
+    """
+    assertion_type = assertion.get('type', '')
+    path = _NAMESPACE_DECLARATION.sub('', _config_text(assertion, 'path', namespaces)).strip()
+    expected = _config_text(assertion, 'content', namespaces)
+    name = assertion.get('name', '') or assertion_type
+    if not path:
+        return None
+    label = json.dumps(f"{name}: {path}")
+    if 'XPath' in assertion_type:
+        actual = f"readyapi.text(readyapi.xpath(xml, {json.dumps(path)}))"
+        reads = 'xml'
+    elif 'JsonPath' in assertion_type:
+        selected = f"readyapi.jsonPath(json, {json.dumps(path)})"
+        if 'Existence' in assertion_type:
+            exists = expected.strip().lower() != 'false'
+            return 'json', name, f"pm.expect({selected}.length > 0, {label}).to.equal({json.dumps(exists)});"
+        if 'Count' in assertion_type:
+            count = int(expected.strip() or 0)
+            return 'json', name, f"pm.expect({selected}.length, {label}).to.equal({count});"
+        if 'RegEx' in assertion_type:
+            pattern = json.dumps(f"^(?:{_config_text(assertion, 'regEx', namespaces) or expected})$")
+            return 'json', name, f"pm.expect(readyapi.text({selected}), {label}).to.match(readyapi.pattern({pattern}));"
+        actual = f"readyapi.text({selected})"
+        reads = 'json'
+    else:
+        return None
+    if _config_text(assertion, 'allowWildcards', namespaces).lower() == 'true' and '*' in expected:
+        pattern = json.dumps(_wildcard_pattern(expected))
+        return reads, name, f"pm.expect({actual}, {label}).to.match(readyapi.pattern({pattern}));"
+    return reads, name, f"pm.expect({actual}, {label}).to.equal({json.dumps(expected)});"
+
+
+def schema_variable(service: str) -> str:
+    """The collection variable holding the definition document of an interface"""
+    return SCHEMA_VARIABLE_PREFIX + service
+
+
+def schema_check(service: str, path: str, method: str) -> str:
+    """
+    A pm.expect statement validating `json` against the definition's schema
+    for the operation and the actual status code; null means compliant
+    """
+    variable = json.dumps(schema_variable(service))
+    arguments = ", ".join(json.dumps(value) for value in (path, method.lower()))
+    return (f"pm.expect(readyapi.validate(json, pm.response.code, {variable}, {arguments}, "
+            f"() => pm.collectionVariables.get({variable})), 'Schema Compliance').to.equal(null);")
+
+
+def schema_references(line: str) -> List[str]:
+    """The definition variables a script line validates against"""
+    return [json.loads(name) for name in _SCHEMA_REFERENCE.findall(line)]
+
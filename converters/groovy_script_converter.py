@@ -1,14 +1,41 @@
 import re
+import json
 import logging
 from typing import List, Dict, Any, Optional
+from xml.etree import ElementTree as ET
 from analyzer.groovy_behavior_classifier import GroovyBehaviorClassifier, GroovyOperation
 
 logger = logging.getLogger(__name__)
 
+# Start of the request description of items that only carry a converted Groovy script
+SCRIPT_STEP_DESCRIPTION = "Converted from Groovy script"
+
+# `assert <condition>` with an optional `: <message>`
+_GROOVY_ASSERT = re.compile(r'assert\s+(?P<condition>.+?)(?:\s*:\s*(?P<message>"[^"$]*"|\'[^\']*\'))?\s*;?\s*$')
+
+# Conditions made only of these tokens read the same in JavaScript: literals,
+# names, member access and calls, comparison, arithmetic and boolean operators
+_PORTABLE_TOKEN = re.compile(
+    r'\s+|\d+(?:\.\d+)?|\'[^\'\\]*\'|"[^"$\\]*"|[A-Za-z_]\w*|\?\.|[.,()\[\]]'
+    r'|===?|!==?|<=|>=|&&|\|\||[<>!+\-*/%]'
+)
+
+
+def _portable_condition(condition: str) -> Optional[str]:
+    """A Groovy assertion condition as JavaScript, or None if it cannot be carried over as is"""
+    position = 0
+    while position < len(condition):
+        match = _PORTABLE_TOKEN.match(condition, position)
+        if match is None:
+            return None
+        position = match.end()
+    return re.sub(r'\.size\(\)', '.length', condition)
+
+
 class GroovyScriptConverter:
-    def __init__(self):
+    def __init__(self, optimized_scripts: bool = False):
         # No predefined functions - we'll handle them generically
-        pass
+        self.optimized_scripts = optimized_scripts
         
     def convert(self, groovy_script: str, script_type: str = "prerequest") -> str:
         """
@@ -252,6 +279,8 @@ class GroovyScriptConverter:
     
     def _convert_assertion(self, op: GroovyOperation) -> List[str]:
         """Convert assertion to JavaScript"""
+        if self.optimized_scripts:
+            return self._compile_assertion(op)
         lines = [
             "pm.test('Assertion', function() {",
             f"    // Original assertion: {op.line}",
@@ -267,14 +296,57 @@ class GroovyScriptConverter:
         ]
         return lines
 
-def convert_groovy_script(groovy_script: str, script_type: str = "prerequest") -> str:
+    def _compile_assertion(self, op: GroovyOperation) -> List[str]:
+        """
+        Assertion as inline JavaScript, without eval. A condition that cannot
+        be carried over fails its test, as the annotated script's eval would.
+        """
+        match = _GROOVY_ASSERT.match(op.line.strip())
+        condition = _portable_condition(match.group('condition')) if match else None
+        name = json.dumps(f"Assertion: {op.line.strip()}")
+        if condition is None:
+            message = json.dumps(f"Groovy assertion not converted: {op.line.strip()}")
+            return [f"pm.test({name}, function() {{ pm.expect.fail({message}); }});", ""]
+        message = match.group('message') or json.dumps(op.line.strip())
+        return [f"pm.test({name}, function() {{ pm.expect({condition}, {message}).to.be.ok; }});", ""]
+
+def groovy_script_source(test_step) -> Optional[str]:
+    """
+    The Groovy source of a script step, read from the <script> element of its config
+    """
+    config = test_step.config
+    if isinstance(config, str):
+        try:
+            config = ET.fromstring(config)
+        except ET.ParseError:
+            return None
+    if config is None:
+        return None
+    for element in config.iter():
+        if isinstance(element.tag, str) and element.tag.rsplit('}', 1)[-1] == 'script':
+            return element.text or ''
+    return None
+
+def is_script_step(item: Dict[str, Any]) -> bool:
+    """Whether a converted item only carries a Groovy script, with a placeholder request that is not meant to be sent"""
+    request = item.get("request")
+    return isinstance(request, dict) and str(request.get("description", "")).startswith(SCRIPT_STEP_DESCRIPTION)
+
+def convert_groovy_script(groovy_script: str, script_type: str = "prerequest", optimized_scripts: bool = False) -> str:
     """
     Convert a Groovy script to JavaScript
     """
-    converter = GroovyScriptConverter()
+    converter = GroovyScriptConverter(optimized_scripts)
     return converter.convert(groovy_script, script_type)
 
-def create_script_step(name: str, script_type: str, script_content: str = None) -> Dict[str, Any]:
+def convert_groovy_assertion(line: str, optimized_scripts: bool = False) -> List[str]:
+    """
+    A Groovy `assert` line as a JavaScript test, compiled inline with optimized_scripts
+    """
+    return GroovyScriptConverter(optimized_scripts)._convert_assertion(GroovyOperation("assertion", line=line))
+
+def create_script_step(name: str, script_type: str, script_content: str = None,
+                       optimized_scripts: bool = False) -> Dict[str, Any]:
     """
     Create a Postman script step from a Groovy script
     """
@@ -282,7 +354,7 @@ def create_script_step(name: str, script_type: str, script_content: str = None)
         script_content = ""
     
     # Convert Groovy to JavaScript
-    js_script = convert_groovy_script(script_content, script_type)
+    js_script = convert_groovy_script(script_content, script_type, optimized_scripts)
     
     # Create the step
     step = {
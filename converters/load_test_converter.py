@@ -0,0 +1,104 @@
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+from converters.groovy_script_converter import is_script_step
+
+logger = logging.getLogger(__name__)
+
+# How ReadyAPI's limit types bound a load test: seconds, total test case runs, or runs per thread
+LIMIT_TYPES = {"TIME": "seconds", "COUNT": "runs", "COUNT_PER_THREAD": "runs_per_thread"}
+
+# Strategy name -> (plan name, [(plan setting, ReadyAPI setting, default)])
+STRATEGIES = {
+    "simple": ("simple", [("delay_ms", "testDelay", 1000), ("random_factor", "randomFactor", 0.5)]),
+    "burst": ("burst", [("burst_delay_ms", "burstDelay", 10000), ("burst_duration_ms", "burstDuration", 10000)]),
+    "thread": ("thread", [("start_threads", "startThreadCount", 1), ("end_threads", "endThreadCount", None)]),
+    "variance": ("variance", [("interval_ms", "interval", 60000), ("variance", "variance", 0.5)]),
+    "fixed-rate": ("fixed_rate", [("rate", "testRate", 10)]),
+}
+
+# Assertion type -> (plan name, [(plan setting, ReadyAPI setting, default)])
+ASSERTIONS = {
+    "step average": ("step_average", [("max_ms", "maxAverage", 1000), ("min_requests", "minRequests", 100)]),
+    "step maximum": ("step_maximum", [("max_ms", "maxValue", 1000), ("min_requests", "minRequests", 100)]),
+    "step tps": ("step_tps", [("min_tps", "minValue", 10), ("min_requests", "minRequests", 100)]),
+    "max errors": ("max_errors", [("max_errors", "maxAbsoluteErrors", 100),
+                                  ("max_error_ratio", "maxRelativeErrors", 0.1)]),
+    "step status": ("step_status", []),
+}
+
+
+def _number(value: Optional[str], default: Union[int, float, None]) -> Union[int, float, None]:
+    if value is None or value == '':
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        return default
+    return int(number) if number.is_integer() else number
+
+
+def _settings(spec, settings: Dict[str, str]) -> Dict[str, Any]:
+    return {name: _number(settings.get(readyapi_name), default) for name, readyapi_name, default in spec}
+
+
+def convert_load_test(load_test) -> Dict[str, Any]:
+    """
+    Convert a ReadyAPILoadTest into a load-runner plan entry: its threads,
+    limit, strategy and SLA assertions. Strategies and assertions the runner
+    does not know are logged; unknown strategies run as simple. A fixed rate
+    that is not positive raises ValueError.
+    """
+    threads = _number(load_test.settings.get('threadCount'), 5)
+    limit_type = load_test.settings.get('limitType', 'TIME')
+    if limit_type not in LIMIT_TYPES:
+        logger.warning(f"Load test {load_test.name}: limit type {limit_type} is run as a time limit")
+        limit_type = 'TIME'
+
+    strategy_name = load_test.strategy.lower()
+    if strategy_name not in STRATEGIES:
+        logger.warning(f"Load test {load_test.name}: {load_test.strategy} strategy is run as simple")
+        strategy_name = "simple"
+    plan_name, spec = STRATEGIES[strategy_name]
+    strategy = {"type": plan_name, **_settings(spec, load_test.strategy_settings)}
+    if plan_name == "fixed_rate" and not strategy["rate"] > 0:
+        raise ValueError(f"Load test {load_test.name}: the fixed-rate strategy needs a positive testRate, "
+                         f"not {strategy['rate']}")
+    if plan_name == "thread" and strategy["end_threads"] is None:
+        strategy["end_threads"] = threads
+
+    assertions = []
+    for assertion_type, name, settings in load_test.assertions:
+        if assertion_type.lower() not in ASSERTIONS:
+            logger.warning(f"Load test {load_test.name}: {assertion_type} assertion {name} is not checked")
+            continue
+        plan_type, spec = ASSERTIONS[assertion_type.lower()]
+        assertions.append({"type": plan_type, "name": name or assertion_type,
+                           "step": settings.get('testStep') or 'ANY', **_settings(spec, settings)})
+
+    return {
+        "name": load_test.name,
+        "threads": threads,
+        "start_delay_ms": _number(load_test.settings.get('startDelay'), 0),
+        "limit": {"type": LIMIT_TYPES[limit_type], "value": _number(load_test.settings.get('testLimit'), 60)},
+        "strategy": strategy,
+        "assertions": assertions,
+    }
+
+
+def load_plan_entries(test_suite, test_case, case_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The plan entries of a test case's load tests, each replaying the
+    requests among the case's converted items in order. Items that only
+    carry a Groovy script are not requests to replay.
+    """
+    requests = [{"name": item["name"], "request": item["request"]} for item in case_items
+                if "request" in item and not is_script_step(item)]
+    entries = []
+    for load_test in test_case.load_tests:
+        if not requests:
+            logger.warning(f"Load test {load_test.name} of {test_case.name} has no requests to run")
+            continue
+        entries.append({**convert_load_test(load_test), "test_suite": test_suite.name,
+                        "test_case": test_case.name, "requests": requests})
+    return entries
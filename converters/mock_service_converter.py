@@ -0,0 +1,51 @@
+import logging
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# ReadyAPI dispatch styles the mock server reproduces; the others serve the default response
+DISPATCH_STYLES = {"SEQUENCE": "sequence", "RANDOM": "random"}
+
+SOAP_MEDIA_TYPE = "text/xml; charset=utf-8"
+
+
+def _convert_response(response: Dict[str, Any], media_type: str) -> Dict[str, Any]:
+    headers = [list(header) for header in response["headers"]]
+    if not any(name.lower() == 'content-type' for name, _ in headers):
+        headers.append(["Content-Type", response["media_type"] or media_type])
+    status = response["status"]
+    return {"name": response["name"], "status": int(status) if status.isdigit() else 200,
+            "headers": headers, "body": response["body"]}
+
+
+def convert_mock_service(mock_service) -> Dict[str, Any]:
+    """
+    Convert a ReadyAPIMockService into a mock server definition: the port
+    and path it listens on, and each operation's route, dispatch and responses
+    """
+    media_type = "application/json" if mock_service.kind == 'rest' else SOAP_MEDIA_TYPE
+    operations = []
+    for operation in mock_service.operations:
+        if not operation.responses:
+            logger.warning(f"Mock operation {operation.name} of {mock_service.name} has no responses")
+            continue
+        dispatch = DISPATCH_STYLES.get(operation.dispatch_style.upper(), "default")
+        if dispatch == "default" and len(operation.responses) > 1:
+            logger.warning(f"Mock operation {operation.name} of {mock_service.name}: {operation.dispatch_style} "
+                           f"dispatch is served with the default response")
+        names = [response["name"] for response in operation.responses]
+        operations.append({
+            "name": operation.name,
+            "method": operation.method,
+            "path": operation.path,
+            "dispatch": dispatch,
+            "default_response": names.index(operation.default_response) if operation.default_response in names else 0,
+            "responses": [_convert_response(response, media_type) for response in operation.responses],
+        })
+    return {
+        "name": mock_service.name,
+        "type": mock_service.kind,
+        "port": mock_service.port,
+        "path": mock_service.path,
+        "operations": operations,
+    }
@@ -1,25 +1,70 @@
+import re
+import json
+import logging
 from xml.etree import ElementTree as ET
+from typing import Any, Dict, List, Optional
+
+from converters.assertion_runtime import RUNTIME_ACCESS
+
+logger = logging.getLogger(__name__)
+
+NAMESPACES = {'con': 'http://eviware.com/soapui/config'}
+
+# Step types of property transfer steps, as written by ReadyAPI and as named by the dispatchers
+PROPERTY_TRANSFER_TYPES = {"transfer", "propertytransfer", "property-transfer"}
+
+# Properties of a request step that hold its response body
+RESPONSE_PROPERTIES = {"response", "responseasxml", "rawresponse"}
+
+_JSON_PATH_SEGMENT = re.compile(r'\.([A-Za-z_$][\w$-]*)|\[(\d+)\]|\[\'([^\']*)\'\]|\["([^"]*)"\]')
+_JS_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+_XPATH_STEP = re.compile(r'(?:(?:\*|[\w.-]+):)?(?P<name>\*|@?[\w.-]+|text\(\))(?:\[(?P<index>\d+)\])?')
+_NAMESPACE_DECLARATION = re.compile(r'declare\s+namespace\s+[\w.-]+\s*=\s*(?:\'[^\']*\'|"[^"]*")\s*;')
+
+def parse_property_transfers(test_step) -> List[Dict[str, Any]]:
+    """The enabled transfers of a property transfer step"""
+    config = test_step.config
+    if isinstance(config, str):
+        config = ET.fromstring(config)
+    if config is None:
+        return []
+
+    transfers = []
+    elements = config.findall('.//con:transfers', NAMESPACES)
+    fields = {name: 'con:' + name for name in
+              ('name', 'sourceType', 'sourceStep', 'sourcePath', 'targetType', 'targetStep', 'targetPath', 'type')}
+    if not elements:
+        # Older configs without the namespace, one <transfer> per mapping
+        elements = config.findall('transfer')
+        fields = {'name': 'name', 'sourceType': 'sourceProperty', 'sourceStep': 'sourceStep',
+                  'sourcePath': 'sourcePath', 'targetType': 'targetProperty', 'targetStep': 'targetStep',
+                  'targetPath': 'targetPath', 'type': 'type'}
+    for element in elements:
+        if element.get('disabled') == 'true':
+            continue
+        transfer = {key: (element.findtext(path, '', NAMESPACES) or '').strip() for key, path in fields.items()}
+        transfers.append({
+            "name": transfer["name"],
+            "from_step": transfer["sourceStep"],
+            "from_property": transfer["sourceType"],
+            "from_path": transfer["sourcePath"],
+            "path_language": transfer["type"].upper(),
+            "to_step": transfer["targetStep"],
+            "to_property": transfer["targetType"],
+            "to_path": transfer["targetPath"],
+        })
+    return transfers
+
 
 def convert_property_transfer_step(test_step, context):
     try:
-        config_xml = ET.fromstring(test_step.config)
-        transfers = config_xml.findall("transfer")
-
-        mappings = []
-        for transfer in transfers:
-            source_step = transfer.findtext("sourceStep")
-            source_prop = transfer.findtext("sourceProperty")
-            target_step = transfer.findtext("targetStep")
-            target_prop = transfer.findtext("targetProperty")
-            xpath = transfer.findtext("sourcePath") or ""
-
-            mappings.append({
-                "from_step": source_step,
-                "from_property": source_prop,
-                "from_xpath": xpath,
-                "to_step": target_step,
-                "to_property": target_prop
-            })
+        mappings = [{
+            "from_step": transfer["from_step"],
+            "from_property": transfer["from_property"],
+            "from_xpath": transfer["from_path"],
+            "to_step": transfer["to_step"],
+            "to_property": transfer["to_property"]
+        } for transfer in parse_property_transfers(test_step)]
 
         return {
             "type": "property-transfer",
@@ -27,5 +72,126 @@ def convert_property_transfer_step(test_step, context):
             "note": f"Mapped properties from '{test_step.name}'"
         }
     except Exception as e:
-        print(f"[ERROR] Failed to convert Property Transfer step '{test_step.name}': {e}")
+        logger.error(f"Failed to convert Property Transfer step '{test_step.name}': {e}")
+        return None
+
+
+def compile_json_path(path: str) -> Optional[str]:
+    """
+    A JSONPath of names and indices as optional-chaining property access on
+    `json`, e.g. '$.items[0].id' -> 'json?.items?.[0]?.id'; None for wildcards,
+    filters, recursive descent and the like
+    """
+    path = path.strip()
+    if path.startswith('$'):
+        path = path[1:]
+    elif path and not path.startswith(('.', '[')):
+        path = '.' + path
+    expression = 'json'
+    position = 0
+    while position < len(path):
+        match = _JSON_PATH_SEGMENT.match(path, position)
+        if match is None:
+            return None
+        name, index, quoted, double_quoted = match.groups()
+        if index is not None:
+            expression += f'?.[{index}]'
+        else:
+            name = name if name is not None else quoted if quoted is not None else double_quoted
+            expression += f'?.{name}' if _JS_IDENTIFIER.fullmatch(name) else f'?.[{json.dumps(name)}]'
+        position = match.end()
+    return expression
+
+
+def compile_xpath(path: str) -> Optional[List[List[Any]]]:
+    """
+    An XPath of child and descendant steps, matched by local name, with
+    optional [n] positions and a final @attribute or text(), as [axis, local
+    name, 1-based index or 0] steps; None for anything else. Paths with steps
+    are read through the assertion runtime.
+    """
+    path = _NAMESPACE_DECLARATION.sub('', path).strip()
+    if not path.startswith('/'):
+        return None
+    steps = []
+    parts = path.split('/')[1:]
+    deep = False
+    for position, part in enumerate(parts):
+        if not part:
+            if deep:
+                return None
+            deep = True
+            continue
+        match = _XPATH_STEP.fullmatch(part.strip())
+        if match is None:
+            return None
+        name = match.group('name')
+        if name == 'text()' or name.startswith('@'):
+            if position != len(parts) - 1:
+                return None
+            if name == 'text()':
+                deep = False
+                continue
+        steps.append([deep, name, int(match.group('index') or 0)])
+        deep = False
+    return steps if steps and not deep else None
+
+
+def _source_expression(transfer: Dict[str, Any], needs: set) -> Optional[str]:
+    """JavaScript for a transfer's source value, adding what it reads ('body', 'json', 'xml') to needs"""
+    path = transfer["from_path"]
+    if transfer["from_property"].lower() not in RESPONSE_PROPERTIES:
+        return None if path else f"pm.environment.get({json.dumps(transfer['from_property'])})"
+    language = transfer["path_language"]
+    if not path:
+        expression, reads = "body", 'body'
+    elif language == "JSONPATH" or (not language and path.lstrip().startswith('$')):
+        expression, reads = compile_json_path(path), 'json'
+    elif language in ("XPATH", ""):
+        path = _NAMESPACE_DECLARATION.sub('', path).strip()
+        expression = f"readyapi.xpath(xml, {json.dumps(f'string({path})')})" if compile_xpath(path) else None
+        reads = 'xml'
+    else:
         return None
+    if expression is not None:
+        needs.update(('body', reads))
+    return expression
+
+
+def compile_property_transfers(transfers: List[Dict[str, Any]]) -> List[str]:
+    """
+    Script lines applying transfers in one pass: the response body is read
+    once and parsed as JSON or XML at most once, then every target is set.
+    Targets are environment variables, as the Groovy conversion uses for
+    ReadyAPI properties. Transfers that cannot be compiled are left as comments;
+    when none can, there are no lines at all.
+    """
+    needs = set()
+    assignments = []
+    for transfer in transfers:
+        label = transfer["name"] or f"{transfer['from_step']}.{transfer['from_property']}"
+        writable = transfer["to_property"] and not transfer["to_path"]
+        expression = _source_expression(transfer, needs) if writable else None
+        if expression is None:
+            source = " ".join((transfer["from_path"] or transfer["from_property"]).split())
+            logger.warning(f"Property transfer '{label}' is not converted: {source} -> "
+                           f"{transfer['to_step']}.{transfer['to_property']}")
+            assignments.append(f"    // Not converted: {' '.join(label.split())} ({source})")
+            continue
+        assignments.append(f"    pm.environment.set({json.dumps(transfer['to_property'])}, {expression});")
+    if all(line.startswith("    // Not converted:") for line in assignments):
+        return []
+
+    lines = ["// Property transfers", "(function () {"]
+    if 'body' in needs:
+        lines.append("    const body = pm.response.text();")
+    if 'json' in needs:
+        lines.append("    let json;")
+        lines.append("    try { json = JSON.parse(body); } catch (e) { console.error('Property transfer: response is not JSON'); }")
+    if 'xml' in needs:
+        lines.append(f"    const readyapi = {RUNTIME_ACCESS};")
+        lines.append("    let xml;")
+        lines.append("    try { xml = xml2Json(body); } catch (e) { console.error('Property transfer: response is not XML'); }")
+    lines.extend(assignments)
+    lines.append("})();")
+    return lines
@@ -1,16 +1,86 @@
 from xml.etree import ElementTree as ET
 from urllib.parse import urlparse, urljoin
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import json
 import logging
 
+from converters.assertion_runtime import RUNTIME_ACCESS, path_assertion_check, schema_check
+
 logger = logging.getLogger(__name__)
 
-def convert_rest_request(test_step) -> Optional[Dict[str, Any]]:
+
+def _js_string(value: str) -> str:
+    """A JavaScript string literal for value"""
+    return json.dumps(value)
+
+
+def build_optimized_test_script(step_name: str, assertions: List[ET.Element], content_type: str,
+                                namespaces: Dict[str, str], operation: Optional[Tuple[str, str, str]] = None) -> List[str]:
+    """
+    Test script making the same checks as the annotated script, but reading
+    the response body at most once and parsing it as JSON at most once, with
+    every check in one pm.test and a message naming each failed check.
+    XPath, JSONPath and Schema Compliance checks run on the collection's
+    assertion runtime; operation is the (interface, resource path, method)
+    the request belongs to.
+    """
+    checks = ["pm.expect(pm.response.code, 'Status code is 200').to.equal(200);"]
+    uses_text = False
+    reads = set()
+    for assertion in assertions:
+        assertion_type = assertion.get('type', '')
+        if 'SLA' in assertion_type:
+            timeout = assertion.get('timeout', '1000')
+            checks.append(f"pm.expect(pm.response.responseTime, 'Response time is acceptable').to.be.below({timeout});")
+        elif 'Status' in assertion_type or 'StatusCode' in assertion_type:
+            codes_list = [code.strip() for code in assertion.get('codes', '200').split(',')]
+            if len(codes_list) == 1:
+                checks.append(f"pm.expect(pm.response.code, 'Status code check').to.equal({codes_list[0]});")
+            else:
+                checks.append(f"pm.expect([{', '.join(codes_list)}], 'Status code check').to.include(pm.response.code);")
+        elif 'Contains' in assertion_type or 'content' in assertion_type.lower():
+            content = assertion.get('content', '') or assertion.findtext('.//con:content', '', namespaces) or ''
+            if content:
+                uses_text = True
+                checks.append(f"pm.expect(text, 'Response contains expected content').to.include({_js_string(content)});")
+        elif 'XPath' in assertion_type or 'JsonPath' in assertion_type:
+            check = path_assertion_check(assertion, namespaces)
+            if check:
+                reads.add(check[0])
+                checks.append(check[2])
+        elif 'Schema' in assertion_type and operation:
+            reads.add('json')
+            checks.append(schema_check(*operation))
+        elif 'Schema' in assertion_type:
+            checks.append("// Schema validation was in the original ReadyAPI test and is not checked")
+
+    is_json = 'json' in content_type.lower()
+    test_script = ["// Test script for request: " + step_name]
+    if uses_text or is_json or reads:
+        test_script.append("const text = pm.response.text();")
+    if is_json or 'json' in reads:
+        test_script.append("let json;")
+        test_script.append("try { json = JSON.parse(text); } catch (e) { console.error('Failed to parse response as JSON:', e); }")
+    if is_json:
+        checks.insert(1, "if (json !== undefined) pm.expect(json, 'Response has expected structure').to.be.an('object');")
+    if 'xml' in reads:
+        test_script.append("let xml;")
+        test_script.append("try { xml = xml2Json(text); } catch (e) { console.error('Failed to parse response as XML:', e); }")
+    if reads:
+        test_script.append(f"const readyapi = {RUNTIME_ACCESS};")
+    test_script.append(f"pm.test({_js_string(step_name + ' assertions')}, function () {{")
+    test_script.extend("    " + check for check in checks)
+    test_script.append("});")
+    return test_script
+
+
+def convert_rest_request(test_step, optimized_scripts: bool = False) -> Optional[Dict[str, Any]]:
     """
     Convert a ReadyAPI REST request test step to Postman format
     
     Args:
         test_step: The ReadyAPI test step to convert
+        optimized_scripts: Generate test scripts that read and parse the response once
         
     Returns:
         Optional[Dict[str, Any]]: The converted Postman request object, or None if conversion fails
@@ -259,7 +329,20 @@ def convert_rest_request(test_step) -> Optional[Dict[str, Any]]:
                 except Exception as e:
                     logger.debug(f"Error finding assertions with {path}: {str(e)}")
 
-        if assertions:
+        # The interface operation Schema Compliance assertions validate against
+        operation = None
+        if config.get('service') and (config.get('resourcePath') or resource_path):
+            operation = (config.get('service'), config.get('resourcePath') or resource_path, method)
+
+        if assertions and optimized_scripts:
+            request_obj["event"] = [{
+                "listen": "test",
+                "script": {
+                    "type": "text/javascript",
+                    "exec": build_optimized_test_script(test_step.name, assertions, content_type, namespaces, operation)
+                }
+            }]
+        elif assertions:
             test_script = [
                 "// Test script for request: " + test_step.name,
                 "pm.test('Status code is 200', function () {",
@@ -334,19 +417,33 @@ def convert_rest_request(test_step) -> Optional[Dict[str, Any]]:
                             f"    pm.expect(pm.response.text()).to.include('{escaped_content}');",
                             "});"
                         ])
-                elif 'XPath' in assertion_type:
-                    # XPath assertion
-                    xpath = assertion.get('path', '') or assertion.findtext('.//con:path', '', namespaces) or ''
-                    if xpath:
+                elif 'XPath' in assertion_type or 'JsonPath' in assertion_type:
+                    # XPath and JSONPath assertions, checked by the collection's assertion runtime
+                    check = path_assertion_check(assertion, namespaces)
+                    if check:
+                        reads, check_name, statement = check
+                        parse = ("const xml = xml2Json(pm.response.text());" if reads == 'xml'
+                                 else "const json = pm.response.json();")
                         test_script.extend([
                             "",
-                            "// Check XPath expression",
-                            "pm.test('XPath validation', function () {",
-                            "    const xml = xml2Json(pm.response.text());",
-                            f"    // XPath: {xpath}",
-                            "    // Note: XPath validation requires xml2Json conversion",
+                            f"// Check {'XPath' if reads == 'xml' else 'JSONPath'} expression",
+                            f"pm.test({_js_string(check_name)}, function () {{",
+                            f"    const readyapi = {RUNTIME_ACCESS};",
+                            f"    {parse}",
+                            f"    {statement}",
                             "});"
                         ])
+                elif 'Schema' in assertion_type and operation:
+                    # Schema validation against the interface definition, compiled once per run
+                    test_script.extend([
+                        "",
+                        "// Schema validation",
+                        "pm.test('Schema Compliance', function () {",
+                        f"    const readyapi = {RUNTIME_ACCESS};",
+                        "    const json = pm.response.json();",
+                        f"    {schema_check(*operation)}",
+                        "});"
+                    ])
                 elif 'Schema' in assertion_type:
                     # Schema validation
                     test_script.extend([
@@ -0,0 +1,58 @@
+# Collection variable holding the cached session; a script mentioning it makes
+# the collection install SESSION_CACHE in its pre-request script
+SESSION_VARIABLE = "readyapiSession"
+
+# Seconds a session is reused when the sign-in response does not say
+DEFAULT_SESSION_TTL = 1500
+
+# Collection-level pre-request script run before every request. It signs in
+# only when there is no cached session, when the session was made for another
+# env or card number, or when it has expired, and keeps the session and its
+# expiry in collection variables, which every folder of the run shares.
+SESSION_CACHE = r"""// ReadyAPI session cache: one sign-in per run, refreshed only when missing or expired
+(function () {
+    const key = [pm.variables.get('env'), pm.variables.get('CardNumber')].join('|');
+    const expiresAt = Number(pm.collectionVariables.get('readyapiSessionExpiresAt') || 0);
+    if (pm.collectionVariables.get('readyapiSession') && pm.collectionVariables.get('readyapiSessionKey') === key
+            && Date.now() < expiresAt) {
+        return;
+    }
+    const signInUrl = pm.variables.replaceIn(pm.variables.get('signInUrl') || '');
+    if (!signInUrl || signInUrl.includes('{{')) {
+        return;
+    }
+    pm.sendRequest({
+        url: signInUrl,
+        method: 'POST',
+        header: {'Content-Type': pm.variables.get('signInContentType') || 'application/xml'},
+        body: {mode: 'raw', raw: pm.variables.replaceIn(pm.variables.get('signInBody') || '')}
+    }, function (error, response) {
+        if (error || response.code >= 400) {
+            console.error('Sign-in failed:', error ? error.message : response.code);
+            return;
+        }
+        let ttl = Number(pm.variables.get('sessionTtlSeconds')) || DEFAULT_SESSION_TTL;
+        const cookie = response.headers.all()
+            .filter((header) => header.key.toLowerCase() === 'set-cookie')
+            .map((header) => header.value.split(';')[0])
+            .find((value) => value.startsWith('JSESSIONID='));
+        let session = cookie;
+        if (cookie) {
+            pm.environment.set('JSESSIONID', cookie);
+        } else {
+            let body = {};
+            try { body = response.json(); } catch (e) { /* not JSON */ }
+            session = body.access_token || body.token;
+            if (!session) {
+                console.error('Sign-in returned neither a JSESSIONID cookie nor a token');
+                return;
+            }
+            pm.environment.set('token', session);
+            if (Number(body.expires_in) > 0) ttl = Math.min(ttl, Number(body.expires_in));
+        }
+        pm.collectionVariables.set('readyapiSession', session);
+        pm.collectionVariables.set('readyapiSessionKey', key);
+        pm.collectionVariables.set('readyapiSessionExpiresAt', String(Date.now() + ttl * 1000));
+    });
+})();""".replace("DEFAULT_SESSION_TTL", str(DEFAULT_SESSION_TTL)).split("\n")
+
@@ -0,0 +1,79 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+# ReadyAPI step types that run another test case
+RUN_TEST_CASE_TYPES = {"calltestcase"}
+
+# Type of the converted steps recording that a test case runs another one; they become no item
+RUN_TEST_CASE_MARKER = "run-test-case"
+
+_CON = '{http://eviware.com/soapui/config}'
+
+# Follows a test case reference that the script calls run() on
+_RUN_CALL = r'''(?=\s*\.\s*run\s*\()'''
+
+# testSuites["Suite"].testCases["Case"].run(...), or getTestSuiteByName("Suite").getTestCaseByName("Case").run(...)
+_SUITE_CASE_RUN = re.compile(
+    r'''(?:testSuites\[\s*(["'])(?P<suite>.+?)\1\s*\]|getTestSuiteByName\(\s*(["'])(?P<suite_by_name>.+?)\3\s*\))'''
+    r'''\s*\.\s*(?:testCases\[\s*(["'])(?P<case>.+?)\5\s*\]|getTestCaseByName\(\s*(["'])(?P<case_by_name>.+?)\7\s*\))'''
+    + _RUN_CALL)
+
+# testSuite.testCases["Case"].run(...), a case of the script's own suite
+_CASE_RUN = re.compile(
+    r'''\btestSuite\s*\.\s*(?:testCases\[\s*(["'])(?P<case>.+?)\1\s*\]|getTestCaseByName\(\s*(["'])(?P<case_by_name>.+?)\3\s*\))'''
+    + _RUN_CALL)
+
+# The function library's runTestCaseMultipleTimes("Suite", "Case", count)
+_RUN_MULTIPLE_TIMES = re.compile(r'''runTestCaseMultipleTimes\(\s*(["'])(?P<suite>.+?)\1\s*,\s*(["'])(?P<case>.+?)\3''')
+
+
+def project_test_case_ids(project) -> Dict[str, Tuple[str, str]]:
+    """The (suite name, case name) of every test case of project, by ReadyAPI id"""
+    return {test_case.id: (test_suite.name, test_case.name)
+            for test_suite in project.test_suites for test_case in test_suite.test_cases if test_case.id}
+
+
+def run_test_case_target(test_step) -> Optional[str]:
+    """The id of the test case a Run TestCase step runs"""
+    config = test_step.config
+    if isinstance(config, str):
+        try:
+            config = ET.fromstring(config)
+        except ET.ParseError:
+            return None
+    if config is None:
+        return None
+    target = config.find(f'.//{_CON}targetTestCase')
+    return target.text.strip() if target is not None and target.text else None
+
+
+def groovy_test_case_references(script: str, suite_name: str) -> List[Tuple[str, str]]:
+    """
+    The (suite name, case name) of the test cases a Groovy script runs, in order
+    of first run. Cases it only looks at, e.g. to check their status, do not count
+    """
+    references = {}
+    for match in _SUITE_CASE_RUN.finditer(script):
+        references.setdefault((match.group('suite') or match.group('suite_by_name'),
+                               match.group('case') or match.group('case_by_name')))
+    for match in _CASE_RUN.finditer(script):
+        references.setdefault((suite_name, match.group('case') or match.group('case_by_name')))
+    for match in _RUN_MULTIPLE_TIMES.finditer(script):
+        references.setdefault((match.group('suite'), match.group('case')))
+    # Names built from GString interpolation are only known when the script runs
+    return [reference for reference in references if '$' not in reference[0] + reference[1]]
+
+
+def run_test_case_marker(step_name: str, target: Optional[Tuple[str, str]] = None,
+                         target_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    A converted step recording that the step's test case runs target first,
+    or the test case with ReadyAPI id target_id when its name is not known yet
+    """
+    marker = {"type": RUN_TEST_CASE_MARKER, "name": step_name}
+    if target is not None:
+        marker["target_suite"], marker["target_case"] = target
+    else:
+        marker["target_id"] = target_id
+    return marker
@@ -1,15 +1,16 @@
-from typing import Dict, List, Set
+from typing import Dict, Hashable, List, Set
 from collections import defaultdict
 
 class ExecutionFlowBuilder:
     def __init__(self):
-        self.test_case_graph: Dict[str, List[str]] = defaultdict(list)
+        self.test_case_graph: Dict[Hashable, List[Hashable]] = defaultdict(list)
         self.function_dependencies: Dict[str, List[str]] = defaultdict(list)
         self.step_dependencies: Dict[str, List[str]] = defaultdict(list)
         self.test_case_operations: Dict[str, List[str]] = defaultdict(list)
 
-    def register_test_case_dependency(self, caller: str, callee: str):
-        self.test_case_graph[caller].append(callee)
+    def register_test_case_dependency(self, caller: Hashable, callee: Hashable):
+        if callee not in self.test_case_graph[caller]:
+            self.test_case_graph[caller].append(callee)
 
     def register_function_call(self, caller_func: str, called_func: str):
         self.function_dependencies[caller_func].append(called_func)
@@ -20,7 +21,8 @@ class ExecutionFlowBuilder:
     def register_operation_for_test_case(self, test_case: str, op_type: str):
         self.test_case_operations[test_case].append(op_type)
 
-    def get_execution_order(self) -> List[str]:
+    def get_execution_order(self) -> List[Hashable]:
+        """Every test case of the graph, each after the test cases it runs"""
         visited = set()
         result = []
 
@@ -31,9 +33,14 @@ class ExecutionFlowBuilder:
                     visit(dep)
                 result.append(node)
 
-        for node in self.test_case_graph:
+        for node in list(self.test_case_graph):
             visit(node)
-        return result[::-1]  # reverse for proper order
+        return result
+
+    def get_setup_test_cases(self) -> List[Hashable]:
+        """The test cases other test cases run, in execution order"""
+        callees = {callee for callees in self.test_case_graph.values() for callee in callees}
+        return [node for node in self.get_execution_order() if node in callees]
 
     def get_step_order(self, step_name: str) -> List[str]:
         visited = set()
@@ -82,5 +89,6 @@ if __name__ == "__main__":
     builder.register_operation_for_test_case("TC_Setup", "set_header")
 
     print("Test case execution order:", builder.get_execution_order())
+    print("Setup test cases:", builder.get_setup_test_cases())
     print("Function chain for SignInAvion:", builder.get_function_chain("SignInAvion"))
     print("Setup test cases detected:", builder.detect_setup_test_cases())
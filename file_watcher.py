@@ -0,0 +1,150 @@
+import os
+import time
+import errno
+import ctypes
+import select
+import struct
+import logging
+import ctypes.util
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) event masks: the file was written and closed, or another file was renamed onto it
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Seconds without further events before a change counts as finished, so a save
+# written in several steps triggers one reconversion
+DEFAULT_SETTLE = 0.05
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+class PollingWatcher:
+    """Detect changes to a file by comparing its size, mtime and inode at an interval"""
+
+    def __init__(self, path: str, poll_interval: float = DEFAULT_POLL_INTERVAL, settle: float = DEFAULT_SETTLE):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._signature = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the file changes; returns False if timeout passes first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            signature = self._stat()
+            if signature != self._signature and signature is not None:
+                # Wait for the writer to finish before reporting the change
+                time.sleep(self.settle)
+                while self._stat() != signature:
+                    signature = self._stat()
+                    time.sleep(self.settle)
+                self._signature = signature
+                return True
+            time.sleep(self.poll_interval if deadline is None
+                       else max(0.0, min(self.poll_interval, deadline - time.monotonic())))
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Detect changes to a file with Linux inotify, called through ctypes.
+
+    The file's directory is watched rather than the file itself, so saves
+    that write a temporary file and rename it over the original are seen too.
+    """
+
+    def __init__(self, path: str, settle: float = DEFAULT_SETTLE):
+        self.path = path
+        self.settle = settle
+        self._name = os.fsencode(os.path.basename(path))
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = libc.inotify_init1(IN_CLOEXEC | IN_NONBLOCK)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.fsencode(os.path.dirname(os.path.abspath(path)))
+        if libc.inotify_add_watch(self._fd, directory, IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, "inotify_add_watch failed")
+
+    def _read_matching(self, timeout: Optional[float]) -> bool:
+        """Wait up to timeout for events; True if any of them concern the watched file"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return False
+            raise
+        matched = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b'\0')
+            offset += name_length
+            matched = matched or name == self._name
+        return matched
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the file changes; returns False if timeout passes first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            if self._read_matching(remaining):
+                break
+        # Wait for the writer to finish before reporting the change
+        while self._read_matching(self.settle):
+            pass
+        return True
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_file_watcher(path: str, poll_interval: float = DEFAULT_POLL_INTERVAL, settle: float = DEFAULT_SETTLE):
+    """Watch path with inotify where available, falling back to polling"""
+    try:
+        return InotifyWatcher(path, settle=settle)
+    except (OSError, AttributeError) as e:
+        logger.info(f"inotify unavailable ({str(e)}), polling {path} every {poll_interval}s")
+        return PollingWatcher(path, poll_interval=poll_interval, settle=settle)
+
+
+# Example usage
+if __name__ == '__main__':
+    import sys
+
+    watcher = open_file_watcher(sys.argv[1])
+    print(f"Watching {sys.argv[1]} with {type(watcher).__name__}")
+    try:
+        while True:
+            if watcher.wait():
+                print(f"{time.strftime('%H:%M:%S')} changed")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
@@ -0,0 +1,283 @@
+import os
+import time
+import hashlib
+import logging
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
+
+from readyapi_project_parser import (
+    CASE_TAG,
+    SUITE_TAG,
+    ProjectFilter,
+    parse_project_outline,
+    parse_suite_fragment,
+)
+from readyapi_xml_scanner import (
+    iter_element_spans,
+    open_project_buffer,
+    read_fragment_wrapper,
+    scan_element_spans,
+    start_tag_attributes,
+)
+from postman_collection_builder import (
+    build_collection_info,
+    build_setup_folder,
+    build_suite_folder,
+    collect_global_script_lines,
+    group_converted_steps,
+    setup_test_cases_of,
+)
+from converters.test_case_dependencies import RUN_TEST_CASE_MARKER
+from conversion_pipeline import CollectionWriter, serialize_item
+from file_watcher import DEFAULT_POLL_INTERVAL, open_file_watcher
+from project_archives import is_gzip_path, is_zip_path
+from main_converter_runner import (
+    convert_test_case,
+    extract_api_endpoints,
+    finish_collection,
+    project_definitions,
+    write_environment_file,
+)
+
+logger = logging.getLogger(__name__)
+
+_SUITE_END_TAG = b'</' + SUITE_TAG.encode('ascii') + b'>'
+
+
+def _digest(*parts) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+class _ConvertedCase:
+    """
+    The converted steps of one test case, the global script lines they
+    contribute, the test case's name and ReadyAPI id, and the test cases it runs
+    """
+    __slots__ = ('steps', 'prerequest_script_lines', 'test_script_lines', 'name', 'id', 'markers')
+
+    def __init__(self, steps: List[Dict[str, Any]], name: Optional[str] = None, case_id: str = ''):
+        prerequest_script_lines = {}
+        test_script_lines = {}
+        collect_global_script_lines(steps, prerequest_script_lines, test_script_lines)
+        self.steps = steps
+        self.prerequest_script_lines = tuple(prerequest_script_lines)
+        self.test_script_lines = tuple(test_script_lines)
+        self.name = name
+        self.id = case_id
+        self.markers = tuple(step for step in steps if step.get("type") == RUN_TEST_CASE_MARKER)
+
+
+class IncrementalConverter:
+    """
+    Keep the Postman collection of a project file up to date as the file changes.
+
+    Every update hashes the file's test suites and cases by their bytes and
+    only parses and converts the cases whose hash is new; suites whose bytes
+    are unchanged are not even scanned for cases. Suite folders whose cases
+    are all unchanged are written from their cached JSON. The collection is
+    written to a temporary file that then replaces the output, so readers
+    never see a partial collection.
+    """
+
+    def __init__(self, input_file: str, output_file: str, env_file: Optional[str] = None,
+                 project_filter: Optional[ProjectFilter] = None, optimized_scripts: bool = False):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.env_file = env_file
+        self.project_filter = project_filter if project_filter is not None else ProjectFilter()
+        self.optimized_scripts = optimized_scripts
+        self.project_name: Optional[str] = None
+        self._outline_digest: Optional[bytes] = None
+        self._collection_info: Optional[Dict[str, Any]] = None
+        self._api_endpoints: List[Dict[str, Any]] = []
+        self._definitions: Dict[str, str] = {}
+        # Suite digest -> digests of its cases, case digest -> conversion, suite name -> (case digests, folder JSON)
+        self._suites: Dict[bytes, List[bytes]] = {}
+        self._cases: Dict[bytes, _ConvertedCase] = {}
+        self._folders: Dict[str, Tuple[Tuple[bytes, ...], List[str]]] = {}
+
+    def update(self) -> Dict[str, Any]:
+        """
+        Bring the output up to date with the input file
+
+        Returns:
+            Counts of suites and cases, how many were converted again, and the seconds taken
+        """
+        started = time.perf_counter()
+        buffer = open_project_buffer(self.input_file)
+        try:
+            stats = self._update(buffer)
+        finally:
+            buffer.close()
+        stats["seconds"] = time.perf_counter() - started
+        return stats
+
+    def _update(self, buffer) -> Dict[str, Any]:
+        wrapper = read_fragment_wrapper(buffer)
+        spans = scan_element_spans(buffer, SUITE_TAG)
+
+        # Everything outside the suites: the root start tag, properties and interfaces
+        outline = hashlib.blake2b(digest_size=16)
+        position = 0
+        for span in spans:
+            outline.update(buffer[position:span.start])
+            position = span.end
+        outline.update(buffer[position:])
+        if outline.digest() != self._outline_digest:
+            project = parse_project_outline(buffer, spans)
+            project_name = project.name if project.name else "ReadyAPI_Project"
+            if project_name != self.project_name:
+                self.project_name = project_name
+                self._collection_info = build_collection_info(project_name)
+                if self.env_file:
+                    write_environment_file(project_name, self.env_file)
+            self._api_endpoints = extract_api_endpoints(project)
+            self._definitions = project_definitions(project)
+            self._outline_digest = outline.digest()
+
+        suites = {}
+        cases = {}
+        layout = []
+        changed_suites = 0
+        converted_cases = 0
+        for span in spans:
+            if span.self_closing:
+                continue
+            suite_name = start_tag_attributes(buffer, span).get('name', '')
+            if not self.project_filter.keeps_suite(suite_name):
+                continue
+            suite_digest = _digest(wrapper.prefix, buffer[span.start:span.end])
+            case_digests = self._suites.get(suite_digest)
+            if case_digests is None:
+                changed_suites += 1
+                case_digests = []
+                start_tag = buffer[span.start:span.start_tag_end]
+                for case_span in iter_element_spans(buffer, CASE_TAG, span.start_tag_end, span.end):
+                    if not self.project_filter.keeps_case(start_tag_attributes(buffer, case_span).get('name', '')):
+                        continue
+                    case_bytes = buffer[case_span.start:case_span.end]
+                    case_digest = _digest(wrapper.prefix, start_tag, case_bytes)
+                    if case_digest not in self._cases and case_digest not in cases:
+                        cases[case_digest] = self._convert_case(start_tag + case_bytes + _SUITE_END_TAG, wrapper)
+                        converted_cases += 1
+                    case_digests.append(case_digest)
+            suites[suite_digest] = case_digests
+            layout.append((suite_name, case_digests))
+            for case_digest in case_digests:
+                if case_digest not in cases:
+                    cases[case_digest] = self._cases[case_digest]
+
+        self._suites = suites
+        self._cases = cases
+        self._write_collection(layout)
+        return {
+            "suites": len(layout),
+            "changed_suites": changed_suites,
+            "cases": sum(len(case_digests) for _, case_digests in layout),
+            "converted_cases": converted_cases,
+        }
+
+    def _convert_case(self, fragment: bytes, wrapper) -> _ConvertedCase:
+        test_suite = parse_suite_fragment(fragment, wrapper, self.project_filter)
+        if test_suite is None or not test_suite.test_cases:
+            return _ConvertedCase([])
+        test_case = test_suite.test_cases[0]
+        return _ConvertedCase(convert_test_case(test_suite, test_case, self.optimized_scripts),
+                              test_case.name, test_case.id)
+
+    def _write_collection(self, layout: List[Tuple[str, List[bytes]]]) -> None:
+        # Test cases run by others go to the Setup folder, ahead of the suites
+        test_case_ids = {}
+        markers = []
+        for suite_name, case_digests in layout:
+            for case_digest in case_digests:
+                converted = self._cases[case_digest]
+                if converted.id:
+                    test_case_ids[converted.id] = (suite_name, converted.name)
+                markers.extend(converted.markers)
+        setup_test_cases = setup_test_cases_of(markers, test_case_ids)
+        setup_steps = {setup_test_case: [] for setup_test_case in setup_test_cases}
+
+        # Suites sharing a name share a folder, placed where the first of them with steps appears
+        folder_cases: Dict[str, List[bytes]] = {}
+        prerequest_script_lines = {}
+        test_script_lines = {}
+        for suite_name, case_digests in layout:
+            for case_digest in case_digests:
+                converted = self._cases[case_digest]
+                if (suite_name, converted.name) in setup_steps:
+                    setup_steps[suite_name, converted.name].extend(converted.steps)
+                elif converted.steps:
+                    folder_cases.setdefault(suite_name, []).append(case_digest)
+                for line in converted.prerequest_script_lines:
+                    prerequest_script_lines.setdefault(line)
+                for line in converted.test_script_lines:
+                    test_script_lines.setdefault(line)
+
+        folders = {}
+        for suite_name, case_digests in folder_cases.items():
+            signature = tuple(case_digests)
+            cached = self._folders.get(suite_name)
+            if cached is None or cached[0] != signature:
+                steps = [step for case_digest in case_digests for step in self._cases[case_digest].steps]
+                cached = (signature, [serialize_item(build_suite_folder(name, grouped))
+                                      for name, grouped in group_converted_steps(steps).items()])
+            folders[suite_name] = cached
+        self._folders = folders
+
+        partial_file = self.output_file + '.partial'
+        with open(partial_file, 'w') as f:
+            writer = CollectionWriter(f, self._collection_info)
+            setup_folder = build_setup_folder([(suite_name, case_name, steps)
+                                               for (suite_name, case_name), steps in setup_steps.items()])
+            if setup_folder:
+                writer.write_item(setup_folder)
+            for _, texts in folders.values():
+                for text in texts:
+                    writer.write_serialized_item(text)
+            finish_collection(writer, self._api_endpoints, prerequest_script_lines, test_script_lines,
+                              self._definitions)
+        os.replace(partial_file, self.output_file)
+
+
+def watch_project(input_file: str, output_file: str, env_file: Optional[str] = None,
+                  project_filter: Optional[ProjectFilter] = None,
+                  poll_interval: float = DEFAULT_POLL_INTERVAL, optimized_scripts: bool = False) -> None:
+    """
+    Convert a project, then reconvert it incrementally every time the file
+    changes, until interrupted. A save that cannot be parsed (e.g. a partial
+    write) is reported and the previous output is kept.
+    """
+    if is_gzip_path(input_file) or is_zip_path(input_file) or os.path.isdir(input_file):
+        raise ValueError(f"Watch mode needs an uncompressed single-file project, not {input_file}")
+    converter = IncrementalConverter(input_file, output_file, env_file, project_filter, optimized_scripts)
+    # Start watching before the first conversion so no save is missed
+    watcher = open_file_watcher(input_file, poll_interval=poll_interval)
+    try:
+        stats = converter.update()
+        logger.info(f"Converted {stats['cases']} test cases in {stats['seconds']:.2f}s")
+        print(f"\n👀 Watching {input_file} for changes; {output_file} is updated on every save (Ctrl+C to stop)")
+        while True:
+            watcher.wait()
+            try:
+                stats = converter.update()
+            except (ET.ParseError, ValueError, OSError) as e:
+                logger.error(f"Could not convert {input_file}, keeping the previous output: {str(e)}")
+                continue
+            print(f"🔄 Updated {output_file} in {stats['seconds']:.2f}s: "
+                  f"{stats['converted_cases']} of {stats['cases']} test cases reconverted")
+    finally:
+        watcher.close()
+
+
+# Example usage
+if __name__ == '__main__':
+    import sys
+
+    try:
+        watch_project(sys.argv[1], sys.argv[2])
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,203 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from conversion_pipeline import CollectionWriter
+
+# Logging calls dropped from lean scripts; console.warn and console.error report failures and stay
+_DIAGNOSTIC_CALL = re.compile(r'console\.(?:log|info|debug)\s*\(')
+
+# A statement may only be dropped after code ending in one of these, so it is never the body of an if or loop
+_STATEMENT_ENDS = ('{', '}', ';')
+
+# Characters after which a slash starts a regular expression literal rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def debug_path(output_file: str) -> str:
+    """The path of the annotated debug collection written next to a lean output_file"""
+    stem, dot, extension = output_file.rpartition('.')
+    return f"{stem}.debug.{extension}" if dot and '/' not in extension else output_file + '.debug'
+
+
+def _scan(line: str, in_template: bool, in_block: bool) -> Tuple[bool, bool, bool, str, Optional[int]]:
+    """
+    Scan one line of JavaScript from the given state: inside a template
+    literal, inside a block comment, or in code.
+
+    Returns:
+        The state at the end of the line, whether the line has anything but
+        comments and whitespace, its last character of code outside literals,
+        and the index of the parenthesis closing the first one opened in code
+        (None if it is not on this line)
+    """
+    depth = 0
+    close = None
+    previous = ''
+    code = False
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if in_block:
+            if line.startswith('*/', i):
+                in_block = False
+                i += 2
+                continue
+        elif in_template:
+            if char == '\\':
+                i += 1
+            elif char == '`':
+                in_template = False
+        elif line.startswith('//', i):
+            break
+        elif line.startswith('/*', i):
+            in_block = True
+            i += 2
+            continue
+        elif char in '\'"':
+            i += 1
+            while i < len(line) and line[i] != char:
+                i += 2 if line[i] == '\\' else 1
+        elif char == '`':
+            in_template = True
+        elif char == '/' and (not previous or previous in _REGEX_PRECEDERS):
+            in_class = False
+            i += 1
+            while i < len(line) and (line[i] != '/' or in_class):
+                if line[i] == '\\':
+                    i += 1
+                elif line[i] in '[]':
+                    in_class = line[i] == '['
+                i += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0 and close is None:
+                close = i
+        if not in_block and not char.isspace():
+            code = True
+            if not in_template:
+                previous = char
+        i += 1
+    return in_template, in_block, code, previous, close
+
+
+def lean_script_lines(lines: List[str]) -> List[str]:
+    """
+    The lines of a script without blank lines, whole-line comments and
+    console.log, console.info and console.debug statements. Lines inside
+    template literals are kept as they are.
+    """
+    lean = []
+    in_template = in_block = False
+    statement_end = True
+    for line in lines:
+        if in_template:
+            lean.append(line)
+            in_template, in_block, _, last, _ = _scan(line, in_template, in_block)
+            statement_end = last in _STATEMENT_ENDS if last else statement_end
+            continue
+        if in_block:
+            # Keep only the code after the end of a block comment
+            in_template, in_block, code, last, _ = _scan(line, in_template, in_block)
+            if code:
+                lean.append(line.split('*/', 1)[1].strip())
+                statement_end = last in _STATEMENT_ENDS if last else statement_end
+            continue
+
+        in_template, in_block, code, last, close = _scan(line, in_template, in_block)
+        if not code:
+            continue
+        if (statement_end and _DIAGNOSTIC_CALL.match(line.strip()) and close is not None
+                and not in_template and not in_block and _is_statement_end(line[close + 1:])):
+            continue
+        lean.append(line)
+        statement_end = last in _STATEMENT_ENDS if last else statement_end
+    return lean
+
+
+def _is_statement_end(rest: str) -> bool:
+    rest = rest.strip()
+    if rest.startswith(';'):
+        rest = rest[1:].strip()
+    return not rest or rest.startswith('//')
+
+
+class ScriptSizes:
+    """Script lines and bytes before and after leaning, summed over a collection"""
+
+    def __init__(self):
+        self.lines_before = self.lines_after = 0
+        self.bytes_before = self.bytes_after = 0
+
+    def add(self, before: List[str], after: List[str]) -> None:
+        self.lines_before += len(before)
+        self.lines_after += len(after)
+        self.bytes_before += sum(len(line.encode('utf-8')) + 1 for line in before)
+        self.bytes_after += sum(len(line.encode('utf-8')) + 1 for line in after)
+
+    def summary(self) -> str:
+        saved = 1 - self.bytes_after / self.bytes_before if self.bytes_before else 0
+        return (f"Lean scripts: {self.lines_before} -> {self.lines_after} lines, "
+                f"{self.bytes_before / 1024:.1f} -> {self.bytes_after / 1024:.1f} KB ({saved:.0%} smaller)")
+
+
+def lean_events(events: List[Dict[str, Any]], sizes: ScriptSizes) -> List[Dict[str, Any]]:
+    """Copies of events with lean scripts; events left with no script are dropped"""
+    lean = []
+    for event in events:
+        exec_lines = event.get("script", {}).get("exec")
+        if not isinstance(exec_lines, list):
+            lean.append(event)
+            continue
+        lines = lean_script_lines(exec_lines)
+        sizes.add(exec_lines, lines)
+        if lines:
+            lean.append({**event, "script": {**event["script"], "exec": lines}})
+    return lean
+
+
+def lean_item(item: Dict[str, Any], sizes: ScriptSizes) -> Dict[str, Any]:
+    """A copy of a collection, folder or request item with lean scripts throughout"""
+    lean = dict(item)
+    if "event" in item:
+        lean["event"] = lean_events(item["event"], sizes)
+        if not lean["event"]:
+            del lean["event"]
+    if "item" in item:
+        lean["item"] = [lean_item(child, sizes) for child in item["item"]]
+    return lean
+
+
+class LeanCollectionWriter:
+    """
+    A CollectionWriter that writes the collection twice, item by item: as
+    annotated to the debug artifact, and with lean scripts to the output
+    """
+
+    def __init__(self, f: TextIO, debug_f: TextIO, info: Dict[str, Any]):
+        self.sizes = ScriptSizes()
+        self._lean = CollectionWriter(f, info)
+        self._debug = CollectionWriter(debug_f, info)
+
+    def write_item(self, item: Dict[str, Any]) -> None:
+        self._debug.write_item(item)
+        self._lean.write_item(lean_item(item, self.sizes))
+
+    def close(self, fields: Dict[str, Any]) -> None:
+        self._debug.close(fields)
+        self._lean.close(lean_item(fields, self.sizes))
+
+
+def write_lean_collection(output_file: str, collection: Dict[str, Any]) -> ScriptSizes:
+    """
+    Write collection with lean scripts to output_file, and as annotated to
+    its debug_path
+    """
+    sizes = ScriptSizes()
+    with open(debug_path(output_file), 'w') as f:
+        json.dump(collection, f, indent=2)
+    with open(output_file, 'w') as f:
+        json.dump(lean_item(collection, sizes), f, indent=2)
+    return sizes
@@ -0,0 +1,278 @@
+"""
+Run the load plan that main_converter_runner writes with --load-plan.
+
+Every load test replays its test case's requests in order, as many times
+at once as its strategy asks for, over pooled keep-alive connections, and
+reports latency percentiles per request and whether its SLA assertions
+passed:
+
+    python load_runner.py load_plan.json --env environment.json --target http://localhost:8080
+"""
+import math
+import json
+import time
+import random
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from async_http_client import PooledHTTPClient
+from postman_request_resolver import load_environment, prepare_request, unresolved_variables
+
+logger = logging.getLogger(__name__)
+
+# Seconds an idle worker waits before checking whether its strategy needs it again
+IDLE_POLL_INTERVAL = 0.05
+
+# Name under which whole test case runs are reported and asserted on
+TEST_CASE_STEP = "TestCase"
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class StepStats:
+    """Latencies in seconds and the error count of one request, or of whole test case runs"""
+    __slots__ = ('latencies', 'errors')
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    def add(self, seconds: float, error: bool) -> None:
+        self.latencies.append(seconds)
+        self.errors += error
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        summary = {"count": count, "errors": self.errors, "tps": count / elapsed if elapsed else 0.0}
+        if count:
+            summary.update({"avg_ms": sum(latencies) / count * 1000, "min_ms": latencies[0] * 1000,
+                            "max_ms": latencies[-1] * 1000})
+            # Nearest-rank percentiles
+            for p in PERCENTILES:
+                summary[f"p{p}_ms"] = latencies[max(0, math.ceil(p / 100 * count) - 1)] * 1000
+        return summary
+
+
+def _peak_threads(strategy: Dict[str, Any], threads: int) -> int:
+    if strategy["type"] == "thread":
+        return max(strategy["start_threads"], strategy["end_threads"], 1)
+    if strategy["type"] == "variance":
+        return math.ceil(threads * (1 + strategy["variance"]))
+    return threads
+
+
+def _target_threads(strategy: Dict[str, Any], threads: int, elapsed: float, limit: Dict[str, Any]) -> int:
+    """How many workers the strategy wants running elapsed seconds into the test"""
+    if strategy["type"] == "burst":
+        period = (strategy["burst_delay_ms"] + strategy["burst_duration_ms"]) / 1000
+        return threads if period and elapsed % period >= strategy["burst_delay_ms"] / 1000 else 0
+    if strategy["type"] == "thread":
+        progress = min(1.0, elapsed / limit["value"]) if limit["type"] == "seconds" and limit["value"] else 1.0
+        start, end = strategy["start_threads"], strategy["end_threads"]
+        return round(start + (end - start) * progress)
+    if strategy["type"] == "variance":
+        interval = strategy["interval_ms"] / 1000
+        swing = math.sin(2 * math.pi * elapsed / interval) if interval else 0.0
+        return round(threads * (1 + strategy["variance"] * swing))
+    return threads
+
+
+async def run_load_test(entry: Dict[str, Any], variables: Dict[str, str], target: Optional[str] = None,
+                        duration: Optional[float] = None, threads: Optional[int] = None,
+                        rate: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run one load test of a plan, sending its requests to target's host if
+    given, and return its report. duration, threads and rate override the
+    plan's limit, thread count and strategy; a rate runs the test case that
+    many times per second, with at most threads runs in flight.
+    """
+    requests = [(item["name"], prepare_request(item["request"], variables, target)) for item in entry["requests"]]
+    missing = sorted({name for _, prepared in requests for name in unresolved_variables(prepared.url)})
+    if missing:
+        raise ValueError(f"Load test {entry['name']}: no value for {', '.join(missing)}; pass --env or --var")
+
+    threads = threads or entry["threads"]
+    strategy = {"type": "fixed_rate", "rate": rate} if rate is not None else entry["strategy"]
+    if strategy["type"] == "fixed_rate" and not strategy["rate"] > 0:
+        raise ValueError(f"Load test {entry['name']}: the fixed rate must be positive, not {strategy['rate']}")
+    limit = {"type": "seconds", "value": duration} if duration else entry["limit"]
+    max_runs = limit["value"] * (threads if limit["type"] == "runs_per_thread" else 1)
+    stats = {name: StepStats() for name, _ in requests}
+    case_stats = StepStats()
+    runs = 0
+
+    async with PooledHTTPClient(max_connections_per_host=_peak_threads(strategy, threads)) as client:
+        async def run_case() -> None:
+            case_started = time.perf_counter()
+            case_error = False
+            for name, prepared in requests:
+                step_started = time.perf_counter()
+                try:
+                    response = await client.request(prepared.method, prepared.url, prepared.headers, prepared.body)
+                    error = response.status >= 400
+                except (OSError, asyncio.TimeoutError, ValueError) as e:
+                    logger.debug(f"{name} failed: {e}")
+                    error = True
+                stats[name].add(time.perf_counter() - step_started, error)
+                case_error = case_error or error
+            case_stats.add(time.perf_counter() - case_started, case_error)
+
+        def may_start(elapsed: float) -> bool:
+            return elapsed < limit["value"] if limit["type"] == "seconds" else runs < max_runs
+
+        await asyncio.sleep(entry.get("start_delay_ms", 0) / 1000)
+        started = time.perf_counter()
+
+        if strategy["type"] == "fixed_rate":
+            in_flight = asyncio.Semaphore(threads)
+            tasks = set()
+
+            async def run_and_release() -> None:
+                try:
+                    await run_case()
+                finally:
+                    in_flight.release()
+
+            next_start = started
+            while may_start(time.perf_counter() - started):
+                await asyncio.sleep(max(0.0, next_start - time.perf_counter()))
+                await in_flight.acquire()
+                runs += 1
+                task = asyncio.ensure_future(run_and_release())
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                next_start += 1 / strategy["rate"]
+            await asyncio.gather(*tasks)
+        else:
+            async def worker(index: int) -> None:
+                nonlocal runs
+                while True:
+                    elapsed = time.perf_counter() - started
+                    if not may_start(elapsed):
+                        return
+                    if index >= _target_threads(strategy, threads, elapsed, limit):
+                        await asyncio.sleep(IDLE_POLL_INTERVAL)
+                        continue
+                    runs += 1
+                    await run_case()
+                    if strategy["type"] == "simple":
+                        await asyncio.sleep(strategy["delay_ms"] / 1000
+                                            * (1 - strategy["random_factor"] * random.random()))
+
+            await asyncio.gather(*(worker(index) for index in range(_peak_threads(strategy, threads))))
+        elapsed = time.perf_counter() - started
+        connections = client.connections_opened
+
+    report = {
+        "name": entry["name"],
+        "test_suite": entry.get("test_suite"),
+        "test_case": entry.get("test_case"),
+        "seconds": elapsed,
+        "runs": runs,
+        "connections": connections,
+        "steps": {name: step.summary(elapsed) for name, step in stats.items()},
+        TEST_CASE_STEP: case_stats.summary(elapsed),
+    }
+    report["assertions"] = check_assertions(entry["assertions"], report)
+    report["passed"] = all(result["passed"] is not False for result in report["assertions"])
+    return report
+
+
+def _check(assertion: Dict[str, Any], summary: Dict[str, Any]) -> Optional[bool]:
+    """Whether one step's summary meets assertion, or None before it has min_requests requests"""
+    if summary["count"] < assertion.get("min_requests", 0) or not summary["count"]:
+        return None
+    if assertion["type"] == "step_average":
+        return summary["avg_ms"] <= assertion["max_ms"]
+    if assertion["type"] == "step_maximum":
+        return summary["max_ms"] <= assertion["max_ms"]
+    if assertion["type"] == "step_tps":
+        return summary["tps"] >= assertion["min_tps"]
+    if assertion["type"] == "max_errors":
+        return ((assertion["max_errors"] < 0 or summary["errors"] <= assertion["max_errors"])
+                and (assertion["max_error_ratio"] < 0
+                     or summary["errors"] / summary["count"] <= assertion["max_error_ratio"]))
+    return summary["errors"] == 0
+
+
+def check_assertions(assertions: List[Dict[str, Any]], report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Check the SLA assertions of a load test against its report. ANY checks
+    every request, TestCase whole test case runs; passed is None when a step
+    has fewer requests than the assertion needs
+    """
+    results = []
+    for assertion in assertions:
+        step = assertion["step"]
+        if step == "ANY":
+            summaries = list(report["steps"].values())
+        elif step == TEST_CASE_STEP:
+            summaries = [report[TEST_CASE_STEP]]
+        else:
+            summaries = [report["steps"][step]] if step in report["steps"] else []
+        outcomes = [_check(assertion, summary) for summary in summaries]
+        passed = False if not summaries or False in outcomes else (None if None in outcomes else True)
+        results.append({"name": assertion["name"], "type": assertion["type"], "step": step, "passed": passed})
+    return results
+
+
+async def run_load_plan(plan: Dict[str, Any], variables: Dict[str, str], names: Optional[List[str]] = None,
+                        **overrides) -> List[Dict[str, Any]]:
+    """Run the load tests of a plan one after another, or only those in names"""
+    reports = []
+    for entry in plan["load_tests"]:
+        if names and entry["name"] not in names:
+            continue
+        logger.info(f"Running load test {entry['name']} of {entry.get('test_case')}")
+        reports.append(await run_load_test(entry, variables, **overrides))
+    return reports
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{report['name']} ({report['test_case']}): {report['runs']} runs in {report['seconds']:.1f}s "
+             f"over {report['connections']} connections",
+             f"  {'request':30s} {'count':>7s} {'errors':>6s} {'tps':>8s} {'avg':>8s} "
+             + " ".join(f"{f'p{p}':>8s}" for p in PERCENTILES)]
+    for name, summary in list(report["steps"].items()) + [(TEST_CASE_STEP, report[TEST_CASE_STEP])]:
+        if not summary["count"]:
+            continue
+        lines.append(f"  {name[:30]:30s} {summary['count']:7d} {summary['errors']:6d} {summary['tps']:8.1f} "
+                     f"{summary['avg_ms']:7.1f}ms " + " ".join(f"{summary[f'p{p}_ms']:6.1f}ms" for p in PERCENTILES))
+    for result in report["assertions"]:
+        status = {True: "passed", False: "FAILED", None: "not enough requests"}[result["passed"]]
+        lines.append(f"  SLA {result['name']} on {result['step']}: {status}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a load plan converted from ReadyAPI LoadTests")
+    parser.add_argument("plan", help="Load plan JSON written by main_converter_runner --load-plan")
+    parser.add_argument("--env", help="Postman environment JSON file with the variables the requests use")
+    parser.add_argument("--var", action="append", default=[], metavar="KEY=VALUE",
+                        help="Set a variable, overriding the environment (repeatable)")
+    parser.add_argument("--target", metavar="URL",
+                        help="Send every request to this scheme and host, e.g. a local stand-in server")
+    parser.add_argument("--test", action="append", metavar="NAME", help="Only run load tests of this name")
+    parser.add_argument("--duration", type=float, metavar="SECONDS", help="Run each load test this long")
+    parser.add_argument("--threads", type=int, help="Concurrent test case runs, instead of the plan's")
+    parser.add_argument("--rate", type=float, help="Start this many test case runs per second")
+    parser.add_argument("--json", metavar="FILE", help="Also write the reports as JSON to FILE")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    with open(args.plan) as f:
+        load_plan = json.load(f)
+    reports = asyncio.run(run_load_plan(load_plan, load_environment(args.env, args.var), args.test,
+                                        target=args.target, duration=args.duration, threads=args.threads,
+                                        rate=args.rate))
+    for load_report in reports:
+        print(format_report(load_report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+    sys.exit(0 if all(load_report["passed"] for load_report in reports) else 1)
@@ -1,29 +1,70 @@
 import logging
 import json
 import argparse
+from contextlib import contextmanager, nullcontext
+from functools import partial
 import os
 import uuid
 import re
-from typing import Dict, List, Any, Optional
-from readyapi_project_parser import parse_project_file
-from execution_flow_builder import ExecutionFlowBuilder
-from step_conversion_logger import StepConversionLogger
-from test_step_dispatcher import dispatch_step_conversion
-from postman_collection_builder import build_postman_collection
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from readyapi_project_parser import (
+    ProjectFilter,
+    is_composite_project,
+    iter_project_file,
+    parse_project_file,
+    parse_project_stream,
+)
+from project_archives import is_zip_path, iter_archive_projects, unique_stem
+from project_inventory import count_steps, scan_test_case_runs, take_archive_inventories, take_inventory
+from progress_reporter import ProgressReporter
+from project_snapshot_cache import parse_project_file_cached
+from step_conversion_logger import SKIPPED_TYPES
+from test_step_dispatcher import dispatch_step_conversion, groovy_step_script_lines
+from postman_collection_builder import (
+    build_api_endpoints_folder,
+    build_collection_info,
+    build_collection_variables,
+    build_case_folder,
+    build_postman_collection,
+    build_setup_folder,
+    build_suite_folder,
+    collect_global_script_lines,
+    collection_base_url,
+    global_script_events,
+    group_converted_steps,
+    schema_variables,
+    setup_test_cases_of,
+)
+from converted_step_store import ConvertedStepStore, parse_size
+from conversion_ir import IRWriter, read_ir
+from conversion_pipeline import CollectionWriter, convert_suites, threaded_stage
+from lean_scripts import LeanCollectionWriter, ScriptSizes, debug_path, write_lean_collection
+from converters.assertion_runtime import schema_variable
 from converters.rest_request_converter import convert_rest_request
+from converters.property_transfer_converter import (
+    PROPERTY_TRANSFER_TYPES,
+    RESPONSE_PROPERTIES,
+    compile_property_transfers,
+    parse_property_transfers,
+)
+from converters.session_cache import DEFAULT_SESSION_TTL
+from converters.load_test_converter import load_plan_entries
+from converters.mock_service_converter import convert_mock_service
+from converters.groovy_script_converter import groovy_script_source
+from converters.test_case_dependencies import (
+    RUN_TEST_CASE_MARKER,
+    RUN_TEST_CASE_TYPES,
+    groovy_test_case_references,
+    project_test_case_ids,
+    run_test_case_marker,
+    run_test_case_target,
+)
 from rest_request_converter import get_endpoint_full_path
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Ensure that the postman_environment_builder.py file is created and contains the required function `build_postman_environment`
-try:
-    from postman_environment_builder import build_postman_environment
-except ImportError:
-    def build_postman_environment(env_name, properties, output_file):
-        print("[WARNING] postman_environment_builder module not found. Skipping environment export.")
-
 
 def extract_api_endpoints(project) -> List[Dict[str, Any]]:
     """
@@ -125,6 +166,15 @@ def extract_api_endpoints(project) -> List[Dict[str, Any]]:
     return endpoints
 
 
+def project_definitions(project) -> Dict[str, str]:
+    """
+    The OpenAPI and Swagger documents of the project's interfaces, by the
+    collection variable Schema Compliance checks read them from
+    """
+    return {schema_variable(interface.service): interface.definition
+            for interface in project.interfaces if interface.definition}
+
+
 def sanitize_url(url):
     """
     Parse a URL and create a structure that preserves the original URL
@@ -250,247 +300,963 @@ def sanitize_properties(properties: Dict[str, Any]) -> List[Dict[str, Any]]:
     return sanitized
 
 
-def run_readyapi_to_postman(input_file: str, output_file: str, env_file: str = None) -> None:
+def add_script_lines(step: Dict[str, Any], listen: str, lines: List[str]) -> None:
+    """Append lines to a converted step's pre-request or test script, adding the script if it has none"""
+    if not lines:
+        return
+    events = step.setdefault("event", [])
+    for event in events:
+        if event.get("listen") == listen:
+            event["script"]["exec"].extend([""] + lines)
+            return
+    events.append({"listen": listen, "script": {"type": "text/javascript", "exec": list(lines)}})
+
+
+def attach_property_transfers(converted_steps: List[Dict[str, Any]], test_step,
+                              pending_transfers: List[Dict[str, Any]]) -> None:
+    """
+    Compile a property transfer step into the test script of each request it
+    reads a response from, so no request item is needed for it. Transfers
+    between properties run after the latest request, or are added to
+    pending_transfers to run before the next one.
+    """
+    requests = {step["name"]: step for step in converted_steps if "request" in step}
+    latest_request = next((step for step in reversed(converted_steps) if "request" in step), None)
+    by_request = {}
+    for transfer in parse_property_transfers(test_step):
+        if transfer["from_property"].lower() in RESPONSE_PROPERTIES:
+            source = requests.get(transfer["from_step"])
+            if source is None:
+                logger.warning(f"Property transfer in {test_step.name} reads the response of "
+                               f"{transfer['from_step']}, which was not converted")
+                continue
+        elif latest_request is None:
+            pending_transfers.append(transfer)
+            continue
+        else:
+            source = latest_request
+        by_request.setdefault(id(source), (source, []))[1].append(transfer)
+
+    for source, transfers in by_request.values():
+        add_script_lines(source, "test", compile_property_transfers(transfers))
+
+
+def convert_test_case(test_suite, test_case, optimized_scripts: bool = False,
+                      test_case_ids: Optional[Dict[str, Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
+    """
+    Convert the steps of one test case, tagged with their test suite and case names.
+    With optimized_scripts, test scripts read and parse each response only once,
+    and Groovy assertions are compiled without eval. Test cases run by Run TestCase steps and Groovy scripts are recorded as
+    run-test-case marker steps; without test_case_ids, Run TestCase targets
+    are recorded by id, to be looked up when the collection is built.
+    """
+    converted_steps = []
+    # Keep the original test case name - these are important identifiers in the test structure
+    logger.info(f"Processing test case: {test_case.name}")
+
+    # Add test case properties as an input data step
+    if hasattr(test_case, 'properties') and test_case.properties:
+        # Sanitize the properties to avoid exposing sensitive data
+        property_variables = sanitize_properties(test_case.properties)
+
+        if property_variables:
+            properties_step = {
+                "type": "properties",
+                "name": "InputData",
+                "test_suite": test_suite.name,
+                "test_case": test_case.name,
+                "variables": property_variables,
+                "note": f"Variables defined for test case: {test_case.name}"
+            }
+            converted_steps.append(properties_step)
+
+    pending_transfers = []
+    pending_scripts = []
+    pending_test_scripts = []
+    for test_step in test_case.test_steps:
+        # Skip steps that are clearly not supported
+        if hasattr(test_step, 'name'):
+            if test_step.name.lower() in ["cardnumber", "env"]:
+                logger.warning(f"Skipping unsupported step type: {test_step.name}")
+                continue
+
+        # Determine step type based on available attributes
+        step_type = getattr(test_step, 'step_type', '').lower()
+
+        # Skip types Postman cannot run before their config is ever loaded
+        if step_type in SKIPPED_TYPES:
+            logger.info(f"Skipping {step_type} step: {test_step.name}")
+            continue
+
+        # Run TestCase steps only record the test case to run first
+        if step_type in RUN_TEST_CASE_TYPES:
+            target_id = run_test_case_target(test_step)
+            if test_case_ids is None:
+                marker = run_test_case_marker(test_step.name, target_id=target_id)
+            elif target_id in test_case_ids:
+                marker = run_test_case_marker(test_step.name, test_case_ids[target_id])
+            else:
+                logger.warning(f"Run TestCase step {test_step.name} runs a test case that is not converted")
+                continue
+            converted_steps.append({**marker, "test_suite": test_suite.name, "test_case": test_case.name})
+            continue
+
+        # Property transfers become script code of the requests around them
+        if step_type in PROPERTY_TRANSFER_TYPES:
+            logger.info(f"Compiling property transfer step: {test_step.name}")
+            attach_property_transfers(converted_steps, test_step, pending_transfers)
+            continue
+
+        config = getattr(test_step, 'config', None)
+
+        # Convert REST requests
+        is_rest_request = (
+            (step_type and 'rest' in step_type) or
+            (isinstance(config, str) and 'restRequest' in config)
+        )
+
+        if is_rest_request:
+            logger.info(f"Converting REST request step: {test_step.name}")
+            converted_step = convert_rest_request(test_step, optimized_scripts)
+            if converted_step:
+                # Sanitize URLs while preserving the original URL
+                if "request" in converted_step:
+                    if "url" in converted_step["request"]:
+                        url = converted_step["request"]["url"]
+                        if isinstance(url, dict) and "raw" in url:
+                            # Preserve the original URL but structure it with components
+                            raw_url = url.get("raw")
+                            url_obj = sanitize_url(raw_url)
+                            converted_step["request"]["url"] = url_obj
+                        elif isinstance(url, str):
+                            # Convert string URLs to structured format
+                            converted_step["request"]["url"] = sanitize_url(url)
+
+                converted_step["test_suite"] = test_suite.name
+                converted_step["test_case"] = test_case.name
+                if pending_scripts:
+                    add_script_lines(converted_step, "prerequest", pending_scripts)
+                    pending_scripts = []
+                if pending_test_scripts:
+                    add_script_lines(converted_step, "test", pending_test_scripts)
+                    pending_test_scripts = []
+                if pending_transfers:
+                    add_script_lines(converted_step, "prerequest", compile_property_transfers(pending_transfers))
+                    pending_transfers = []
+                converted_steps.append(converted_step)
+
+        # Groovy scripts run before the next request, with no request item of their own
+        elif step_type == 'groovy':
+            logger.info(f"Converting Groovy script step: {test_step.name}")
+            prerequest_lines, test_lines = groovy_step_script_lines(test_step, optimized_scripts)
+            pending_scripts.extend(prerequest_lines)
+            pending_test_scripts.extend(test_lines)
+
+            # Test cases a Groovy script runs go first
+            for target in groovy_test_case_references(groovy_script_source(test_step) or '', test_suite.name):
+                if target != (test_suite.name, test_case.name):
+                    converted_steps.append({**run_test_case_marker(test_step.name, target),
+                                            "test_suite": test_suite.name, "test_case": test_case.name})
+
+        # Convert properties steps
+        elif hasattr(test_step, 'properties') and test_step.properties:
+            logger.info(f"Converting properties step: {test_step.name}")
+            # Sanitize the properties to avoid exposing sensitive data
+            variables = sanitize_properties(test_step.properties)
+
+            converted_step = {
+                "type": "properties",
+                "name": test_step.name,
+                "test_suite": test_suite.name,
+                "test_case": test_case.name,
+                "variables": variables,
+                "note": f"Variables defined in step: {test_step.name}"
+            }
+            converted_steps.append(converted_step)
+
+        # The parser folds Properties step values into the test case's InputData step
+        elif step_type == 'properties':
+            logger.info(f"Properties step {test_step.name} is covered by the test case's InputData step")
+
+        # Try dispatcher for other types
+        else:
+            logger.info(f"Attempting to convert step using dispatcher: {test_step.name}")
+            context = {
+                "test_suite": test_suite.name,
+                "test_case_name": test_case.name,
+            }
+
+            try:
+                # Use dispatcher if available
+                result = dispatch_step_conversion(test_step, context)
+                if result:
+                    if isinstance(result, list):
+                        for r in result:
+                            if isinstance(r, dict):
+                                r["test_suite"] = test_suite.name
+                                r["test_case"] = test_case.name
+                                converted_steps.append(r)
+                    elif isinstance(result, dict):
+                        result["test_suite"] = test_suite.name
+                        result["test_case"] = test_case.name
+                        converted_steps.append(result)
+            except Exception as e:
+                logger.warning(f"Dispatcher failed for step {test_step.name}: {str(e)}")
+
+    if pending_scripts or pending_test_scripts:
+        # Scripts after the last request run once its response is in
+        latest_request = next((step for step in reversed(converted_steps) if "request" in step), None)
+        if latest_request is not None:
+            add_script_lines(latest_request, "test", pending_scripts + pending_test_scripts)
+        else:
+            logger.warning(f"Test case {test_case.name} has Groovy scripts but no request to run them with")
+    if pending_transfers:
+        logger.warning(f"Test case {test_case.name} has property transfers but no request to run them with")
+    return converted_steps
+
+
+def build_environment(project_name: str) -> Dict[str, Any]:
+    """
+    Build the generic Postman environment for a converted project
+    """
+    # Create generic environment variables
+    env_vars = [
+        {
+            "key": "baseUrl",
+            "value": "{{baseUrl}}",
+            "type": "default",
+            "enabled": True
+        },
+        {
+            "key": "path",
+            "value": "/api/v1",
+            "type": "default",
+            "enabled": True
+        },
+        {
+            "key": "username",
+            "value": "",
+            "type": "default",
+            "enabled": True
+        },
+        {
+            "key": "password",
+            "value": "",
+            "type": "secret",
+            "enabled": True
+        },
+        {
+            "key": "apiKey",
+            "value": "",
+            "type": "secret",
+            "enabled": True
+        },
+        {
+            "key": "token",
+            "value": "",
+            "type": "secret",
+            "enabled": True
+        },
+        {
+            "key": "sessionId",
+            "value": "",
+            "type": "default",
+            "enabled": True
+        },
+        {
+            "key": "signInUrl",
+            "value": "",
+            "type": "default",
+            "enabled": True
+        },
+        {
+            "key": "signInBody",
+            "value": "",
+            "type": "default",
+            "enabled": True
+        },
+        {
+            "key": "sessionTtlSeconds",
+            "value": str(DEFAULT_SESSION_TTL),
+            "type": "default",
+            "enabled": True
+        },
+        {
+            "key": "cardNumber",
+            "value": "",
+            "type": "secret",
+            "enabled": True
+        },
+        {
+            "key": "authToken",
+            "value": "",
+            "type": "secret",
+            "enabled": True
+        },
+        {
+            "key": "id",
+            "value": "",
+            "type": "default",
+            "enabled": True
+        }
+    ]
+
+    # Generate environment with a unique ID
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"{project_name}_Environment",
+        "values": env_vars
+    }
+
+
+def stream_readyapi_to_postman(input_file: str, output_file: str,
+                               project_filter: Optional[ProjectFilter] = None,
+                               convert_case: Callable = convert_test_case,
+                               lean_scripts: bool = False, memory_budget: int = 0):
+    """
+    Convert a ReadyAPI project as a pipeline of streaming stages.
+
+    Parsing and conversion run concurrently, connected by bounded queues.
+    The test cases run by others are found first with a scan of the project's
+    bytes. Their steps, and the suites converted before the last of them,
+    wait in a store that spills to disk past memory_budget. Once the Setup
+    folder is written, each suite folder is written as soon as it is
+    converted, so memory use is bounded by the largest suite, not the project.
+
+    Returns:
+        The project, without its test suites, or None if it could not be read
+    """
+    # A composite project is not scanned: its suites wait until every one is converted
+    runs = scan_test_case_runs(input_file, project_filter)
+    setup_test_cases = None if runs is None else setup_test_cases_of(runs[0])
+    waiting = None if runs is None else set(setup_test_cases) & set(runs[1])
+
+    # Run TestCase targets are looked up by id once every suite has been parsed
+    test_case_ids = {}
+    # Test cases with no converted steps, which no suite's steps will show
+    empty_cases = set()
+
+    def convert_noting_ids(test_suite, test_case):
+        if test_case.id:
+            test_case_ids[test_case.id] = (test_suite.name, test_case.name)
+        converted_steps = convert_case(test_suite, test_case)
+        if not converted_steps:
+            empty_cases.add((test_suite.name, test_case.name))
+        return converted_steps
+
+    items = threaded_stage(iter_project_file(input_file, project_filter))
+    items = threaded_stage(convert_suites(items, convert_noting_ids))
+
+    project = next(items, None)
+    if project is None:
+        return None
+    project_name = project.name if project.name else "ReadyAPI_Project"
+
+    prerequest_script_lines = {}
+    test_script_lines = {}
+    markers = []
+    hoisted = set(setup_test_cases or ())
+    with ConvertedStepStore(memory_budget) as store, \
+            open_collection_writer(output_file, project_name, lean_scripts) as writer:
+        if waiting is not None and not waiting:
+            write_suite_folders_from_store(writer, store, setup_test_cases)
+        for converted_steps in items:
+            collect_global_script_lines(converted_steps, prerequest_script_lines, test_script_lines)
+            markers.extend(step for step in converted_steps if step.get("type") == RUN_TEST_CASE_MARKER)
+            if waiting is not None and not waiting:
+                for suite_name, cases in group_converted_steps(converted_steps).items():
+                    cases = {case_name: steps for case_name, steps in cases.items()
+                             if (suite_name, case_name) not in hoisted}
+                    if cases:
+                        writer.write_item(build_suite_folder(suite_name, cases))
+                continue
+
+            store.extend(converted_steps)
+            if waiting is not None:
+                waiting.difference_update((step.get("test_suite", "Default Suite"),
+                                           step.get("test_case", "Default Case")) for step in converted_steps)
+                waiting -= empty_cases
+                if not waiting:
+                    write_suite_folders_from_store(writer, store, setup_test_cases)
+
+        found_test_cases = setup_test_cases_of(markers, test_case_ids)
+        if waiting is None or waiting:
+            write_suite_folders_from_store(writer, store, found_test_cases)
+        elif found_test_cases != setup_test_cases:
+            logger.warning(f"The Setup folder has {setup_test_cases} from the project scan, but the converted "
+                           f"steps run {found_test_cases}")
+
+        # Interfaces are complete once parsing has finished
+        api_endpoints = extract_api_endpoints(project)
+        logger.info(f"Extracted {len(api_endpoints)} API endpoints from the project")
+        finish_collection(writer, api_endpoints, prerequest_script_lines, test_script_lines,
+                          project_definitions(project))
+    logger.info(f"Postman collection written to {output_file}")
+    return project
+
+
+def finish_collection(writer: CollectionWriter, api_endpoints: List[Dict[str, Any]],
+                      prerequest_script_lines: Dict[str, None], test_script_lines: Dict[str, None],
+                      definitions: Optional[Dict[str, str]] = None) -> None:
+    """
+    Write the API endpoints folder and the collection-level fields that
+    build_postman_collection adds after the test suite folders
+    """
+    if api_endpoints:
+        writer.write_item(build_api_endpoints_folder(api_endpoints))
+
+    fields = {"variable": build_collection_variables(collection_base_url(api_endpoints))
+                          + schema_variables(definitions or {}, prerequest_script_lines)}
+    global_scripts = global_script_events(prerequest_script_lines, test_script_lines)
+    if global_scripts:
+        fields["event"] = global_scripts
+    writer.close(fields)
+
+
+def write_collection_from_store(output_file: str, project_name: str, store: ConvertedStepStore,
+                                api_endpoints: List[Dict[str, Any]],
+                                definitions: Optional[Dict[str, str]] = None, lean_scripts: bool = False,
+                                test_case_ids: Optional[Dict[str, Tuple[str, str]]] = None) -> None:
+    """
+    Write the collection for the steps in store one suite folder at a time,
+    so spilled steps are never all loaded back at once
+    """
+    prerequest_script_lines = {}
+    test_script_lines = {}
+    markers = []
+
+    def note_markers(steps):
+        for step in steps:
+            if step.get("type") == RUN_TEST_CASE_MARKER:
+                markers.append(step)
+            yield step
+
+    collect_global_script_lines(note_markers(store), prerequest_script_lines, test_script_lines)
+    setup_test_cases = setup_test_cases_of(markers, test_case_ids)
+
+    with open_collection_writer(output_file, project_name, lean_scripts) as writer:
+        write_suite_folders_from_store(writer, store, setup_test_cases)
+        finish_collection(writer, api_endpoints, prerequest_script_lines, test_script_lines, definitions)
+
+
+def write_suite_folders_from_store(writer: CollectionWriter, store: ConvertedStepStore,
+                                   setup_test_cases: List[Tuple[str, str]]) -> None:
+    """
+    Write the Setup folder for setup_test_cases, then the folders of the
+    other test cases in store, one suite at a time
+    """
+    setup_cases = [(suite_name, case_name, store.case_steps(suite_name, case_name))
+                   for suite_name, case_name in setup_test_cases]
+    setup_folder = build_setup_folder(setup_cases)
+    if setup_folder:
+        writer.write_item(setup_folder)
+    hoisted = set(setup_test_cases)
+    for suite_name, cases in store.iter_suites():
+        cases = {case_name: steps for case_name, steps in cases.items() if (suite_name, case_name) not in hoisted}
+        if cases:
+            writer.write_item(build_suite_folder(suite_name, cases))
+
+
+@contextmanager
+def open_collection_writer(output_file: str, project_name: str, lean_scripts: bool = False):
+    """
+    A CollectionWriter for output_file. With lean_scripts, the collection is
+    written with lean scripts, and as annotated to its debug_path.
+    """
+    info = build_collection_info(project_name)
+    with open(output_file, 'w') as f:
+        if not lean_scripts:
+            yield CollectionWriter(f, info)
+            return
+        with open(debug_path(output_file), 'w') as debug_f:
+            writer = LeanCollectionWriter(f, debug_f, info)
+            yield writer
+    report_lean_scripts(output_file, writer.sizes)
+
+
+def write_collection(output_file: str, collection: Dict[str, Any], lean_scripts: bool = False) -> None:
+    """
+    Write a collection held in memory. With lean_scripts, it is written with
+    lean scripts, and as annotated to its debug_path.
+    """
+    if lean_scripts:
+        report_lean_scripts(output_file, write_lean_collection(output_file, collection))
+        return
+    with open(output_file, 'w') as f:
+        json.dump(collection, f, indent=2)
+
+
+def report_lean_scripts(output_file: str, sizes: ScriptSizes) -> None:
+    """Log how much smaller lean scripts made the collection"""
+    annotated = os.path.getsize(debug_path(output_file))
+    lean = os.path.getsize(output_file)
+    logger.info(f"{sizes.summary()}; collection {annotated / 1024:.1f} -> {lean / 1024:.1f} KB. "
+                f"Annotated collection written to {debug_path(output_file)}")
+
+
+def load_project(input_file: str, lazy_configs: bool = False, parse_workers: int = 1,
+                 snapshot_cache_dir: str = None, project_filter: Optional[ProjectFilter] = None):
+    """
+    Parse the ReadyAPI project, or load it from the snapshot cache
+    """
+    if snapshot_cache_dir and is_composite_project(input_file):
+        logger.warning("The snapshot cache holds single-file projects; parsing the composite project directly")
+    elif snapshot_cache_dir:
+        return parse_project_file_cached(input_file, snapshot_cache_dir, lazy_configs=lazy_configs,
+                                         workers=parse_workers, project_filter=project_filter)
+    return parse_project_file(input_file, lazy_configs=lazy_configs, workers=parse_workers,
+                              project_filter=project_filter)
+
+
+def write_environment_file(project_name: str, env_file: str) -> None:
+    """
+    Write the generic Postman environment for a converted project
+    """
+    environment = build_environment(project_name)
+    
+    with open(env_file, 'w') as f:
+        json.dump(environment, f, indent=2)
+    logger.info(f"Postman environment written to {env_file}")
+    print(f"✅ Environment file created: {env_file}")
+
+
+def build_collection_from_steps(project_name: str, converted_steps: List[Dict[str, Any]],
+                                api_endpoints: List[Dict[str, Any]],
+                                definitions: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Build the Postman collection for converted steps held in memory
+    """
+    # Setup test cases are the ones other test cases run, found from the steps
+    return build_postman_collection(
+        project_name,
+        converted_steps,
+        api_endpoints=api_endpoints,
+        definitions=definitions if definitions is not None else {}
+    )
+
+
+def build_collection_for_project(project, convert_case: Callable = convert_test_case) -> Tuple[str, Dict[str, Any]]:
+    """
+    Convert a parsed project to a Postman collection held in memory
+
+    Returns:
+        The project name and the collection
+    """
+    project_name = project.name if project.name else "ReadyAPI_Project"
+    test_case_ids = project_test_case_ids(project)
+    converted_steps = []
+    for test_suite in project.test_suites:
+        logger.info(f"Processing test suite: {test_suite.name}")
+        for test_case in test_suite.test_cases:
+            converted_steps.extend(convert_case(test_suite, test_case, test_case_ids=test_case_ids))
+    return project_name, build_collection_from_steps(project_name, converted_steps, extract_api_endpoints(project),
+                                                     project_definitions(project))
+
+
+# File names of the collection and environment written for each project of an archive or batch
+COLLECTION_SUFFIX = '.postman_collection.json'
+ENVIRONMENT_SUFFIX = '.postman_environment.json'
+
+
+def convert_archive_to_postman(archive_file: str, output_dir: str, env_dir: str = None,
+                               project_filter: Optional[ProjectFilter] = None,
+                               convert_case: Callable = convert_test_case, lean_scripts: bool = False) -> List[str]:
+    """
+    Convert every project XML inside a zip archive in one pass over it. Each
+    member is decompressed straight into the parser, without extracting it.
+
+    Returns:
+        The paths of the collections written, named after the members
+    """
+    if project_filter is None:
+        project_filter = ProjectFilter()
+    os.makedirs(output_dir, exist_ok=True)
+    if env_dir:
+        os.makedirs(env_dir, exist_ok=True)
+
+    written = []
+    stems = set()
+    for member, stream in iter_archive_projects(archive_file):
+        logger.info(f"Converting {member} from {archive_file}")
+        project = parse_project_stream(stream, project_filter)
+        project_name, collection = build_collection_for_project(project, convert_case)
+
+        stem = unique_stem(member, stems)
+        output_file = os.path.join(output_dir, stem + COLLECTION_SUFFIX)
+        write_collection(output_file, collection, lean_scripts)
+        logger.info(f"Postman collection written to {output_file}")
+        if env_dir:
+            write_environment_file(project_name, os.path.join(env_dir, stem + ENVIRONMENT_SUFFIX))
+        written.append(output_file)
+    return written
+
+
+def case_converter(optimized_scripts: bool = False, reporter: Optional[ProgressReporter] = None) -> Callable:
+    """convert_test_case with the given script generation, reporting progress to reporter if given"""
+    convert_case = partial(convert_test_case, optimized_scripts=True) if optimized_scripts else convert_test_case
+    return reporter.track(convert_case) if reporter else convert_case
+
+
+def collecting_load_tests(convert_case: Callable, load_tests: List[Dict[str, Any]]) -> Callable:
+    """Wrap a convert_test_case function to add the load plan entries of each case's LoadTests to load_tests"""
+    def convert_and_collect(test_suite, test_case, **options):
+        converted_steps = convert_case(test_suite, test_case, **options)
+        if test_case.load_tests:
+            case_items = build_case_folder(test_case.name, converted_steps)["item"]
+            load_tests.extend(load_plan_entries(test_suite, test_case, case_items))
+        return converted_steps
+    return convert_and_collect
+
+
+def write_load_plan(load_plan_file: str, project_name: str, load_tests: List[Dict[str, Any]]) -> None:
+    """Write the load plan that load_runner.py runs"""
+    with open(load_plan_file, 'w') as f:
+        json.dump({"project": project_name, "load_tests": load_tests}, f, indent=2)
+    logger.info(f"Load plan with {len(load_tests)} load tests written to {load_plan_file}")
+
+
+def write_mock_services(mock_services_file: str, project) -> None:
+    """Write the project's MockServices as the definition mock_server.py serves"""
+    mock_services = [convert_mock_service(mock_service) for mock_service in project.mock_services]
+    with open(mock_services_file, 'w') as f:
+        json.dump({"project": project.name, "mock_services": mock_services}, f, indent=2)
+    logger.info(f"{len(mock_services)} mock services written to {mock_services_file}")
+
+
+def open_progress(input_file: str, project_filter: ProjectFilter) -> ProgressReporter:
+    """
+    A progress reporter for converting input_file, its total taken from a
+    pre-scan of the project's bytes (archives are reported without a total)
+    """
+    total = None if is_zip_path(input_file) else count_steps(input_file, project_filter)
+    return ProgressReporter(total, quiet_loggers=(logger.name, 'conversion_pipeline'))
+
+
+def run_readyapi_to_postman(input_file: str, output_file: str, env_file: str = None, lazy_configs: bool = False,
+                            parse_workers: int = 1, snapshot_cache_dir: str = None,
+                            project_filter: Optional[ProjectFilter] = None, stream: bool = False,
+                            memory_budget: Optional[int] = None, progress: bool = False,
+                            optimized_scripts: bool = False, lean_scripts: bool = False,
+                            load_plan_file: Optional[str] = None, mock_services_file: Optional[str] = None) -> None:
     """
     Run the ReadyAPI to Postman conversion process
     
     Args:
-        input_file: Path to the ReadyAPI project XML file
-        output_file: Path to the output Postman collection JSON file
-        env_file: Path to the output Postman environment JSON file
+        input_file: Path to the ReadyAPI project XML file (.xml, .xml.gz, a .zip of projects, or a composite project directory)
+        output_file: Path to the output Postman collection JSON file (a directory for .zip inputs)
+        env_file: Path to the output Postman environment JSON file (a directory for .zip inputs)
+        lazy_configs: Memory-map the project and only parse step configs that are converted
+        parse_workers: Number of processes parsing test suites in parallel (1 parses serially)
+        snapshot_cache_dir: Directory caching parsed projects so unchanged inputs skip XML parsing
+        project_filter: Suites, cases and step types to convert; defaults to everything but disabled steps
+        stream: Parse, convert and write suite by suite instead of stage by stage
+        memory_budget: Bytes of converted steps to hold in memory before spilling them to disk
+        progress: Report converted steps, rate and ETA instead of logging every step
+        optimized_scripts: Generate test scripts that read and parse each response once
+        lean_scripts: Strip comments, blank lines and console.log calls from the collection's
+            scripts, and write the annotated collection next to it
+        load_plan_file: Path to write the project's LoadTests to, as a plan for load_runner.py
+        mock_services_file: Path to write the project's MockServices to, for mock_server.py
     """
+    if project_filter is None:
+        project_filter = ProjectFilter()
+    load_tests = []
+    project = None
     try:
-        # Parse the ReadyAPI project
-        project = parse_project_file(input_file)
-        if not project:
-            logger.error("Failed to parse ReadyAPI project")
+        if is_zip_path(input_file):
+            if load_plan_file:
+                logger.warning("Load plans are not written for archives of projects")
+            if mock_services_file:
+                logger.warning("Mock services are not written for archives of projects")
+            with open_progress(input_file, project_filter) if progress else nullcontext() as reporter:
+                convert_case = case_converter(optimized_scripts, reporter)
+                written = convert_archive_to_postman(input_file, output_file, env_file, project_filter, convert_case,
+                                                     lean_scripts)
+            print(f"\n✅ Conversion completed. {len(written)} collections saved to: {output_file}")
             return
 
-        # Use the original project name - it's important to maintain the actual project structure
-        project_name = project.name if hasattr(project, 'name') and project.name else "ReadyAPI_Project"
+        if stream:
+            if lazy_configs or parse_workers > 1 or snapshot_cache_dir:
+                logger.warning("Streaming conversion parses incrementally; lazy configs, parse workers "
+                               "and the snapshot cache are not used")
+            with open_progress(input_file, project_filter) if progress else nullcontext() as reporter:
+                convert_case = case_converter(optimized_scripts, reporter)
+                if load_plan_file:
+                    convert_case = collecting_load_tests(convert_case, load_tests)
+                project = stream_readyapi_to_postman(input_file, output_file, project_filter, convert_case,
+                                                     lean_scripts, memory_budget or 0)
+            if project is None:
+                logger.error("Failed to parse ReadyAPI project")
+                return
+            project_name = project.name if project.name else "ReadyAPI_Project"
+        else:
+            project = load_project(input_file, lazy_configs, parse_workers, snapshot_cache_dir, project_filter)
+            if not project:
+                logger.error("Failed to parse ReadyAPI project")
+                return
 
-        # Convert test steps
-        converted_steps = []
+            # Use the original project name - it's important to maintain the actual project structure
+            project_name = project.name if hasattr(project, 'name') and project.name else "ReadyAPI_Project"
+
+            # Convert test steps, spilling them to disk past the memory budget
+            converted_steps = [] if memory_budget is None else ConvertedStepStore(memory_budget)
         
-        # Extract API endpoints from the project
-        api_endpoints = extract_api_endpoints(project)
-        logger.info(f"Extracted {len(api_endpoints)} API endpoints from the project")
+            # Extract API endpoints from the project
+            api_endpoints = extract_api_endpoints(project)
+            logger.info(f"Extracted {len(api_endpoints)} API endpoints from the project")
         
-        for test_suite in project.test_suites:
-            # Keep the original test suite name - these are important identifiers in the test structure
-            logger.info(f"Processing test suite: {test_suite.name}")
-            
-            for test_case in test_suite.test_cases:
-                # Keep the original test case name - these are important identifiers in the test structure
-                logger.info(f"Processing test case: {test_case.name}")
-                
-                # Add test case properties as an input data step
-                if hasattr(test_case, 'properties') and test_case.properties:
-                    # Sanitize the properties to avoid exposing sensitive data
-                    property_variables = sanitize_properties(test_case.properties)
-                    
-                    if property_variables:
-                        properties_step = {
-                            "type": "properties",
-                            "name": "InputData",
-                            "test_suite": test_suite.name,
-                            "test_case": test_case.name,
-                            "variables": property_variables,
-                            "note": f"Variables defined for test case: {test_case.name}"
-                        }
-                        converted_steps.append(properties_step)
-                
-                for test_step in test_case.test_steps:
-                    # Skip steps that are clearly not supported
-                    if hasattr(test_step, 'name'):
-                        if test_step.name.lower() in ["cardnumber", "env"]:
-                            logger.warning(f"Skipping unsupported step type: {test_step.name}")
-                            continue
-                    
-                    # Determine step type based on available attributes
-                    step_type = getattr(test_step, 'step_type', '').lower()
-                    config = getattr(test_step, 'config', None)
-                    
-                    # Convert REST requests
-                    is_rest_request = (
-                        (step_type and 'rest' in step_type) or
-                        (isinstance(config, str) and 'restRequest' in config)
-                    )
-                    
-                    if is_rest_request:
-                        logger.info(f"Converting REST request step: {test_step.name}")
-                        converted_step = convert_rest_request(test_step)
-                        if converted_step:
-                            # Sanitize URLs while preserving the original URL
-                            if "request" in converted_step:
-                                if "url" in converted_step["request"]:
-                                    url = converted_step["request"]["url"]
-                                    if isinstance(url, dict) and "raw" in url:
-                                        # Preserve the original URL but structure it with components
-                                        raw_url = url.get("raw")
-                                        url_obj = sanitize_url(raw_url)
-                                        converted_step["request"]["url"] = url_obj
-                                    elif isinstance(url, str):
-                                        # Convert string URLs to structured format
-                                        converted_step["request"]["url"] = sanitize_url(url)
-                            
-                            converted_step["test_suite"] = test_suite.name
-                            converted_step["test_case"] = test_case.name
-                            converted_steps.append(converted_step)
-                    
-                    # Convert properties steps
-                    elif hasattr(test_step, 'properties') and test_step.properties:
-                        logger.info(f"Converting properties step: {test_step.name}")
-                        # Sanitize the properties to avoid exposing sensitive data
-                        variables = sanitize_properties(test_step.properties)
-                        
-                        converted_step = {
-                            "type": "properties",
-                            "name": test_step.name,
-                            "test_suite": test_suite.name,
-                            "test_case": test_case.name,
-                            "variables": variables,
-                            "note": f"Variables defined in step: {test_step.name}"
-                        }
-                        converted_steps.append(converted_step)
-                    
-                    # Try dispatcher for other types
-                    else:
-                        logger.info(f"Attempting to convert step using dispatcher: {test_step.name}")
-                        context = {
-                            "test_suite": test_suite.name,
-                            "test_case_name": test_case.name,
-                        }
-                        
-                        try:
-                            # Use dispatcher if available
-                            result = dispatch_step_conversion(test_step, context)
-                            if result:
-                                if isinstance(result, list):
-                                    for r in result:
-                                        if isinstance(r, dict):
-                                            r["test_suite"] = test_suite.name
-                                            r["test_case"] = test_case.name
-                                            converted_steps.append(r)
-                                elif isinstance(result, dict):
-                                    result["test_suite"] = test_suite.name
-                                    result["test_case"] = test_case.name
-                                    converted_steps.append(result)
-                        except Exception as e:
-                            logger.warning(f"Dispatcher failed for step {test_step.name}: {str(e)}")
-
-        # Detect setup and utility test cases
-        setup_test_cases = []
-        for step in converted_steps:
-            case_name = step.get("test_case", "")
-            if any(keyword in case_name.lower() for keyword in ["setup", "library", "function", "utility"]):
-                if case_name not in setup_test_cases:
-                    setup_test_cases.append(case_name)
-
-        # Build Postman collection
-        collection = build_postman_collection(
-            project_name,
-            converted_steps,
-            setup_test_cases=setup_test_cases,
-            api_endpoints=api_endpoints
-        )
+            test_case_ids = project_test_case_ids(project)
+            with open_progress(input_file, project_filter) if progress else nullcontext() as reporter:
+                convert_case = case_converter(optimized_scripts, reporter)
+                if load_plan_file:
+                    convert_case = collecting_load_tests(convert_case, load_tests)
+                for test_suite in project.test_suites:
+                    # Keep the original test suite name - these are important identifiers in the test structure
+                    logger.info(f"Processing test suite: {test_suite.name}")
 
-        # Write collection to file
-        with open(output_file, 'w') as f:
-            json.dump(collection, f, indent=2)
-        logger.info(f"Postman collection written to {output_file}")
+                    for test_case in test_suite.test_cases:
+                        converted_steps.extend(convert_case(test_suite, test_case, test_case_ids=test_case_ids))
+
+            if isinstance(converted_steps, ConvertedStepStore):
+                with converted_steps:
+                    write_collection_from_store(output_file, project_name, converted_steps, api_endpoints,
+                                                project_definitions(project), lean_scripts)
+                logger.info(f"Postman collection written to {output_file}")
+            else:
+                collection = build_collection_from_steps(project_name, converted_steps, api_endpoints,
+                                                         project_definitions(project))
+
+                # Write collection to file
+                write_collection(output_file, collection, lean_scripts)
+                logger.info(f"Postman collection written to {output_file}")
 
         # Create environment file if requested
         if env_file:
-            # Create generic environment variables
-            env_vars = [
-                {
-                    "key": "baseUrl",
-                    "value": "{{baseUrl}}",
-                    "type": "default",
-                    "enabled": True
-                },
-                {
-                    "key": "path",
-                    "value": "/api/v1",
-                    "type": "default",
-                    "enabled": True
-                },
-                {
-                    "key": "username",
-                    "value": "",
-                    "type": "default",
-                    "enabled": True
-                },
-                {
-                    "key": "password",
-                    "value": "",
-                    "type": "secret",
-                    "enabled": True
-                },
-                {
-                    "key": "apiKey",
-                    "value": "",
-                    "type": "secret",
-                    "enabled": True
-                },
-                {
-                    "key": "token",
-                    "value": "",
-                    "type": "secret",
-                    "enabled": True
-                },
-                {
-                    "key": "sessionId",
-                    "value": "",
-                    "type": "default",
-                    "enabled": True
-                },
-                {
-                    "key": "cardNumber",
-                    "value": "",
-                    "type": "secret",
-                    "enabled": True
-                },
-                {
-                    "key": "authToken",
-                    "value": "",
-                    "type": "secret",
-                    "enabled": True
-                },
-                {
-                    "key": "id",
-                    "value": "",
-                    "type": "default",
-                    "enabled": True
-                }
-            ]
-            
-            # Generate environment with a unique ID
-            environment = {
-                "id": str(uuid.uuid4()),
-                "name": f"{project_name}_Environment",
-                "values": env_vars
-            }
-            
-            with open(env_file, 'w') as f:
-                json.dump(environment, f, indent=2)
-            logger.info(f"Postman environment written to {env_file}")
-            print(f"✅ Environment file created: {env_file}")
+            write_environment_file(project_name, env_file)
+        if load_plan_file:
+            write_load_plan(load_plan_file, project_name, load_tests)
+        if mock_services_file:
+            write_mock_services(mock_services_file, project)
 
         print(f"\n✅ Conversion completed. Output saved to: {output_file}")
 
     except Exception as e:
         logger.error(f"Error during conversion: {str(e)}")
         raise
+    finally:
+        if project is not None:
+            project.close()
 
 
-# Entry point
-if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description='Convert ReadyAPI project XML to Postman collection')
-    parser.add_argument('--input', required=True, help='Path to ReadyAPI project XML')
+def convert_readyapi_to_ir(input_file: str, ir_file: str, lazy_configs: bool = False, parse_workers: int = 1,
+                           snapshot_cache_dir: str = None, project_filter: Optional[ProjectFilter] = None,
+                           progress: bool = False, optimized_scripts: bool = False) -> None:
+    """
+    Run only the conversion stage: write the converted steps and API endpoints
+    of a ReadyAPI project to an NDJSON intermediate representation file
+    """
+    if project_filter is None:
+        project_filter = ProjectFilter()
+    project = None
+    try:
+        if is_zip_path(input_file):
+            raise ValueError(f"{input_file} is an archive; convert one project at a time, or use run for archives")
+        project = load_project(input_file, lazy_configs, parse_workers, snapshot_cache_dir, project_filter)
+        if not project:
+            logger.error("Failed to parse ReadyAPI project")
+            return
+        project_name = project.name if project.name else "ReadyAPI_Project"
+
+        with open(ir_file, 'w') as f, open_progress(input_file, project_filter) if progress else nullcontext() as reporter:
+            convert_case = case_converter(optimized_scripts, reporter)
+            writer = IRWriter(f, project_name)
+            test_case_ids = project_test_case_ids(project)
+            for test_suite in project.test_suites:
+                logger.info(f"Processing test suite: {test_suite.name}")
+                for test_case in test_suite.test_cases:
+                    writer.write_steps(convert_case(test_suite, test_case, test_case_ids=test_case_ids))
+            writer.write_endpoints(extract_api_endpoints(project))
+            writer.write_definitions(project_definitions(project))
+        logger.info(f"Intermediate representation written to {ir_file}")
+        print(f"\n✅ Conversion completed. Intermediate representation saved to: {ir_file}")
+
+    except Exception as e:
+        logger.error(f"Error during conversion: {str(e)}")
+        raise
+    finally:
+        if project is not None:
+            project.close()
+
+
+def build_postman_from_ir(ir_file: str, output_file: str, env_file: str = None,
+                          memory_budget: Optional[int] = None, lean_scripts: bool = False) -> None:
+    """
+    Run only the build stage: write the Postman collection (and optionally
+    the environment) for an intermediate representation file
+    """
+    try:
+        api_endpoints = []
+        definitions = {}
+        with open(ir_file) as f, ConvertedStepStore(memory_budget) as store:
+            header, records = read_ir(f)
+            project_name = header.get("project") or "ReadyAPI_Project"
+            for record in records:
+                if record["type"] == "step":
+                    store.append(record["step"])
+                elif record["type"] == "definition":
+                    definitions[record["name"]] = record["document"]
+                else:
+                    api_endpoints.append(record["endpoint"])
+            write_collection_from_store(output_file, project_name, store, api_endpoints, definitions, lean_scripts)
+        logger.info(f"Postman collection written to {output_file}")
+
+        if env_file:
+            write_environment_file(project_name, env_file)
+
+        print(f"\n✅ Build completed. Output saved to: {output_file}")
+
+    except Exception as e:
+        logger.error(f"Error during build: {str(e)}")
+        raise
+
+
+def report_inventory(input_file: str, json_file: str = None) -> None:
+    """
+    Print the size and make-up of a project, and an estimate of its
+    conversion, from a single scan of its bytes without converting it.
+    For a zip archive, each project in it is reported, and the JSON is a list
+    """
+    if is_zip_path(input_file):
+        # One inventory per project in the archive
+        inventories = take_archive_inventories(input_file)
+        print("\n\n".join(inventory.format_report() for inventory in inventories))
+        report = [inventory.to_dict() for inventory in inventories]
+    else:
+        inventory = take_inventory(input_file)
+        print(inventory.format_report())
+        report = inventory.to_dict()
+    if json_file:
+        with open(json_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Inventory written to {json_file}")
+
+
+# Subcommands of the command line; legacy invocations without one run the whole conversion
+COMMANDS = ('run', 'convert', 'build', 'inventory')
+
+
+def add_collection_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument('--output', required=True, help='Path to output Postman collection JSON file')
     parser.add_argument('--env', help='Path to output Postman environment JSON file')
-    args = parser.parse_args()
+    parser.add_argument('--memory-budget', type=parse_size, metavar='SIZE',
+                        help="Spill converted steps to a temporary SQLite store past SIZE bytes (e.g. '256M')")
+    parser.add_argument('--lean-scripts', action='store_true',
+                        help='Strip comments, blank lines and console.log calls from scripts; the annotated '
+                             'collection is written next to the output as <name>.debug.json')
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Convert ReadyAPI project XML to Postman collection')
+    commands = parser.add_subparsers(dest='command')
+
+    project_options = argparse.ArgumentParser(add_help=False)
+    project_options.add_argument('--input', required=True,
+                                 help='Path to ReadyAPI project XML (.xml or .xml.gz) or composite project '
+                                      'directory; run also takes a .zip of projects')
+    project_options.add_argument('--lazy-configs', action='store_true',
+                                 help='Memory-map the project and parse step configs only when they are converted')
+    project_options.add_argument('--parse-workers', type=int, default=1,
+                                 help='Parse test suites in this many worker processes (0 uses every CPU)')
+    project_options.add_argument('--snapshot-cache', metavar='DIR',
+                                 help='Cache parsed projects in DIR so re-runs on an unchanged input skip XML parsing')
+    project_options.add_argument('--suite', action='append', metavar='PATTERN',
+                                 help="Only convert test suites whose name matches "
+                                      "(glob, or regex with a 're:' prefix; repeatable)")
+    project_options.add_argument('--case', action='append', metavar='PATTERN',
+                                 help='Only convert test cases whose name matches (same syntax as --suite)')
+    project_options.add_argument('--include-step-type', action='append', metavar='PATTERN',
+                                 help="Only convert steps of matching types, e.g. 'restrequest' or 'groovy'")
+    project_options.add_argument('--exclude-step-type', action='append', metavar='PATTERN',
+                                 help='Skip steps of matching types')
+    project_options.add_argument('--keep-disabled', action='store_true',
+                                 help='Also convert steps marked disabled in ReadyAPI')
+    project_options.add_argument('--progress', action='store_true',
+                                 help='Report converted steps, rate and ETA instead of logging every step')
+    project_options.add_argument('--optimized-scripts', action='store_true',
+                                 help='Generate test scripts that parse each response once and check all '
+                                      'assertions in one pm.test, without eval')
+
+    run = commands.add_parser('run', parents=[project_options],
+                              help='Convert a project to a collection (the default)')
+    add_collection_arguments(run)
+    run.add_argument('--stream', action='store_true',
+                     help='Parse, convert and write the collection suite by suite to bound memory use')
+    run.add_argument('--watch', action='store_true',
+                     help='Keep running and update the collection incrementally every time the input is saved')
+    run.add_argument('--load-plan', metavar='FILE',
+                     help="Write the project's LoadTests to FILE as a plan for load_runner.py")
+    run.add_argument('--mock-services', metavar='FILE',
+                     help="Write the project's MockServices to FILE for mock_server.py to serve")
+
+    convert = commands.add_parser('convert', parents=[project_options],
+                                  help='Convert a project to the NDJSON intermediate representation')
+    convert.add_argument('--output', required=True, help='Path to output intermediate representation file')
+
+    build = commands.add_parser('build', help='Build a collection from an intermediate representation file')
+    build.add_argument('--input', required=True, help='Path to intermediate representation file')
+    add_collection_arguments(build)
+
+    inventory = commands.add_parser('inventory', help='Size up a project without converting it')
+    inventory.add_argument('--input', required=True,
+                           help='Path to ReadyAPI project XML (.xml or .xml.gz), composite project directory, '
+                                'or .zip archive of projects')
+    inventory.add_argument('--json', metavar='FILE', help='Also write the inventory as JSON to FILE')
+    return parser
+
+
+def project_filter_from_args(args) -> ProjectFilter:
+    return ProjectFilter(suites=args.suite, cases=args.case,
+                         include_step_types=args.include_step_type,
+                         exclude_step_types=args.exclude_step_type,
+                         skip_disabled=not args.keep_disabled)
+
+
+# Entry point
+if __name__ == '__main__':
+    import sys
+
+    argv = sys.argv[1:]
+    if not argv or argv[0] not in COMMANDS + ('-h', '--help'):
+        argv = ['run'] + argv
+    args = build_argument_parser().parse_args(argv)
+
+    if args.command == 'inventory':
+        report_inventory(args.input, args.json)
+    elif args.command == 'build':
+        build_postman_from_ir(args.input, args.output, args.env, memory_budget=args.memory_budget,
+                              lean_scripts=args.lean_scripts)
+    elif args.command == 'convert':
+        convert_readyapi_to_ir(args.input, args.output, lazy_configs=args.lazy_configs,
+                               parse_workers=args.parse_workers or os.cpu_count() or 1,
+                               snapshot_cache_dir=args.snapshot_cache, project_filter=project_filter_from_args(args),
+                               progress=args.progress, optimized_scripts=args.optimized_scripts)
+    elif args.watch:
+        from incremental_converter import watch_project
 
-    run_readyapi_to_postman(args.input, args.output, args.env)
+        if (args.stream or args.lazy_configs or args.parse_workers != 1 or args.snapshot_cache or args.memory_budget
+                or args.lean_scripts or args.load_plan or args.mock_services):
+            logger.warning("Watch mode converts incrementally; --stream, --lazy-configs, --parse-workers, "
+                           "--snapshot-cache, --memory-budget, --lean-scripts, --load-plan and --mock-services "
+                           "are not used")
+        try:
+            watch_project(args.input, args.output, args.env, project_filter=project_filter_from_args(args),
+                          optimized_scripts=args.optimized_scripts)
+        except KeyboardInterrupt:
+            pass
+    else:
+        run_readyapi_to_postman(args.input, args.output, args.env, lazy_configs=args.lazy_configs,
+                                parse_workers=args.parse_workers or os.cpu_count() or 1,
+                                snapshot_cache_dir=args.snapshot_cache, project_filter=project_filter_from_args(args),
+                                stream=args.stream, memory_budget=args.memory_budget, progress=args.progress,
+                                optimized_scripts=args.optimized_scripts, lean_scripts=args.lean_scripts,
+                                load_plan_file=args.load_plan, mock_services_file=args.mock_services)
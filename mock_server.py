@@ -0,0 +1,265 @@
+"""
+Serve the MockServices that main_converter_runner writes with --mock-services.
+
+Routes are compiled once at start-up: static REST paths are looked up in a
+hash map, paths with {parameters} in a trie of path segments, and SOAP
+operations by the name of the request's body element or its SOAPAction.
+Every response is encoded once, so serving a request is a lookup and a
+single write, however many operations are mocked:
+
+    python mock_server.py mock_services.json --port 8089
+"""
+import re
+import json
+import random
+import asyncio
+import logging
+from itertools import cycle
+from typing import Any, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from async_http_client import read_body, read_head
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# First element inside a SOAP Body: its namespace prefix and local name
+_SOAP_BODY_ELEMENT = re.compile(rb'<(?:[\w.-]+:)?Body\b[^>]*>\s*<(?:[\w.-]+:)?([\w.-]+)')
+
+_REASONS = {200: 'OK', 201: 'Created', 202: 'Accepted', 204: 'No Content', 400: 'Bad Request',
+            401: 'Unauthorized', 403: 'Forbidden', 404: 'Not Found', 500: 'Internal Server Error'}
+
+
+def _segments(path: str) -> List[str]:
+    return [segment for segment in path.split('/') if segment]
+
+
+def _is_parameter(segment: str) -> bool:
+    return segment.startswith('{') and segment.endswith('}')
+
+
+class _TrieNode:
+    __slots__ = ('children', 'parameter', 'methods')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.parameter: Optional['_TrieNode'] = None
+        self.methods: Dict[str, Any] = {}
+
+
+class RouteTrie(Generic[T]):
+    """
+    Routes of (method, path) to values. Paths without parameters are looked
+    up in one hash map; the others walk a trie of path segments where a
+    {parameter} segment matches any one segment, literal segments first.
+    """
+
+    def __init__(self):
+        self._static: Dict[Tuple[str, str], T] = {}
+        self._root = _TrieNode()
+
+    def add(self, method: str, path: str, value: T) -> None:
+        segments = _segments(path)
+        if not any(_is_parameter(segment) for segment in segments):
+            self._static.setdefault((method, '/' + '/'.join(segments)), value)
+            return
+        node = self._root
+        for segment in segments:
+            if _is_parameter(segment):
+                if node.parameter is None:
+                    node.parameter = _TrieNode()
+                node = node.parameter
+            else:
+                node = node.children.setdefault(segment, _TrieNode())
+        node.methods.setdefault(method, value)
+
+    def match(self, method: str, path: str) -> Optional[T]:
+        segments = _segments(path)
+        value = self._static.get((method, '/' + '/'.join(segments)))
+        if value is not None:
+            return value
+        return self._match(self._root, segments, 0, method)
+
+    def _match(self, node: _TrieNode, segments: List[str], index: int, method: str) -> Optional[T]:
+        if index == len(segments):
+            return node.methods.get(method)
+        child = node.children.get(segments[index])
+        if child is not None:
+            value = self._match(child, segments, index + 1, method)
+            if value is not None:
+                return value
+        if node.parameter is not None:
+            return self._match(node.parameter, segments, index + 1, method)
+        return None
+
+
+def encode_response(status: int, headers: List[Tuple[str, str]], body: bytes) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Mock Response')}"]
+    lines.extend(f"{name}: {value}" for name, value in headers if name.lower() != 'content-length')
+    lines.append(f"Content-Length: {len(body)}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+_NOT_FOUND = encode_response(404, [("Content-Type", "text/plain")], b"No mock operation matches this request")
+
+
+class MockOperation:
+    """An operation with its responses encoded once, handing them out as its dispatch style says"""
+    __slots__ = ('name', 'responses', '_next')
+
+    def __init__(self, definition: Dict[str, Any]):
+        self.name = definition["name"]
+        self.responses = [encode_response(response["status"], [tuple(header) for header in response["headers"]],
+                                          response["body"].encode('utf-8'))
+                          for response in definition["responses"]]
+        if definition["dispatch"] == "sequence":
+            self._next = cycle(self.responses).__next__
+        elif definition["dispatch"] == "random":
+            self._next = lambda: random.choice(self.responses)
+        else:
+            default = self.responses[definition["default_response"]]
+            self._next = lambda: default
+
+    def respond(self) -> bytes:
+        return self._next()
+
+
+class MockRoutes:
+    """The compiled routes of the mock services sharing one port"""
+
+    def __init__(self, services: List[Dict[str, Any]]):
+        self.rest: RouteTrie[MockOperation] = RouteTrie()
+        self.soap: Dict[Tuple[str, str], MockOperation] = {}
+        self.operations = 0
+        for service in services:
+            base = service["path"].rstrip('/')
+            for definition in service["operations"]:
+                operation = MockOperation(definition)
+                self.operations += 1
+                if service["type"] == "rest":
+                    self.rest.add(definition["method"].upper(), base + '/' + definition["path"].lstrip('/'),
+                                  operation)
+                else:
+                    self.soap.setdefault((base or '/', definition["name"]), operation)
+
+    def respond(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> bytes:
+        path = urlsplit(target).path
+        operation = self.rest.match(method, path)
+        if operation is None and self.soap and method == 'POST':
+            operation = self._soap_operation(path.rstrip('/') or '/', headers, body)
+        return operation.respond() if operation is not None else _NOT_FOUND
+
+    def _soap_operation(self, path: str, headers: Dict[str, str], body: bytes) -> Optional[MockOperation]:
+        names = []
+        element = _SOAP_BODY_ELEMENT.search(body)
+        if element:
+            name = element.group(1).decode('ascii', 'replace')
+            names.extend([name, name[:-len('Request')]] if name.endswith('Request') else [name])
+        action = headers.get('soapaction', '').strip('"')
+        if action:
+            names.append(re.split('[/#]', action)[-1])
+        for name in names:
+            operation = self.soap.get((path, name))
+            if operation is not None:
+                return operation
+        return None
+
+
+async def _serve_connection(routes: MockRoutes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            head = await read_head(reader)
+            if head is None:
+                break
+            request_line, headers = head
+            method, target, version = request_line.split(' ', 2)
+            body = await read_body(reader, headers) or b''
+            writer.write(routes.respond(method.upper(), target, headers, body))
+            connection = headers.get('connection', '').lower()
+            if 'close' in connection or (version == 'HTTP/1.0' and 'keep-alive' not in connection):
+                break
+            await writer.drain()
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+        logger.debug(f"Mock connection dropped: {e}")
+    finally:
+        writer.close()
+
+
+def services_by_port(definition: Dict[str, Any], port: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+    """The mock services grouped by the port they listen on, or all on port if given"""
+    grouped: Dict[int, List[Dict[str, Any]]] = {}
+    for service in definition["mock_services"]:
+        grouped.setdefault(service["port"] if port is None else port, []).append(service)
+    return grouped
+
+
+class MockServer:
+    """
+    Serve every mock service of a definition, one asyncio server per port.
+    ports maps each port of the definition to the port actually bound, which
+    differs when the definition asks for port 0.
+    """
+
+    def __init__(self, definition: Dict[str, Any], host: str = '127.0.0.1', port: Optional[int] = None):
+        self.host = host
+        self.routes = {service_port: MockRoutes(services)
+                       for service_port, services in services_by_port(definition, port).items()}
+        self.ports: Dict[int, int] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+
+    async def start(self) -> None:
+        for port, routes in self.routes.items():
+            server = await asyncio.start_server(
+                lambda reader, writer, routes=routes: _serve_connection(routes, reader, writer), self.host, port)
+            self._servers.append(server)
+            self.ports[port] = server.sockets[0].getsockname()[1]
+            logger.info(f"Serving {routes.operations} mock operations on http://{self.host}:{self.ports[port]}")
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def iter_routes(definition: Dict[str, Any]) -> Iterator[str]:
+    """One line per mocked operation: port, method and path, or SOAP operation name"""
+    for service in definition["mock_services"]:
+        for operation in service["operations"]:
+            route = (f"{operation['method']} {service['path'].rstrip('/')}/{operation['path'].lstrip('/')}"
+                     if service["type"] == "rest" else f"SOAP {service['path']} {operation['name']}")
+            yield f":{service['port']} {route} ({operation['dispatch']}, {len(operation['responses'])} responses)"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve MockServices converted from a ReadyAPI project")
+    parser.add_argument("definition", help="Mock services JSON written by main_converter_runner --mock-services")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, help="Serve every mock service on this port instead of its own")
+    parser.add_argument("--list", action="store_true", help="List the mocked routes and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    with open(args.definition) as f:
+        mock_services = json.load(f)
+    if args.list:
+        print("\n".join(iter_routes(mock_services)))
+    else:
+        try:
+            asyncio.run(MockServer(mock_services, args.host, args.port).serve_forever())
+        except KeyboardInterrupt:
+            pass
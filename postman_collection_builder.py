@@ -1,21 +1,97 @@
 import json
-from typing import List, Dict, Any
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 import uuid
 
+from converters.assertion_runtime import (
+    ASSERTION_RUNTIME,
+    RUNTIME_NAME,
+    SCHEMA_CALL,
+    SCHEMA_MARKER,
+    SCHEMA_VARIABLE_PREFIX,
+    schema_references,
+)
+from converters.session_cache import SESSION_CACHE, SESSION_VARIABLE
+from converters.test_case_dependencies import RUN_TEST_CASE_MARKER
+from execution_flow_builder import ExecutionFlowBuilder
 
-def build_postman_collection(project_name: str, converted_steps: List[Dict[str, Any]], setup_test_cases: List[str] = None, api_endpoints: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+logger = logging.getLogger(__name__)
+
+# Name of the first folder, holding the test cases other test cases run
+SETUP_FOLDER_NAME = "Setup"
+
+# Collection pre-request helpers, installed when a step script mentions their name
+COLLECTION_HELPERS = ((RUNTIME_NAME, ASSERTION_RUNTIME), (SESSION_VARIABLE, SESSION_CACHE))
+
+
+def build_postman_collection(project_name: str, converted_steps: List[Dict[str, Any]],
+                             setup_test_cases: List[Union[Tuple[str, str], str]] = None,
+                             api_endpoints: List[Dict[str, Any]] = None,
+                             definitions: Dict[str, str] = None,
+                             test_case_ids: Dict[str, Tuple[str, str]] = None) -> Dict[str, Any]:
     """
     Build a Postman collection from converted ReadyAPI test steps
 
     Args:
         project_name: The name of the ReadyAPI project
         converted_steps: List of converted test steps
-        setup_test_cases: List of test cases that are setup or utility test cases
+        setup_test_cases: Test cases to run once, in this order, in a Setup folder ahead of the
+            test suites, as (suite name, case name) pairs or case names. By default, the
+            cases that other cases run, found by setup_test_cases_of
         api_endpoints: List of API endpoints
+        definitions: Interface definition documents by collection variable name
+        test_case_ids: (suite name, case name) of test cases by ReadyAPI id, for Run TestCase
+            steps converted without them
 
     Returns:
         Dict[str, Any]: The Postman collection
     """
+    # Extract common URL pattern for baseUrl
+    base_url = collection_base_url(api_endpoints)
+
+    # Basic collection structure - minimal with no hardcoded elements
+    collection = {
+        "info": build_collection_info(project_name),
+        "item": [],
+        "variable": build_collection_variables(base_url)
+    }
+
+    # Extract any global scripts from converted steps
+    prerequest_script_lines = {}
+    test_script_lines = {}
+    collect_global_script_lines(converted_steps, prerequest_script_lines, test_script_lines)
+    global_scripts = global_script_events(prerequest_script_lines, test_script_lines)
+    if global_scripts:
+        collection["event"] = global_scripts
+    if definitions is not None:
+        collection["variable"].extend(schema_variables(definitions, prerequest_script_lines))
+
+    # Build collection structure directly from the steps grouped by test suite and test case,
+    # with the setup test cases taken out of their suites to run once, first
+    suite_steps = group_converted_steps(converted_steps)
+    if setup_test_cases is None:
+        setup_test_cases = setup_test_cases_of(converted_steps, test_case_ids)
+    setup_cases = []
+    for setup_case in setup_test_cases:
+        suite_name, case_name = setup_case if isinstance(setup_case, tuple) else (
+            next((suite for suite, cases in suite_steps.items() if setup_case in cases), None), setup_case)
+        setup_cases.append((suite_name, case_name, suite_steps.get(suite_name, {}).pop(case_name, [])))
+    setup_folder = build_setup_folder(setup_cases)
+    if setup_folder:
+        collection["item"].append(setup_folder)
+    for suite_name, cases in suite_steps.items():
+        if cases:
+            collection["item"].append(build_suite_folder(suite_name, cases))
+
+    # Add API endpoints section if available
+    if api_endpoints:
+        collection["item"].append(build_api_endpoints_folder(api_endpoints))
+
+    return collection
+
+
+def build_collection_info(project_name: str) -> Dict[str, Any]:
+    """The collection's info block, with a fresh _postman_id"""
     # Use the project name, sanitizing any invalid characters
     collection_name = project_name.replace(" ", "_").strip()
     if not collection_name:
@@ -24,11 +100,27 @@ def build_postman_collection(project_name: str, converted_steps: List[Dict[str,
     # Remove any trailing underscore
     if collection_name.endswith("_"):
         collection_name = collection_name[:-1]
-    
-    # Generate a UUID for the collection
-    postman_id = str(uuid.uuid4())
-    
-    # Extract common URL pattern for baseUrl
+
+    return {
+        "name": collection_name,
+        "_postman_id": str(uuid.uuid4()),
+        "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+    }
+
+
+def build_collection_variables(base_url: str) -> List[Dict[str, Any]]:
+    """Collection-level variables"""
+    return [
+        {
+            "key": "baseUrl",
+            "value": base_url,
+            "type": "string"
+        }
+    ]
+
+
+def collection_base_url(api_endpoints: List[Dict[str, Any]] = None) -> str:
+    """Base URL of the first API endpoint with an absolute URL, or a {{baseUrl}} placeholder"""
     base_url = ""  # Empty default, will be populated if found
     for endpoint in (api_endpoints or []):
         request = endpoint.get("request", {})
@@ -52,29 +144,11 @@ def build_postman_collection(project_name: str, converted_steps: List[Dict[str,
     if not base_url:
         base_url = "{{baseUrl}}"
 
-    # Basic collection structure - minimal with no hardcoded elements
-    collection = {
-        "info": {
-            "name": collection_name,
-            "_postman_id": postman_id,
-            "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
-        },
-        "item": [],
-        "variable": [
-            {
-                "key": "baseUrl",
-                "value": base_url,
-                "type": "string"
-            }
-        ]
-    }
+    return base_url
 
-    # Extract any global scripts from converted steps
-    global_scripts = extract_global_scripts(converted_steps)
-    if global_scripts:
-        collection["event"] = global_scripts
 
-    # Group steps by test suite and test case
+def group_converted_steps(converted_steps: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Group converted steps by test suite and test case, in order of first appearance"""
     suite_steps = {}
     for step in converted_steps:
         suite_name = step.get("test_suite", "Default Suite")
@@ -87,99 +161,152 @@ def build_postman_collection(project_name: str, converted_steps: List[Dict[str,
             
         suite_steps[suite_name][case_name].append(step)
 
-    # Build collection structure directly from the grouped steps
-    for suite_name, cases in suite_steps.items():
-        suite_folder = {
-            "name": suite_name,
-            "description": f"Test suite: {suite_name}",
-            "item": []
-        }
-        
-        for case_name, steps in cases.items():
-            case_folder = {
-                "name": case_name,
-                "description": f"Test case: {case_name}",
-                "item": []
+    return suite_steps
+
+
+def setup_test_cases_of(converted_steps: Iterable[Dict[str, Any]],
+                        test_case_ids: Dict[str, Tuple[str, str]] = None) -> List[Tuple[str, str]]:
+    """
+    The (suite name, case name) of the test cases that other test cases run,
+    through Run TestCase steps or Groovy scripts, each after the cases it runs.
+    Run TestCase targets converted as ids are looked up in test_case_ids.
+    """
+    flow_builder = ExecutionFlowBuilder()
+    for step in converted_steps:
+        if step.get("type") != RUN_TEST_CASE_MARKER:
+            continue
+        if "target_id" in step:
+            target = (test_case_ids or {}).get(step["target_id"])
+            if target is None:
+                logger.warning(f"Run TestCase step {step.get('name')} runs a test case that is not converted")
+                continue
+        else:
+            target = (step["target_suite"], step["target_case"])
+        flow_builder.register_test_case_dependency(
+            (step.get("test_suite", "Default Suite"), step.get("test_case", "Default Case")), target)
+    return flow_builder.get_setup_test_cases()
+
+
+def build_setup_folder(setup_cases: Iterable[Tuple[str, str, List[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+    """
+    Build the Setup folder from (suite name, case name, steps) of the setup
+    test cases in execution order, or None if none of them has steps
+    """
+    setup_folder = {
+        "name": SETUP_FOLDER_NAME,
+        "description": "Test cases that other test cases run, each run once before them",
+        "item": []
+    }
+    for suite_name, case_name, steps in setup_cases:
+        if not steps:
+            logger.warning(f"Setup test case {case_name} is not converted")
+            continue
+        case_folder = build_case_folder(case_name, steps)
+        case_folder["description"] = f"Test case: {case_name}, from test suite: {suite_name}"
+        setup_folder["item"].append(case_folder)
+    return setup_folder if setup_folder["item"] else None
+
+
+def build_case_folder(case_name: str, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the Postman folder for one test case from its converted steps"""
+    case_folder = {
+        "name": case_name,
+        "description": f"Test case: {case_name}",
+        "item": []
+    }
+
+    # Run TestCase markers only record which test cases run first
+    steps = [step for step in steps if step.get("type") != RUN_TEST_CASE_MARKER]
+
+    # Sort steps - InputData should be first, then setup scripts, then others
+    sorted_steps = []
+    input_data_steps = [step for step in steps if step.get("type") == "properties" or step.get("name") == "InputData"]
+    setup_steps = [step for step in steps if any(keyword in step.get("name", "").lower() for keyword in ["setup", "init", "config"])]
+    other_steps = [step for step in steps if step not in input_data_steps and step not in setup_steps]
+
+    sorted_steps = input_data_steps + setup_steps + other_steps
+
+    for step in sorted_steps:
+        if step.get("type") == "properties":
+            # Handle properties step
+            properties_item = {
+                "name": step.get("name", "InputData"),
+                "type": "properties",
+                "variables": step.get("variables", []),
+                "note": step.get("note", f"Variables defined in step '{step.get('name', 'InputData')}'")
             }
-            
-            # Sort steps - InputData should be first, then setup scripts, then others
-            sorted_steps = []
-            input_data_steps = [step for step in steps if step.get("type") == "properties" or step.get("name") == "InputData"]
-            setup_steps = [step for step in steps if any(keyword in step.get("name", "").lower() for keyword in ["setup", "init", "config"])]
-            other_steps = [step for step in steps if step not in input_data_steps and step not in setup_steps]
-            
-            sorted_steps = input_data_steps + setup_steps + other_steps
-            
-            for step in sorted_steps:
-                if step.get("type") == "properties":
-                    # Handle properties step
-                    properties_item = {
-                        "name": step.get("name", "InputData"),
-                        "type": "properties",
-                        "variables": step.get("variables", []),
-                        "note": step.get("note", f"Variables defined in step '{step.get('name', 'InputData')}'")
-                    }
-                    case_folder["item"].append(properties_item)
-                elif "event" in step:
-                    # Handle script steps (already formatted properly)
-                    case_folder["item"].append(step)
-                else:
-                    # Handle request steps
-                    request = step.get("request", {})
-                    url = request.get("url", "{{baseUrl}}")
-                    
-                    # Create the item based on step type
-                    item = {
-                        "name": step.get("name", "Unnamed Request"),
-                        "request": {
-                            "method": request.get("method", "GET"),
-                            "header": request.get("header", []),
-                            "url": url if isinstance(url, dict) else {"raw": url, "host": [url], "path": [""]},
-                            "description": request.get("description", "Converted from ReadyAPI request")
-                        }
+            case_folder["item"].append(properties_item)
+        elif "event" in step:
+            # Handle script steps (already formatted properly)
+            case_folder["item"].append(step)
+        else:
+            # Handle request steps
+            request = step.get("request", {})
+            url = request.get("url", "{{baseUrl}}")
+
+            # Create the item based on step type
+            item = {
+                "name": step.get("name", "Unnamed Request"),
+                "request": {
+                    "method": request.get("method", "GET"),
+                    "header": request.get("header", []),
+                    "url": url if isinstance(url, dict) else {"raw": url, "host": [url], "path": [""]},
+                    "description": request.get("description", "Converted from ReadyAPI request")
+                }
+            }
+
+            # Add body if present
+            if "body" in request:
+                item["request"]["body"] = request["body"]
+
+            # Add headers from step if present
+            if "header" in step:
+                item["request"]["header"] = step["header"]
+
+            # Add test script if present
+            if "event" in step:
+                item["event"] = step["event"]
+            elif "test_script" in step:
+                item["event"] = [{
+                    "listen": "test",
+                    "script": {
+                        "type": "text/javascript",
+                        "exec": step["test_script"].split("\n") if isinstance(step["test_script"], str) else step["test_script"]
                     }
-                    
-                    # Add body if present
-                    if "body" in request:
-                        item["request"]["body"] = request["body"]
-                    
-                    # Add headers from step if present
-                    if "header" in step:
-                        item["request"]["header"] = step["header"]
-                    
-                    # Add test script if present
-                    if "event" in step:
-                        item["event"] = step["event"]
-                    elif "test_script" in step:
-                        item["event"] = [{
-                            "listen": "test",
-                            "script": {
-                                "type": "text/javascript",
-                                "exec": step["test_script"].split("\n") if isinstance(step["test_script"], str) else step["test_script"]
-                            }
-                        }]
-                    
-                    case_folder["item"].append(item)
-            
-            suite_folder["item"].append(case_folder)
-        
-        collection["item"].append(suite_folder)
+                }]
 
-    # Add API endpoints section if available
-    if api_endpoints:
-        api_endpoints_folder = {
-            "name": "API Endpoints",
-            "description": "Collection of all API endpoints from the ReadyAPI project",
-            "item": []
-        }
-        
-        # Add endpoints from the project
-        for endpoint in api_endpoints:
-            api_endpoints_folder["item"].append(endpoint)
-        
-        collection["item"].append(api_endpoints_folder)
+            case_folder["item"].append(item)
 
-    return collection
+    return case_folder
+
+
+def build_suite_folder(suite_name: str, cases: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Build the Postman folder for one test suite from its converted steps, grouped by test case"""
+    suite_folder = {
+        "name": suite_name,
+        "description": f"Test suite: {suite_name}",
+        "item": []
+    }
+
+    for case_name, steps in cases.items():
+        suite_folder["item"].append(build_case_folder(case_name, steps))
+
+    return suite_folder
+
+
+def build_api_endpoints_folder(api_endpoints: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the folder listing every API endpoint of the project"""
+    api_endpoints_folder = {
+        "name": "API Endpoints",
+        "description": "Collection of all API endpoints from the ReadyAPI project",
+        "item": []
+    }
+
+    # Add endpoints from the project
+    for endpoint in api_endpoints:
+        api_endpoints_folder["item"].append(endpoint)
+
+    return api_endpoints_folder
 
 
 def extract_global_scripts(converted_steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -187,11 +314,20 @@ def extract_global_scripts(converted_steps: List[Dict[str, Any]]) -> List[Dict[s
     Extract global scripts from converted steps
     No hardcoded scripts - dynamically extract from steps
     """
-    global_scripts = []
-    prerequest_script_lines = []
-    test_script_lines = []
-    
-    # Look for common pre-request and test script patterns in steps
+    prerequest_script_lines = {}
+    test_script_lines = {}
+    collect_global_script_lines(converted_steps, prerequest_script_lines, test_script_lines)
+    return global_script_events(prerequest_script_lines, test_script_lines)
+
+
+def collect_global_script_lines(converted_steps: Iterable[Dict[str, Any]], prerequest_script_lines: Dict[str, None],
+                                test_script_lines: Dict[str, None]) -> None:
+    """
+    Add the common pre-request and test script lines of converted_steps to
+    the given ordered sets, so global scripts can be collected step by step.
+    A script using a collection helper adds the helper's first line to the
+    pre-request lines, which global_script_events expands into the helper.
+    """
     for step in converted_steps:
         if "event" in step:
             events = step["event"] if isinstance(step["event"], list) else [step["event"]]
@@ -200,22 +336,66 @@ def extract_global_scripts(converted_steps: List[Dict[str, Any]]) -> List[Dict[s
                     script = event["script"]
                     if "exec" in script and isinstance(script["exec"], list):
                         for line in script["exec"]:
-                            if (line.strip() and 
-                                "pm.request.headers.add" in line and
-                                line not in prerequest_script_lines):
-                                prerequest_script_lines.append(line)
+                            if line.strip() and "pm.request.headers.add" in line:
+                                prerequest_script_lines.setdefault(line)
+                            else:
+                                _note_helper_use(line, prerequest_script_lines)
                 elif event.get("listen") == "test" and "script" in event:
                     script = event["script"]
                     if "exec" in script and isinstance(script["exec"], list):
                         for line in script["exec"]:
-                            if (line.strip() and 
-                                ("pm.test" in line or "pm.response" in line) and
-                                line not in test_script_lines):
-                                test_script_lines.append(line)
-    
+                            if line.strip() and ("pm.test" in line or "pm.response" in line) and _is_whole_statement(line):
+                                test_script_lines.setdefault(line)
+                            _note_helper_use(line, prerequest_script_lines)
+
+
+def _is_whole_statement(line: str) -> bool:
+    """Whether a script line closes every bracket it opens, so it runs on its own"""
+    return line.count("(") == line.count(")") and line.count("{") == line.count("}")
+
+
+def _note_helper_use(line: str, prerequest_script_lines: Dict[str, None]) -> None:
+    """Record the collection helpers a script line uses, and the definitions it validates against"""
+    for name, helper in COLLECTION_HELPERS:
+        if name in line:
+            prerequest_script_lines.setdefault(helper[0])
+    if SCHEMA_CALL in line:
+        for name in schema_references(line):
+            prerequest_script_lines.setdefault(SCHEMA_MARKER + name)
+
+
+def schema_variables(definitions: Dict[str, str], prerequest_script_lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Collection variables holding each definition document that collected
+    Schema Compliance checks use, once however many requests use it
+    """
+    variables = []
+    for line in prerequest_script_lines:
+        if line.startswith(SCHEMA_MARKER):
+            name = line[len(SCHEMA_MARKER):]
+            if name in definitions:
+                variables.append({"key": name, "value": definitions[name], "type": "string"})
+            else:
+                logger.warning(f"Schema Compliance is not checked for '{name[len(SCHEMA_VARIABLE_PREFIX):]}': "
+                               f"the interface has no JSON OpenAPI or Swagger definition")
+    return variables
+
+
+def global_script_events(prerequest_script_lines: Iterable[str], test_script_lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """Collection-level events for the collected common script lines"""
+    global_scripts = []
+    prerequest_script_lines = [line for line in prerequest_script_lines if not line.startswith(SCHEMA_MARKER)]
+    test_script_lines = list(test_script_lines)
+    helpers = [helper for _, helper in COLLECTION_HELPERS if helper[0] in prerequest_script_lines]
+    for helper in helpers:
+        prerequest_script_lines.remove(helper[0])
+
     # Add common scripting elements if we found any
     if prerequest_script_lines:
         prerequest_script_lines = ["// Common pre-request script", ""] + prerequest_script_lines
+    for helper in reversed(helpers):
+        prerequest_script_lines = helper + ([""] + prerequest_script_lines if prerequest_script_lines else [])
+    if prerequest_script_lines:
         global_scripts.append({
             "listen": "prerequest",
             "script": {
@@ -0,0 +1,86 @@
+import re
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+# {{name}} references to Postman variables
+_VARIABLE = re.compile(r'\{\{([^{}]+)\}\}')
+
+# Variable values may refer to other variables, up to this deep
+_MAX_NESTING = 10
+
+
+class PreparedRequest:
+    """A Postman request with its variables resolved, ready to send"""
+    __slots__ = ('method', 'url', 'headers', 'body')
+
+    def __init__(self, method: str, url: str, headers: List[Tuple[str, str]], body: bytes):
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+
+def load_environment(env_file: Optional[str], overrides: Iterable[str] = ()) -> Dict[str, str]:
+    """
+    The enabled variables of a Postman environment file, with KEY=VALUE
+    overrides applied on top
+    """
+    variables = {}
+    if env_file:
+        with open(env_file) as f:
+            for value in json.load(f).get("values", []):
+                if value.get("enabled", True):
+                    variables[value["key"]] = str(value.get("value", ""))
+    for override in overrides:
+        key, _, value = override.partition('=')
+        variables[key] = value
+    return variables
+
+
+def resolve_variables(text: str, variables: Dict[str, str]) -> str:
+    """text with every {{name}} in variables replaced by its value; unknown names are left as they are"""
+    for _ in range(_MAX_NESTING):
+        resolved = _VARIABLE.sub(lambda match: variables.get(match.group(1), match.group(0)), text)
+        if resolved == text:
+            break
+        text = resolved
+    return text
+
+
+def unresolved_variables(text: str) -> List[str]:
+    """The names of the {{variables}} left in text"""
+    return _VARIABLE.findall(text)
+
+
+def retarget(url: str, target: str) -> str:
+    """url sent to the scheme and host of target instead, under target's path"""
+    parts = urlsplit(url)
+    base = urlsplit(target)
+    return urlunsplit((base.scheme, base.netloc, base.path.rstrip('/') + parts.path, parts.query, ''))
+
+
+def prepare_request(request: Dict[str, Any], variables: Dict[str, str], target: Optional[str] = None) -> PreparedRequest:
+    """
+    Resolve the method, URL, enabled headers and raw or urlencoded body of a
+    Postman request. URLs without a scheme are sent over http, and every URL
+    is sent to target instead of its own host when target is given.
+    """
+    url = request.get("url", "")
+    url = resolve_variables(url.get("raw", "") if isinstance(url, dict) else url, variables)
+    if '://' not in url:
+        url = 'http://' + url
+    if target:
+        url = retarget(url, target)
+    headers = [(header["key"], resolve_variables(str(header.get("value", "")), variables))
+               for header in request.get("header", []) if not header.get("disabled")]
+
+    body = request.get("body") or {}
+    if body.get("mode") == "raw":
+        content = resolve_variables(body.get("raw", ""), variables).encode('utf-8')
+    elif body.get("mode") == "urlencoded":
+        content = urlencode([(pair["key"], resolve_variables(str(pair.get("value", "")), variables))
+                             for pair in body.get("urlencoded", []) if not pair.get("disabled")]).encode('ascii')
+    else:
+        content = b''
+    return PreparedRequest(request.get("method", "GET").upper(), url, headers, content)
@@ -0,0 +1,97 @@
+import os
+import gzip
+import zipfile
+import logging
+from typing import BinaryIO, Iterator, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+GZIP_SUFFIX = '.gz'
+ZIP_SUFFIX = '.zip'
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def is_gzip_path(path: str) -> bool:
+    return path.lower().endswith(GZIP_SUFFIX)
+
+
+def is_zip_path(path: str) -> bool:
+    return path.lower().endswith(ZIP_SUFFIX)
+
+
+def is_gzip_data(data: bytes) -> bool:
+    return data[:2] == _GZIP_MAGIC
+
+
+def open_project_stream(xml_path: str) -> BinaryIO:
+    """Open a project file for reading, decompressing .gz files as they are read"""
+    if is_gzip_path(xml_path):
+        return gzip.open(xml_path, 'rb')
+    return open(xml_path, 'rb')
+
+
+def project_stem(path: str) -> str:
+    """A project file's name without its directory and .xml / .xml.gz extensions"""
+    name = os.path.basename(path)
+    if is_gzip_path(name):
+        name = name[:-len(GZIP_SUFFIX)]
+    return os.path.splitext(name)[0]
+
+
+def unique_stem(path: str, stems: Set[str]) -> str:
+    """
+    project_stem(path), with '_' appended until it is not in stems, which it
+    is then added to; projects in different folders may share a file name
+    """
+    stem = project_stem(path)
+    while stem in stems:
+        stem += '_'
+    stems.add(stem)
+    return stem
+
+
+def list_archive_projects(zip_path: str) -> List[str]:
+    """Names of the project XML files (.xml or .xml.gz) inside a zip archive, in archive order"""
+    with zipfile.ZipFile(zip_path) as archive:
+        return [info.filename for info in archive.infolist() if _is_project_member(info)]
+
+
+def _is_project_member(info: zipfile.ZipInfo) -> bool:
+    name = info.filename
+    if info.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('.'):
+        return False
+    return name.lower().endswith(('.xml', '.xml' + GZIP_SUFFIX))
+
+
+def open_archive_member(archive: zipfile.ZipFile, name: str) -> BinaryIO:
+    """Open a member of an open archive, decompressing it as it is read"""
+    stream = archive.open(name)
+    if is_gzip_path(name):
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    return stream
+
+
+def iter_archive_projects(zip_path: str) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yield (member name, stream) for every project XML in a zip archive, in one
+    pass over the archive. Each stream is closed once the next one is requested.
+    """
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            if not _is_project_member(info):
+                continue
+            with open_archive_member(archive, info.filename) as stream:
+                yield info.filename, stream
+
+
+# Example usage
+if __name__ == '__main__':
+    import sys
+
+    for path in sys.argv[1:]:
+        if is_zip_path(path):
+            for name in list_archive_projects(path):
+                print(f"{path}: {name} -> {project_stem(name)}")
+        else:
+            with open_project_stream(path) as f:
+                print(f"{path}: {f.read(100)!r}")
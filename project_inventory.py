@@ -0,0 +1,454 @@
+import os
+import re
+import gzip
+import html
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from readyapi_xml_scanner import START_TAG_BODY, ElementSpan, markup_pattern, open_project_buffer, start_tag_attributes
+from readyapi_project_parser import ProjectFilter, is_composite_project
+from project_archives import is_gzip_path, is_zip_path, iter_archive_projects
+from step_conversion_logger import SKIPPED_TYPES, STEP_HANDLERS, SUPPORTED_OPTIONAL
+from converters.test_case_dependencies import RUN_TEST_CASE_TYPES, groovy_test_case_references, run_test_case_marker
+
+logger = logging.getLogger(__name__)
+
+# One pass over the raw bytes finds every element the inventory counts; script
+# and request bodies are matched whole so markup-like text inside them is skipped.
+# Each alternative has one named group, so match.lastgroup tells them apart.
+_INVENTORY_TOKEN = markup_pattern(
+    rb'script>(?P<script>[^<]*(?:<(?!/script\s*>)[^<]*)*)</script\s*>',
+    rb'con:request>(?P<body>[^<]*(?:<(?!/con:request\s*>)[^<]*)*)</con:request\s*>',
+    rb'con:testStep(?=[\s/>])(?P<step>' + START_TAG_BODY + rb')>',
+    rb'(?P<step_end>/con:testStep\s*>)',
+    rb'(?P<case>con:testCase)(?=[\s/>])',
+    rb'(?P<suite>con:testSuite)(?=[\s/>])',
+    rb'con:interface(?=[\s/>])(?P<interface>' + START_TAG_BODY + rb')>',
+    rb'(?P<resource>con:resource)(?=[\s/>])',
+    rb'(?P<method>con:method)(?=[\s/>])',
+)
+_TYPE_ATTRIBUTE = re.compile(rb'\s(?:xsi:)?type\s*=\s*["\'](?:con:)?([^"\']*)')
+_DISABLED_ATTRIBUTE = re.compile(rb'\sdisabled\s*=\s*["\']true["\']')
+
+# The pre-scan of count_steps only needs suite, case and step start tags
+_STEP_COUNT_TOKEN = markup_pattern(
+    rb'script>[^<]*(?:<(?!/script\s*>)[^<]*)*</script\s*>',
+    rb'con:request>[^<]*(?:<(?!/con:request\s*>)[^<]*)*</con:request\s*>',
+    rb'con:testStep(?=[\s/>])(?P<step>' + START_TAG_BODY + rb')>',
+    rb'con:testCase(?=[\s/>])(?P<case>' + START_TAG_BODY + rb')>',
+    rb'con:testSuite(?=[\s/>])(?P<suite>' + START_TAG_BODY + rb')>',
+)
+
+# The pre-scan of scan_test_case_runs also needs Groovy scripts and Run TestCase targets
+_TEST_CASE_RUN_TOKEN = markup_pattern(
+    rb'script>(?P<script>[^<]*(?:<(?!/script\s*>)[^<]*)*)</script\s*>',
+    rb'con:request>[^<]*(?:<(?!/con:request\s*>)[^<]*)*</con:request\s*>',
+    rb'con:targetTestCase>(?P<target>[^<]*)</con:targetTestCase\s*>',
+    rb'con:testStep(?=[\s/>])(?P<step>' + START_TAG_BODY + rb')>',
+    rb'(?P<step_end>/con:testStep\s*>)',
+    rb'con:testCase(?=[\s/>])(?P<case>' + START_TAG_BODY + rb')>',
+    rb'con:testSuite(?=[\s/>])(?P<suite>' + START_TAG_BODY + rb')>',
+)
+
+# Gzip streams are scanned a chunk at a time. Tokens starting in the last
+# _CHUNK_OVERLAP bytes of a chunk are scanned again with the next chunk, so no
+# token shorter than that is cut in two
+_CHUNK_BYTES = 8 << 20
+_CHUNK_OVERLAP = 1 << 20
+
+_CDATA_START = b'<![CDATA['
+_CDATA_END = b']]>'
+
+# Cost model of a conversion, calibrated with benchmarks/bench_inventory_estimates.py
+# (single core, Python 3.11, synthetic projects, command-line run with INFO logging).
+# Re-run it after changing a converter. A Groovy step adds its converted script to the
+# pre-request script of the next request, so it costs output bytes per script byte.
+STARTUP_SECONDS = 0.25
+PARSE_SECONDS_PER_MB = 0.012
+SKIPPED_SECONDS_PER_STEP = 0.00005
+CONVERT_SECONDS_PER_STEP = {"restrequest": 0.00054, "groovy": 0.00042, "properties": 0.00009}
+DEFAULT_CONVERT_SECONDS_PER_STEP = 0.00005
+OUTPUT_BYTES_PER_STEP = {"restrequest": 2330, "groovy": 461, "properties": 6}
+OUTPUT_BYTES_PER_BODY_BYTE = 1.0
+OUTPUT_BYTES_PER_SCRIPT_BYTE = 1.54
+
+
+def conversion_class(step_type: str) -> str:
+    """How the converter treats a step type: converted, optional (simulated), skipped or unsupported"""
+    if step_type in SKIPPED_TYPES:
+        return "skipped"
+    if step_type in SUPPORTED_OPTIONAL:
+        return "optional"
+    if step_type in STEP_HANDLERS or 'rest' in step_type:
+        return "converted"
+    return "unsupported"
+
+
+class ProjectInventory:
+    """Counts and sizes of a project's contents, gathered without parsing it"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.input_bytes = 0
+        self.suites = 0
+        self.cases = 0
+        self.step_types = Counter()
+        self.disabled_steps = Counter()
+        self.interface_types = Counter()
+        self.resources = 0
+        self.methods = 0
+        self.groovy_scripts = 0
+        self.groovy_lines = 0
+        self.groovy_bytes = 0
+        self.request_bodies = 0
+        self.request_body_bytes = 0
+        self.largest_request_body = 0
+
+    @property
+    def steps(self) -> int:
+        return sum(self.step_types.values())
+
+    def scan(self, matches: Iterable[Any]) -> None:
+        """Add the _INVENTORY_TOKEN matches of one project file to the inventory"""
+        step_type = None
+        for match in matches:
+            kind = match.lastgroup
+            if kind == 'step':
+                attributes = match.group('step')
+                type_match = _TYPE_ATTRIBUTE.search(attributes)
+                step_type = type_match.group(1).decode('utf-8').lower() if type_match else ''
+                if _DISABLED_ATTRIBUTE.search(attributes):
+                    self.disabled_steps[step_type] += 1
+                else:
+                    self.step_types[step_type] += 1
+                if attributes.endswith(b'/'):
+                    step_type = None
+            elif kind == 'step_end':
+                step_type = None
+            elif kind == 'script':
+                if step_type == 'groovy':
+                    script = _strip_cdata(match.group('script'))
+                    self.groovy_scripts += 1
+                    self.groovy_bytes += len(script)
+                    self.groovy_lines += script.count(b'\n') + 1 if script.strip() else 0
+            elif kind == 'body':
+                if step_type is not None:
+                    body = len(_strip_cdata(match.group('body')))
+                    self.request_bodies += 1
+                    self.request_body_bytes += body
+                    self.largest_request_body = max(self.largest_request_body, body)
+            elif kind == 'case':
+                self.cases += 1
+            elif kind == 'suite':
+                self.suites += 1
+            elif kind == 'interface':
+                type_match = _TYPE_ATTRIBUTE.search(match.group('interface'))
+                self.interface_types[type_match.group(1).decode('utf-8') if type_match else ''] += 1
+            elif kind == 'resource':
+                self.resources += 1
+            elif kind == 'method':
+                self.methods += 1
+
+    def conversion_counts(self) -> Dict[str, int]:
+        """Enabled steps by conversion class, plus the disabled steps dropped by default"""
+        counts = Counter({"converted": 0, "optional": 0, "skipped": 0, "unsupported": 0})
+        for step_type, count in self.step_types.items():
+            counts[conversion_class(step_type)] += count
+        counts["disabled"] = sum(self.disabled_steps.values())
+        return dict(counts)
+
+    def estimate(self) -> Tuple[float, int]:
+        """Estimated seconds to convert the project and bytes of the resulting collection"""
+        seconds = STARTUP_SECONDS + PARSE_SECONDS_PER_MB * self.input_bytes / (1 << 20)
+        output_bytes = OUTPUT_BYTES_PER_BODY_BYTE * self.request_body_bytes
+        output_bytes += OUTPUT_BYTES_PER_SCRIPT_BYTE * self.groovy_bytes
+        for step_type, count in self.step_types.items():
+            if conversion_class(step_type) == "skipped":
+                seconds += SKIPPED_SECONDS_PER_STEP * count
+                continue
+            seconds += CONVERT_SECONDS_PER_STEP.get(step_type, DEFAULT_CONVERT_SECONDS_PER_STEP) * count
+            output_bytes += OUTPUT_BYTES_PER_STEP.get(step_type, 0) * count
+        return seconds, int(output_bytes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        seconds, output_bytes = self.estimate()
+        return {
+            "path": self.path,
+            "input_bytes": self.input_bytes,
+            "suites": self.suites,
+            "cases": self.cases,
+            "steps": self.steps,
+            "step_types": dict(self.step_types.most_common()),
+            "disabled_step_types": dict(self.disabled_steps.most_common()),
+            "conversion": self.conversion_counts(),
+            "interfaces": dict(self.interface_types),
+            "resources": self.resources,
+            "methods": self.methods,
+            "groovy": {"scripts": self.groovy_scripts, "lines": self.groovy_lines, "bytes": self.groovy_bytes},
+            "request_bodies": {"count": self.request_bodies, "bytes": self.request_body_bytes,
+                               "largest": self.largest_request_body},
+            "estimate": {"seconds": round(seconds, 1), "output_bytes": output_bytes},
+        }
+
+    def format_report(self) -> str:
+        seconds, output_bytes = self.estimate()
+        counts = self.conversion_counts()
+        lines = [
+            f"📋 Inventory of {self.path} ({_size(self.input_bytes)})",
+            f"  Test suites: {self.suites:,}",
+            f"  Test cases:  {self.cases:,}",
+            f"  Test steps:  {self.steps:,} enabled, {counts['disabled']:,} disabled",
+            f"  Interfaces:  {sum(self.interface_types.values()):,} "
+            f"({self.resources:,} resources, {self.methods:,} methods)",
+            "",
+            f"  {'Step type':<24}{'Steps':>10}  Conversion",
+        ]
+        for step_type, count in self.step_types.most_common():
+            lines.append(f"  {step_type or '(none)':<24}{count:>10,}  {conversion_class(step_type)}")
+        lines += [
+            "",
+            f"  Groovy scripts: {self.groovy_scripts:,} ({self.groovy_lines:,} lines, {_size(self.groovy_bytes)})",
+            f"  Request bodies: {self.request_bodies:,} ({_size(self.request_body_bytes)}, "
+            f"largest {_size(self.largest_request_body)})",
+            "",
+            f"  Converted: {counts['converted']:,}  Simulated (SUPPORTED_OPTIONAL): {counts['optional']:,}  "
+            f"Skipped (SKIPPED_TYPES): {counts['skipped']:,}  Unsupported: {counts['unsupported']:,}",
+            f"  Estimated conversion: ~{seconds:.0f}s, collection ~{_size(output_bytes)}",
+        ]
+        return "\n".join(lines)
+
+
+def _strip_cdata(text: bytes) -> bytes:
+    text = text.strip()
+    if text.startswith(_CDATA_START) and text.endswith(_CDATA_END):
+        return text[len(_CDATA_START):-len(_CDATA_END)]
+    return text
+
+
+def _size(count: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+
+def _composite_files(project_dir: str) -> Iterator[str]:
+    for directory, subdirectories, names in os.walk(project_dir):
+        subdirectories.sort()
+        for name in sorted(names):
+            if name.lower().endswith('.xml'):
+                yield os.path.join(directory, name)
+
+
+def _stream_matches(stream, token, sizes: List[int]) -> Iterator[Any]:
+    """The matches of token in a stream of project bytes, read a chunk at a time"""
+    window = b''
+    size = 0
+    while True:
+        chunk = stream.read(_CHUNK_BYTES)
+        if not chunk:
+            yield from token.finditer(window)
+            sizes.append(size)
+            return
+        size += len(chunk)
+        window += chunk
+        limit = len(window) - _CHUNK_OVERLAP
+        matches = []
+        for match in token.finditer(window):
+            if match.start() >= limit:
+                # The rest is scanned again with the next chunk
+                yield from matches
+                window = window[match.start():]
+                break
+            matches.append(match)
+
+
+def _project_matches(path: str, token, sizes: Optional[List[int]] = None) -> Iterator[Iterator[Any]]:
+    """
+    The matches of token in a project file (.xml or .xml.gz), or in each file of
+    a composite project: one iterator per file, read before asking for the next.
+    The byte size of each file is added to sizes.
+    """
+    if sizes is None:
+        sizes = []
+    if is_zip_path(path):
+        raise ValueError(f"{path} is an archive; take the inventory of each of its projects "
+                         f"with take_archive_inventories")
+    if is_composite_project(path):
+        paths = list(_composite_files(path))
+    elif is_gzip_path(path):
+        with gzip.open(path, 'rb') as stream:
+            yield _stream_matches(stream, token, sizes)
+        return
+    else:
+        paths = [path]
+    for file_path in paths:
+        buffer = open_project_buffer(file_path)
+        try:
+            sizes.append(len(buffer))
+            yield token.finditer(buffer)
+        finally:
+            buffer.close()
+
+
+def take_inventory(path: str) -> ProjectInventory:
+    """
+    Inventory a project file (.xml or .xml.gz) or composite project directory
+    with a single scan of its bytes; no XML tree is built and nothing is converted
+    """
+    inventory = ProjectInventory(path)
+    sizes = []
+    for matches in _project_matches(path, _INVENTORY_TOKEN, sizes):
+        inventory.scan(matches)
+    inventory.input_bytes = sum(sizes)
+    return inventory
+
+
+def take_archive_inventories(zip_path: str) -> List[ProjectInventory]:
+    """take_inventory of each project in a zip archive, in one pass over the archive"""
+    inventories = []
+    for name, stream in iter_archive_projects(zip_path):
+        inventory = ProjectInventory(os.path.join(zip_path, name))
+        sizes = []
+        inventory.scan(_stream_matches(stream, _INVENTORY_TOKEN, sizes))
+        inventory.input_bytes = sum(sizes)
+        inventories.append(inventory)
+    return inventories
+
+
+def _tag_attributes(match) -> Dict[str, str]:
+    return start_tag_attributes(match.string, ElementSpan(match.start(), match.end(), match.end()))
+
+
+def _step_attributes(attributes: bytes) -> Dict[str, str]:
+    """The attributes ProjectFilter.keeps_step reads, without decoding the rest"""
+    type_match = _TYPE_ATTRIBUTE.search(attributes)
+    step_attributes = {'type': type_match.group(1).decode('utf-8') if type_match else ''}
+    if _DISABLED_ATTRIBUTE.search(attributes):
+        step_attributes['disabled'] = 'true'
+    return step_attributes
+
+
+def count_steps(path: str, project_filter: Optional[ProjectFilter] = None) -> int:
+    """
+    Count the test steps a conversion of the project will visit, honouring
+    project_filter, with one scan of its bytes. In composite projects test
+    case files do not name their suite, so suite patterns are not applied.
+    """
+    if project_filter is None:
+        project_filter = ProjectFilter()
+    check_steps = bool(project_filter.include_step_types or project_filter.exclude_step_types)
+    count = 0
+    for matches in _project_matches(path, _STEP_COUNT_TOKEN):
+        keep_suite = keep_case = True
+        for match in matches:
+            kind = match.lastgroup
+            if kind == 'step':
+                if not (keep_suite and keep_case):
+                    continue
+                if check_steps:
+                    count += project_filter.keeps_step(_step_attributes(match.group('step')))
+                elif not (project_filter.skip_disabled and _DISABLED_ATTRIBUTE.search(match.group('step'))):
+                    count += 1
+            elif kind == 'case':
+                keep_case = not project_filter.cases or project_filter.keeps_case(
+                    _tag_attributes(match).get('name', ''))
+            elif kind == 'suite':
+                keep_suite = not project_filter.suites or project_filter.keeps_suite(
+                    _tag_attributes(match).get('name', ''))
+    return count
+
+
+def scan_test_case_runs(path: str, project_filter: Optional[ProjectFilter] = None
+                        ) -> Optional[Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]]:
+    """
+    Find the test cases that other test cases run, with one scan of the
+    project's bytes, honouring project_filter. Returns the run-test-case
+    markers convert_test_case would record, with Run TestCase targets
+    resolved by id, and the (suite name, case name) of every test case kept,
+    in project order. Returns None for a composite project, whose test case
+    files do not name their suite.
+    """
+    if is_composite_project(path):
+        return None
+    if project_filter is None:
+        # Like the parser without a filter, disabled steps are kept
+        project_filter = ProjectFilter(skip_disabled=False)
+    check_steps = bool(project_filter.include_step_types or project_filter.exclude_step_types)
+    test_cases = []
+    test_case_ids = {}
+    # (caller, step name, target id or (suite name, case name)) in conversion order
+    runs = []
+    for matches in _project_matches(path, _TEST_CASE_RUN_TOKEN):
+        suite_name = case = case_id = step = None
+        for match in matches:
+            kind = match.lastgroup
+            if kind == 'suite':
+                name = _tag_attributes(match).get('name', '')
+                suite_name = name if project_filter.keeps_suite(name) else None
+                case = None
+            elif kind == 'case':
+                attributes = _tag_attributes(match)
+                case = None
+                if suite_name is not None and project_filter.keeps_case(attributes.get('name', '')):
+                    case = (suite_name, attributes.get('name', ''))
+                    case_id = attributes.get('id')
+            elif kind == 'step':
+                step = None
+                if case is None:
+                    continue
+                step_attributes = _step_attributes(match.group('step'))
+                if check_steps:
+                    if not project_filter.keeps_step(step_attributes):
+                        continue
+                elif project_filter.skip_disabled and 'disabled' in step_attributes:
+                    continue
+                # Like the parser, only test cases with steps are kept
+                if not test_cases or test_cases[-1] is not case:
+                    test_cases.append(case)
+                    if case_id:
+                        test_case_ids[case_id] = case
+                step_type = step_attributes['type'].lower()
+                if (step_type in RUN_TEST_CASE_TYPES or step_type == 'groovy') and not match.group('step').endswith(b'/'):
+                    # The start tag, read for the step name only if the step runs a test case
+                    step = (step_type, match)
+            elif kind == 'step_end':
+                step = None
+            elif kind == 'target':
+                if step is not None and step[0] in RUN_TEST_CASE_TYPES:
+                    runs.append((case, _tag_attributes(step[1]).get('name', ''),
+                                 match.group('target').decode('utf-8').strip()))
+                    step = None
+            elif kind == 'script':
+                if step is not None and step[0] == 'groovy':
+                    script = match.group('script').strip()
+                    if script.startswith(_CDATA_START) and script.endswith(_CDATA_END):
+                        script = script[len(_CDATA_START):-len(_CDATA_END)].decode('utf-8')
+                    else:
+                        script = html.unescape(script.decode('utf-8'))
+                    for target in groovy_test_case_references(script, case[0]):
+                        if target != case:
+                            runs.append((case, _tag_attributes(step[1]).get('name', ''), target))
+                    step = None
+
+    markers = []
+    for caller, step_name, target in runs:
+        # convert_test_case skips these steps by name
+        if step_name.lower() in ("cardnumber", "env"):
+            continue
+        if isinstance(target, str):
+            if target not in test_case_ids:
+                continue
+            target = test_case_ids[target]
+        markers.append({**run_test_case_marker(step_name, target), "test_suite": caller[0], "test_case": caller[1]})
+    return markers, test_cases
+
+
+# Example usage
+if __name__ == '__main__':
+    import sys
+
+    for project_path in sys.argv[1:]:
+        print(take_inventory(project_path).format_report())
@@ -0,0 +1,122 @@
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, Optional
+from readyapi_project_parser import PARSER_VERSION, ReadyAPIProject, parse_project_file
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = '.snapshot'
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class ProjectSnapshotCache:
+    """
+    On-disk cache of parsed ReadyAPIProject models.
+
+    Snapshots are keyed by a hash of the project file's content, the parser
+    version and any parse options, so an unchanged input is never re-parsed.
+    Storing a snapshot replaces older snapshots of the same source file, and
+    the least recently used snapshots are evicted once the cache grows past
+    max_entries or max_bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 32, max_bytes: int = 1 << 30):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key_for(self, xml_path: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Content hash of the project file, the parser version and the parse options"""
+        digest = hashlib.sha256()
+        digest.update(f"parser-v{PARSER_VERSION};{sorted((options or {}).items())!r};".encode('utf-8'))
+        with open(xml_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _source_prefix(self, xml_path: str) -> str:
+        return hashlib.sha256(os.path.abspath(xml_path).encode('utf-8')).hexdigest()[:16]
+
+    def _snapshot_path(self, xml_path: str, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{self._source_prefix(xml_path)}-{key}{SNAPSHOT_SUFFIX}")
+
+    def load(self, xml_path: str, key: str) -> Optional[ReadyAPIProject]:
+        """Return the cached project for key, or None on a miss"""
+        path = self._snapshot_path(xml_path, key)
+        try:
+            with open(path, 'rb') as f:
+                project = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable snapshot {path}: {str(e)}")
+            self._remove(path)
+            return None
+        os.utime(path)  # Mark as recently used
+        return project
+
+    def store(self, xml_path: str, key: str, project: ReadyAPIProject) -> None:
+        """Write a snapshot atomically, then drop stale snapshots and enforce the size bounds"""
+        path = self._snapshot_path(xml_path, key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(project, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        prefix = self._source_prefix(xml_path) + '-'
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(prefix) and entry.path != path:
+                self._remove(entry.path)
+        self._evict()
+
+    def _evict(self) -> None:
+        snapshots = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(SNAPSHOT_SUFFIX):
+                stat = entry.stat()
+                snapshots.append((stat.st_mtime, stat.st_size, entry.path))
+        snapshots.sort(reverse=True)  # Most recently used first
+
+        total = 0
+        for index, (_, size, path) in enumerate(snapshots):
+            total += size
+            if index >= self.max_entries or total > self.max_bytes:
+                self._remove(path)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def parse_project_file_cached(xml_path: str, cache_dir: str, max_entries: int = 32, **parse_options) -> ReadyAPIProject:
+    """
+    parse_project_file backed by a ProjectSnapshotCache in cache_dir.
+
+    Options that change the parsed model (such as filters) are part of the key;
+    options that only change how it is parsed (workers, lazy_configs) are not.
+    """
+    cache = ProjectSnapshotCache(cache_dir, max_entries=max_entries)
+    model_options = {k: v for k, v in parse_options.items() if k not in ('workers', 'lazy_configs')}
+    key = cache.key_for(xml_path, model_options)
+
+    project = cache.load(xml_path, key)
+    if project is not None:
+        logger.info(f"Loaded parsed project from snapshot cache: {xml_path}")
+        return project
+
+    project = parse_project_file(xml_path, **parse_options)
+    try:
+        cache.store(xml_path, key, project)
+    except OSError as e:
+        logger.warning(f"Could not write project snapshot to {cache_dir}: {str(e)}")
+    return project
@@ -1,156 +1,1067 @@
+import io
 import os
+import re
+import json
+import sys
+import gzip
+import fnmatch
+import zlib
+import logging
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+from readyapi_xml_scanner import (
+    ElementSpan,
+    FragmentWrapper,
+    feed_skeleton,
+    feed_with_elisions,
+    open_project_buffer,
+    read_fragment_wrapper,
+    scan_element_spans,
+    start_tag_attributes,
+)
+from project_archives import is_gzip_data, is_gzip_path, open_project_stream
+
+logger = logging.getLogger(__name__)
+
+NAMESPACES = {
+    'con': 'http://eviware.com/soapui/config',
+    'ns2': 'http://eviware.com/soapui/config/2.0'
+}
+
+# Bump whenever parsing or the model changes, so cached snapshots of parsed projects are invalidated
+PARSER_VERSION = 6
+
+STEP_TAG = 'con:testStep'
+CASE_TAG = 'con:testCase'
+SUITE_TAG = 'con:testSuite'
+
+_XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
+
+_REST_MOCK_SERVICE_TAG = '{%s}restMockService' % NAMESPACES['con']
+_MOCK_SERVICE_TAGS = ('{%s}mockService' % NAMESPACES['con'], _REST_MOCK_SERVICE_TAG)
+
+# Configs at least this large (in UTF-8 bytes) are kept zlib-compressed until first use
+CONFIG_COMPRESS_THRESHOLD = 512
+
+# How a step config is held in ReadyAPITestStep._config_kind
+_CONFIG_MATERIALIZED = 0
+_CONFIG_TEXT = 1
+_CONFIG_ELEMENT = 2
+_CONFIG_COMPRESSED = 4
+_CONFIG_DEFERRED = 8
+
+# Steps whose bytes contain these are always parsed in full, because their
+# properties feed the case- and project-level property maps
+_PROPERTY_MARKER = b'<con:propert'
+_CONFIG_OPEN = re.compile(rb'<con:config[\s/>]')
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern names and types that repeat across thousands of steps"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _config_value(config: ET.Element) -> Union[str, ET.Element]:
+    """A <con:config> element as kept on a step: serialized if it has children, else the Element"""
+    config_str = ET.tostring(config, encoding='unicode') if len(config) > 0 else None
+    return config_str if config_str else config
+
+
+class StepConfigRef:
+    """
+    Reference to a <con:testStep> inside a memory-mapped project file. The
+    step's config is only decoded and parsed when load() is called.
+    """
+    __slots__ = ('buffer', 'span', 'wrapper')
+
+    def __init__(self, buffer, span: ElementSpan, wrapper: FragmentWrapper):
+        self.buffer = buffer
+        self.span = span
+        self.wrapper = wrapper
+
+    def load(self) -> Union[str, ET.Element, None]:
+        fragment = self.wrapper.wrap(self.buffer[self.span.start:self.span.end])
+        step = ET.fromstring(fragment)[0]
+        config = step.find('.//con:config', NAMESPACES)
+        return _config_value(config) if config is not None else None
+
+
+def _pack_config(config: Union[str, ET.Element, StepConfigRef, None]):
+    """Pack a step config into compact bytes, returning (data, kind)"""
+    if config is None or isinstance(config, bytes):
+        return config, _CONFIG_MATERIALIZED
+    if isinstance(config, StepConfigRef):
+        return config, _CONFIG_DEFERRED
+    if isinstance(config, ET.Element):
+        data = ET.tostring(config, encoding='unicode').encode('utf-8')
+        kind = _CONFIG_ELEMENT
+    else:
+        data = config.encode('utf-8')
+        kind = _CONFIG_TEXT
+    if len(data) >= CONFIG_COMPRESS_THRESHOLD:
+        data = zlib.compress(data, 1)
+        kind |= _CONFIG_COMPRESSED
+    return data, kind
+
+
+def _unpack_config(data, kind: int) -> Union[str, ET.Element, None]:
+    """Inverse of _pack_config"""
+    if kind & _CONFIG_DEFERRED:
+        return data.load()
+    if kind & _CONFIG_COMPRESSED:
+        data = zlib.decompress(data)
+    if kind & _CONFIG_ELEMENT:
+        return ET.fromstring(data)
+    return data.decode('utf-8')
+
 
 class ReadyAPIInterface:
-    def __init__(self, name, path, method, endpoint, media_type, headers=None, body=None, description=None):
-        self.name = name
-        self.path = path
-        self.method = method
-        self.endpoint = endpoint
-        self.media_type = media_type
+    """
+    One request of a REST resource method. service names the interface and
+    definition is its OpenAPI or Swagger document as compact JSON, shared by
+    every request of the interface, or None.
+    """
+    __slots__ = ('name', 'path', 'method', 'endpoint', 'media_type', 'headers', 'body', 'description',
+                 'service', 'definition')
+
+    def __init__(self, name, path, method, endpoint, media_type, headers=None, body=None, description=None,
+                 service=None, definition=None):
+        self.name = _intern(name)
+        self.path = _intern(path)
+        self.method = _intern(method)
+        self.endpoint = _intern(endpoint)
+        self.media_type = _intern(media_type)
         self.headers = headers or {}
         self.body = body or ""
         self.description = description or ""
+        self.service = _intern(service)
+        self.definition = definition
 
 class ReadyAPITestStep:
-    def __init__(self, step_type, name, config):
-        self.step_type = step_type
-        self.name = name
+    """
+    A single test step. The config is held as compact (optionally compressed)
+    UTF-8 bytes, or as a StepConfigRef into the project file, and only turned
+    into a string or Element on first access.
+    """
+    __slots__ = ('step_type', 'name', 'properties', '_config', '_config_kind')
+
+    def __init__(self, step_type, name, config, properties: Optional[Dict[str, str]] = None):
+        self.step_type = _intern(step_type)
+        self.name = _intern(name)
+        self.properties = properties
         self.config = config
 
+    @property
+    def config(self) -> Union[str, ET.Element, None]:
+        if self._config_kind != _CONFIG_MATERIALIZED:
+            self._config = _unpack_config(self._config, self._config_kind)
+            self._config_kind = _CONFIG_MATERIALIZED
+        return self._config
+
+    @config.setter
+    def config(self, value: Union[str, ET.Element, StepConfigRef, None]):
+        self._config, self._config_kind = _pack_config(value)
+
+    def __getstate__(self):
+        # File references cannot cross process boundaries, so they are packed as bytes
+        data, kind = self._config, self._config_kind
+        if kind & _CONFIG_DEFERRED:
+            data, kind = _pack_config(data.load())
+        return (self.step_type, self.name, self.properties, data, kind)
+
+    def __setstate__(self, state):
+        step_type, name, self.properties, self._config, self._config_kind = state
+        self.step_type = _intern(step_type)
+        self.name = _intern(name)
+
+class ReadyAPILoadTest:
+    """
+    A LoadTest of a test case, as the text ReadyAPI stores: its settings
+    (threadCount, testLimit, limitType, ...), its load strategy type and
+    settings, and its assertions as (type, name, settings) tuples.
+    """
+    __slots__ = ('name', 'settings', 'strategy', 'strategy_settings', 'assertions')
+
+    def __init__(self, name, settings: Dict[str, str], strategy: str, strategy_settings: Dict[str, str],
+                 assertions: List[Tuple[str, str, Dict[str, str]]]):
+        self.name = _intern(name)
+        self.settings = settings
+        self.strategy = _intern(strategy)
+        self.strategy_settings = strategy_settings
+        self.assertions = assertions
+
 class ReadyAPITestCase:
-    def __init__(self, name):
-        self.name = name
+    """
+    A test case. id is ReadyAPI's id for it, which Run TestCase steps use to
+    name the case they run.
+    """
+    __slots__ = ('name', 'id', 'test_steps', 'properties', 'load_tests')
+
+    def __init__(self, name, case_id=''):
+        self.name = _intern(name)
+        self.id = case_id
         self.test_steps: List[ReadyAPITestStep] = []
         self.properties: Dict[str, str] = {}
+        self.load_tests: List[ReadyAPILoadTest] = []
 
 class ReadyAPITestSuite:
+    __slots__ = ('name', 'test_cases', 'resources')
+
     def __init__(self, name):
-        self.name = name
+        self.name = _intern(name)
         self.test_cases: List[ReadyAPITestCase] = []
         self.resources: List[ReadyAPIInterface] = []
 
+class ReadyAPIMockOperation:
+    """
+    One operation of a MockService: the REST method and resource path, or the
+    SOAP operation name with method and path None, how ReadyAPI picks among its
+    responses, and the responses as dicts of name, status, media_type, headers
+    and body.
+    """
+    __slots__ = ('name', 'method', 'path', 'dispatch_style', 'default_response', 'responses')
+
+    def __init__(self, name, method, path, dispatch_style: str, default_response: str,
+                 responses: List[Dict[str, Any]]):
+        self.name = _intern(name)
+        self.method = _intern(method)
+        self.path = path
+        self.dispatch_style = _intern(dispatch_style)
+        self.default_response = default_response
+        self.responses = responses
+
+class ReadyAPIMockService:
+    """A REST or SOAP MockService (kind 'rest' or 'soap') and the port and path it listens on"""
+    __slots__ = ('name', 'kind', 'port', 'path', 'operations')
+
+    def __init__(self, name, kind: str, port: int, path: str):
+        self.name = _intern(name)
+        self.kind = kind
+        self.port = port
+        self.path = path
+        self.operations: List[ReadyAPIMockOperation] = []
+
 class ReadyAPIProject:
+    """
+    A parsed project. A project parsed with lazy configs holds the memory map
+    its steps' configs are read from until close() is called; configs not yet
+    read cannot be read after that.
+    """
+    __slots__ = ('name', 'interfaces', 'test_suites', 'properties', 'mock_services', 'buffer')
+
     def __init__(self, name):
-        self.name = name
+        self.name = _intern(name)
         self.interfaces: List[ReadyAPIInterface] = []
         self.test_suites: List[ReadyAPITestSuite] = []
         self.properties: Dict[str, str] = {}
+        self.mock_services: List[ReadyAPIMockService] = []
+        self.buffer = None
+
+    def close(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # The memory map stays with this process; pickled steps carry their configs as bytes
+        return (self.name, self.interfaces, self.test_suites, self.properties, self.mock_services)
+
+    def __setstate__(self, state):
+        self.name, self.interfaces, self.test_suites, self.properties, self.mock_services = state
+        self.buffer = None
+
+
+def _step_type_of(attrs: Dict[str, str]) -> str:
+    """Step type from a <con:testStep>'s attributes; ReadyAPI writes it to the plain 'type' attribute"""
+    return attrs.get(_XSI_TYPE) or attrs.get('xsi:type') or attrs.get('type', '')
+
+
+def _compile_name_pattern(pattern: str):
+    """A glob, or a regular expression when prefixed with 're:'; either must match the whole name"""
+    if pattern.startswith('re:'):
+        return re.compile(pattern[3:])
+    return re.compile(fnmatch.translate(pattern))
 
 
-def parse_project_file(xml_path: str) -> ReadyAPIProject:
-    """Parse a ReadyAPI project XML file and return a ReadyAPIProject object"""
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
+class ProjectFilter:
+    """
+    Selects the suites, cases and steps to parse.
+
+    Suite and case patterns match names; step type patterns match lower-cased
+    types such as 'restrequest' or 'groovy'. Patterns are globs, or regular
+    expressions when prefixed with 're:'. Steps marked disabled="true" are
+    dropped unless skip_disabled is False.
+    """
+    __slots__ = ('suites', 'cases', 'include_step_types', 'exclude_step_types', 'skip_disabled', '_patterns')
+
+    def __init__(self, suites: Optional[List[str]] = None, cases: Optional[List[str]] = None,
+                 include_step_types: Optional[List[str]] = None, exclude_step_types: Optional[List[str]] = None,
+                 skip_disabled: bool = True):
+        self.suites = tuple(suites or ())
+        self.cases = tuple(cases or ())
+        self.include_step_types = tuple(p.lower() for p in include_step_types or ())
+        self.exclude_step_types = tuple(p.lower() for p in exclude_step_types or ())
+        self.skip_disabled = skip_disabled
+        self._patterns = {
+            field: [_compile_name_pattern(p) for p in getattr(self, field)]
+            for field in ('suites', 'cases', 'include_step_types', 'exclude_step_types')
+        }
+
+    @property
+    def selective(self) -> bool:
+        """Whether any name or step type patterns were given"""
+        return bool(self.suites or self.cases or self.include_step_types or self.exclude_step_types)
+
+    @property
+    def active(self) -> bool:
+        return self.selective or self.skip_disabled
+
+    def _matches(self, field: str, name: str) -> bool:
+        return any(pattern.fullmatch(name) for pattern in self._patterns[field])
+
+    def keeps_suite(self, name: str) -> bool:
+        return not self.suites or self._matches('suites', name)
+
+    def keeps_case(self, name: str) -> bool:
+        return not self.cases or self._matches('cases', name)
+
+    def keeps_step(self, attrs: Dict[str, str]) -> bool:
+        if self.skip_disabled and attrs.get('disabled') == 'true':
+            return False
+        step_type = _step_type_of(attrs).replace('con:', '').lower()
+        if self.include_step_types and not self._matches('include_step_types', step_type):
+            return False
+        return not self._matches('exclude_step_types', step_type)
+
+    def __repr__(self):
+        # Stable, so it can be part of snapshot cache keys
+        return (f"ProjectFilter(suites={self.suites!r}, cases={self.cases!r}, "
+                f"include_step_types={self.include_step_types!r}, "
+                f"exclude_step_types={self.exclude_step_types!r}, skip_disabled={self.skip_disabled!r})")
+
+
+def _prune(root: ET.Element, project_filter: ProjectFilter) -> None:
+    """Remove the suites, cases and steps rejected by project_filter from a parsed tree"""
+    con = '{%s}' % NAMESPACES['con']
+    checks = {
+        con + 'testSuite': lambda el: project_filter.keeps_suite(el.get('name', '')),
+        con + 'testCase': lambda el: project_filter.keeps_case(el.get('name', '')),
+        con + 'testStep': lambda el: project_filter.keeps_step(el.attrib),
+    }
+    removals = [(parent, child) for parent in root.iter() for child in parent
+                if child.tag in checks and not checks[child.tag](child)]
+    for parent, child in removals:
+        parent.remove(child)
+
+
+def _leaf_texts(element: Optional[ET.Element]) -> Dict[str, str]:
+    """The text of element's children without children of their own, by local tag name"""
+    if element is None:
+        return {}
+    return {child.tag.rpartition('}')[2]: (child.text or '').strip() for child in element if not len(child)}
+
+
+def _parse_load_test(load_test: ET.Element, namespaces: Dict[str, str]) -> ReadyAPILoadTest:
+    strategy = load_test.find('con:loadStrategy', namespaces)
+    strategy_type = strategy.find('con:type', namespaces) if strategy is not None else None
+    return ReadyAPILoadTest(
+        load_test.attrib.get('name', ''),
+        _leaf_texts(load_test),
+        (strategy_type.text or '').strip() if strategy_type is not None else 'Simple',
+        _leaf_texts(strategy.find('con:config', namespaces)) if strategy is not None else {},
+        [(assertion.attrib.get('type', ''), assertion.attrib.get('name', ''),
+          _leaf_texts(assertion.find('con:configuration', namespaces)))
+         for assertion in load_test.findall('con:assertion', namespaces)]
+    )
+
+
+def _parse_mock_response(response: ET.Element, namespaces: Dict[str, str]) -> Dict[str, Any]:
+    headers = []
+    for header in response.findall('con:header', namespaces):
+        name = header.findtext('con:name', default='', namespaces=namespaces)
+        if name:
+            headers.append((name, header.findtext('con:value', default='', namespaces=namespaces)))
+    return {
+        "name": response.attrib.get('name', ''),
+        "status": response.attrib.get('httpResponseStatus', '200'),
+        "media_type": response.attrib.get('mediaType'),
+        "headers": headers,
+        "body": response.findtext('con:responseContent', default='', namespaces=namespaces),
+    }
+
+
+def _parse_mock_service(service: ET.Element, namespaces: Dict[str, str]) -> ReadyAPIMockService:
+    """Build a ReadyAPIMockService from a <con:mockService> or <con:restMockService> element"""
+    rest = service.tag == _REST_MOCK_SERVICE_TAG
+    port = service.attrib.get('port', '')
+    mock_service = ReadyAPIMockService(service.attrib.get('name', ''), 'rest' if rest else 'soap',
+                                       int(port) if port.isdigit() else 8080, service.attrib.get('path', '/'))
+    for operation in service.findall('con:restMockAction' if rest else 'con:mockOperation', namespaces):
+        name = operation.attrib.get('name', '')
+        mock_service.operations.append(ReadyAPIMockOperation(
+            name if rest else operation.attrib.get('operation', name),
+            operation.attrib.get('method', 'GET') if rest else None,
+            operation.attrib.get('resourcePath', operation.attrib.get('name', '')) if rest else None,
+            operation.findtext('con:dispatchStyle', default='SEQUENCE', namespaces=namespaces),
+            operation.findtext('con:defaultResponse', default='', namespaces=namespaces),
+            [_parse_mock_response(response, namespaces) for response in operation.findall('con:response', namespaces)]
+        ))
+    return mock_service
+
+
+def _parse_test_suite(suite: ET.Element, namespaces: Dict[str, str], deferred=None) -> Optional[ReadyAPITestSuite]:
+    """Build a ReadyAPITestSuite from a <con:testSuite> element, or None if it has no cases with steps"""
+    deferred = deferred or {}
+    test_suite = ReadyAPITestSuite(suite.attrib.get('name', ''))
     
+    # Parse test cases
+    for case in suite.findall('.//con:testCase', namespaces):
+        test_case = ReadyAPITestCase(case.attrib.get('name', ''), case.attrib.get('id', ''))
+        
+        # Parse test case properties
+        for prop in case.findall('.//con:properties/con:property', namespaces):
+            name = prop.find('con:name', namespaces)
+            value = prop.find('con:value', namespaces)
+            if name is not None and value is not None:
+                test_case.properties[name.text] = value.text or ''
+
+        test_case.load_tests = [_parse_load_test(load_test, namespaces)
+                                for load_test in case.findall('con:loadTest', namespaces)]
+        
+        # Parse test steps
+        for step in case.findall('.//con:testStep', namespaces):
+            step_type = _step_type_of(step.attrib)
+            step_name = step.attrib.get('name', '')
+
+            # Steps elided from a lazy parse keep a reference to their bytes
+            if step in deferred:
+                if deferred[step] is not None:
+                    test_case.test_steps.append(ReadyAPITestStep(
+                        step_type=step_type.replace('con:', ''),
+                        name=step_name,
+                        config=deferred[step]
+                    ))
+                continue
+            
+            # Get the config element
+            config = step.find('.//con:config', namespaces)
+            if config is not None:
+                # Collect properties if this is a properties step
+                step_properties = None
+                if step_type == 'con:PropertiesStep':
+                    step_properties = {}
+                    for prop in config.findall('.//con:property', namespaces):
+                        name = prop.find('con:name', namespaces)
+                        value = prop.find('con:value', namespaces)
+                        if name is not None and value is not None:
+                            step_properties[name.text] = value.text or ''
+
+                # Create test step
+                test_step = ReadyAPITestStep(
+                    step_type=step_type.replace('con:', ''),  # Remove namespace prefix
+                    name=step_name,
+                    config=_config_value(config),  # Serialized if it has content
+                    properties=step_properties
+                )
+                
+                test_case.test_steps.append(test_step)
+        
+        if test_case.test_steps:  # Only add test cases that have steps
+            test_suite.test_cases.append(test_case)
+    
+    if test_suite.test_cases:  # Only add test suites that have cases
+        return test_suite
+    return None
+
+
+def _property_pairs(root: ET.Element, namespaces: Dict[str, str], parsed_suites=None) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (name, value) for every .//con:properties/con:property in document order,
+    splicing in the properties of suites parsed by workers at the suite's position.
+    """
+    if parsed_suites:
+        properties_tag = '{%s}properties' % namespaces['con']
+        for element in root.iter():
+            if element in parsed_suites:
+                yield from parsed_suites[element][1]
+            elif element.tag == properties_tag:
+                yield from _property_pairs_of(element.findall('con:property', namespaces), namespaces)
+        return
+    yield from _property_pairs_of(root.findall('.//con:properties/con:property', namespaces), namespaces)
+
+
+def _property_pairs_of(properties, namespaces: Dict[str, str]) -> Iterator[Tuple[str, str]]:
+    for prop in properties:
+        name = prop.find('con:name', namespaces)
+        value = prop.find('con:value', namespaces)
+        if name is not None and value is not None:
+            yield name.text, value.text or ''
+
+
+def _parse_suite_range(xml_path: str, start: int, end: int, wrapper: FragmentWrapper,
+                       project_filter: Optional[ProjectFilter] = None):
+    """
+    Worker entry point: parse one <con:testSuite> byte range of a project file.
+
+    Returns the suite model (or None) and the suite's nested property pairs.
+    """
+    with open(xml_path, 'rb') as f:
+        f.seek(start)
+        fragment = f.read(end - start)
+    root = ET.fromstring(wrapper.wrap(fragment))
+    if project_filter is not None:
+        _prune(root, project_filter)
+    return _parse_test_suite(root[0], NAMESPACES), list(_property_pairs(root, NAMESPACES))
+
+
+def _parse_parallel(xml_path: str, workers: int, project_filter: Optional[ProjectFilter] = None) -> ReadyAPIProject:
+    """
+    Parse a project with one worker process per test suite.
+
+    The parent pre-scans the suites' byte ranges and parses everything else
+    (project properties, interfaces) once; workers return compact suite models
+    that are merged back in document order. Suites rejected by project_filter
+    are never sent to a worker.
+    """
+    buffer = open_project_buffer(xml_path)
+    try:
+        wrapper = read_fragment_wrapper(buffer)
+        spans = scan_element_spans(buffer, SUITE_TAG)
+        if len(spans) < 2:
+            raise ValueError(f"{len(spans)} test suite(s), nothing to split")
+        kept = [project_filter is None or project_filter.keeps_suite(start_tag_attributes(buffer, span).get('name', ''))
+                for span in spans]
+        parser = ET.XMLParser()
+        feed_skeleton(parser, buffer, spans, SUITE_TAG)
+        root = parser.close()
+    finally:
+        buffer.close()
+
+    placeholders = list(root.iter('{%s}testSuite' % NAMESPACES['con']))
+    if len(placeholders) != len(spans):
+        raise ValueError(f"Scanned {len(spans)} test suites but parsed {len(placeholders)}")
+
+    parsed_suites = {placeholder: (None, []) for placeholder in placeholders}
+    jobs = [(placeholder, span) for placeholder, span, keep in zip(placeholders, spans, kept) if keep]
+    if jobs:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = pool.map(_parse_suite_range, repeat(xml_path),
+                               [span.start for _, span in jobs], [span.end for _, span in jobs],
+                               repeat(wrapper), repeat(project_filter))
+            parsed_suites.update(zip([placeholder for placeholder, _ in jobs], results))
+
+    return _build_project(root, parsed_suites=parsed_suites)
+
+
+# Files of a composite (directory-format) project: each directory holds a
+# settings.xml for its own element and an element.order listing its children
+COMPOSITE_SETTINGS_FILE = 'settings.xml'
+COMPOSITE_ORDER_FILE = 'element.order'
+
+
+def is_composite_project(path: str) -> bool:
+    """Whether path is a composite project: a directory with a settings.xml project root"""
+    return os.path.isdir(path) and os.path.isfile(os.path.join(path, COMPOSITE_SETTINGS_FILE))
+
+
+def _composite_entries(directory: str) -> List[str]:
+    """A composite directory's children in element.order order, then any unlisted ones by name"""
+    names = sorted(name for name in os.listdir(directory)
+                   if name not in (COMPOSITE_SETTINGS_FILE, COMPOSITE_ORDER_FILE) and not name.startswith('.'))
+    order_path = os.path.join(directory, COMPOSITE_ORDER_FILE)
+    if not os.path.isfile(order_path):
+        return names
+    with open(order_path, encoding='utf-8') as f:
+        ordered = [line.strip() for line in f if line.strip()]
+    listed = set(ordered)
+    present = set(names)
+    return [name for name in ordered if name in present] + [name for name in names if name not in listed]
+
+
+def _composite_layout(project_dir: str, project_filter: Optional[ProjectFilter]):
+    """
+    Read the settings files of a composite project. Returns the project root
+    element, the interface files, and (name, property pairs, case files) for
+    every suite kept by project_filter, all in project order.
+    """
+    root = ET.parse(os.path.join(project_dir, COMPOSITE_SETTINGS_FILE)).getroot()
+    interface_files = []
+    suites = []
+    for name in _composite_entries(project_dir):
+        path = os.path.join(project_dir, name)
+        if os.path.isdir(path):
+            settings_path = os.path.join(path, COMPOSITE_SETTINGS_FILE)
+            if not os.path.isfile(settings_path):
+                continue
+            suite_root = ET.parse(settings_path).getroot()
+            suite_name = suite_root.attrib.get('name', '')
+            if project_filter is not None and not project_filter.keeps_suite(suite_name):
+                continue
+            case_files = [os.path.join(path, case_name) for case_name in _composite_entries(path)
+                          if case_name.lower().endswith('.xml')]
+            suites.append((suite_name, list(_property_pairs(suite_root, NAMESPACES)), case_files))
+        elif name.lower().endswith('.xml'):
+            interface_files.append(path)
+    return root, interface_files, suites
+
+
+def _parse_interface_file(path: str) -> List[ReadyAPIInterface]:
+    """Worker entry point: parse one interface file of a composite project"""
+    return _parse_interface(ET.parse(path).getroot(), NAMESPACES)
+
+
+def _parse_case_file(path: str, suite_name: str, project_filter: Optional[ProjectFilter] = None):
+    """
+    Worker entry point: parse one test case file of a composite project.
+
+    Returns the case model (or None) and the case's nested property pairs.
+    """
+    suite = ET.Element('{%s}testSuite' % NAMESPACES['con'], {'name': suite_name})
+    suite.append(ET.parse(path).getroot())
+    if project_filter is not None:
+        _prune(suite, project_filter)
+    test_suite = _parse_test_suite(suite, NAMESPACES)
+    return (test_suite.test_cases[0] if test_suite is not None else None), list(_property_pairs(suite, NAMESPACES))
+
+
+def _assemble_composite_suite(suite_name: str, suite_pairs, case_results,
+                              properties: Dict[str, str]) -> Optional[ReadyAPITestSuite]:
+    test_suite = ReadyAPITestSuite(suite_name)
+    for test_case, pairs in case_results:
+        properties.update(pairs)
+        if test_case is not None:
+            test_suite.test_cases.append(test_case)
+    properties.update(suite_pairs)
+    return test_suite if test_suite.test_cases else None
+
+
+def parse_composite_project(project_dir: str, workers: int = 1,
+                            project_filter: Optional[ProjectFilter] = None) -> ReadyAPIProject:
+    """
+    Parse a composite project directory: settings.xml for the project, one
+    XML file per interface, and one directory per test suite holding its
+    settings.xml and one XML file per test case.
+
+    With workers > 1 the interface and test case files are parsed in worker
+    processes and merged back in project order, so a large project takes
+    about as long as its largest files.
+    """
+    if project_filter is not None and not project_filter.active:
+        project_filter = None
+    root, interface_files, suites = _composite_layout(project_dir, project_filter)
+    case_files = [(suite_name, path) for suite_name, _, paths in suites for path in paths]
+
+    if workers > 1 and len(interface_files) + len(case_files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            interfaces = pool.map(_parse_interface_file, interface_files)
+            cases = pool.map(_parse_case_file, [path for _, path in case_files],
+                             [suite_name for suite_name, _ in case_files], repeat(project_filter),
+                             chunksize=max(1, len(case_files) // (workers * 4)))
+            interfaces, cases = list(interfaces), list(cases)
+    else:
+        interfaces = [_parse_interface_file(path) for path in interface_files]
+        cases = [_parse_case_file(path, suite_name, project_filter) for suite_name, path in case_files]
+
+    # Anything kept inline in settings.xml, then the separate files
+    project = _build_project(root)
+    for parsed in interfaces:
+        project.interfaces.extend(parsed)
+
+    # ReadyAPI writes project properties after the suites, so they take precedence
+    properties = {}
+    results = iter(cases)
+    for suite_name, suite_pairs, paths in suites:
+        test_suite = _assemble_composite_suite(suite_name, suite_pairs, [next(results) for _ in paths], properties)
+        if test_suite is not None:
+            project.test_suites.append(test_suite)
+    properties.update(project.properties)
+    project.properties = properties
+    return project
+
+
+def _iter_composite_project(project_dir: str, project_filter: Optional[ProjectFilter]):
+    """iter_project_file for a composite project, reading one suite directory at a time"""
+    root, interface_files, suites = _composite_layout(project_dir, project_filter)
+    project = _build_project(root)
+    for path in interface_files:
+        project.interfaces.extend(_parse_interface_file(path))
+    yield project
+
+    project_properties = dict(project.properties)
+    for suite_name, suite_pairs, paths in suites:
+        test_suite = _assemble_composite_suite(
+            suite_name, suite_pairs, [_parse_case_file(path, suite_name, project_filter) for path in paths],
+            project.properties)
+        if test_suite is not None:
+            yield test_suite
+    project.properties.update(project_properties)
+
+
+def _outside(spans: List[ElementSpan], ranges: List[Tuple[int, int, bytes]]) -> List[ElementSpan]:
+    """The spans not contained in any of the sorted, non-overlapping (start, end, _) ranges"""
+    result = []
+    index = 0
+    for span in spans:
+        while index < len(ranges) and ranges[index][1] <= span.start:
+            index += 1
+        if index < len(ranges) and ranges[index][0] <= span.start:
+            continue
+        result.append(span)
+    return result
+
+
+def _parse_buffer(xml_path: str, lazy_configs: bool, project_filter: Optional[ProjectFilter]):
+    """
+    Parse a memory-mapped project, feeding the XML parser only what is needed.
+
+    Suites, cases and steps rejected by project_filter are dropped before they
+    reach the parser, so their subtrees are never built. With lazy_configs the
+    content of the remaining test steps is elided as well.
+
+    Returns the root element, a map from each elided <con:testStep> element
+    to its StepConfigRef (or None when the step has no config), and the
+    memory map the references read from, or None if it has been closed.
+    """
+    buffer = open_project_buffer(xml_path)
+    try:
+        root, deferred = _parse_mapped(buffer, lazy_configs, project_filter)
+    except BaseException:
+        buffer.close()
+        raise
+    if not any(ref is not None for ref in deferred.values()):
+        buffer.close()
+        return root, deferred, None
+    return root, deferred, buffer
+
+
+def _parse_mapped(buffer, lazy_configs: bool, project_filter: Optional[ProjectFilter]):
+    wrapper = read_fragment_wrapper(buffer)
+    dropped = []
+
+    if project_filter is not None and project_filter.suites:
+        for span in scan_element_spans(buffer, SUITE_TAG):
+            if not project_filter.keeps_suite(start_tag_attributes(buffer, span).get('name', '')):
+                dropped.append((span.start, span.end, b''))
+    if project_filter is not None and project_filter.cases:
+        for span in _outside(scan_element_spans(buffer, CASE_TAG), dropped):
+            if not project_filter.keeps_case(start_tag_attributes(buffer, span).get('name', '')):
+                dropped.append((span.start, span.end, b''))
+        dropped.sort()
+
+    steps = _outside(scan_element_spans(buffer, STEP_TAG), dropped)
+    if project_filter is not None:
+        kept_steps = []
+        for span in steps:
+            if project_filter.keeps_step(start_tag_attributes(buffer, span)):
+                kept_steps.append(span)
+            else:
+                dropped.append((span.start, span.end, b''))
+        steps = kept_steps
+
+    elisions = list(dropped)
+    elided = set()
+    if lazy_configs:
+        close_tag = b'</' + STEP_TAG.encode('ascii') + b'>'
+        for span in steps:
+            if buffer.find(_PROPERTY_MARKER, span.start_tag_end, span.end) == -1:
+                elisions.append((span.start_tag_end, span.end, b'' if span.self_closing else close_tag))
+                elided.add(span.start)
+    elisions.sort()
+
+    parser = ET.XMLParser()
+    feed_with_elisions(parser, buffer, elisions)
+    root = parser.close()
+
+    deferred = {}
+    if lazy_configs:
+        parsed_steps = list(root.iter('{%s}testStep' % NAMESPACES['con']))
+        if len(parsed_steps) != len(steps):
+            raise ValueError(f"Scanned {len(steps)} test steps but parsed {len(parsed_steps)}")
+        for step, span in zip(parsed_steps, steps):
+            if span.start in elided:
+                has_config = _CONFIG_OPEN.search(buffer, span.start_tag_end, span.end) is not None
+                deferred[step] = StepConfigRef(buffer, span, wrapper) if has_config else None
+    return root, deferred
+
+
+def parse_project_file(xml_path: str, lazy_configs: bool = False, workers: int = 1,
+                       project_filter: Optional[ProjectFilter] = None) -> ReadyAPIProject:
+    """Parse a ReadyAPI project XML file and return a ReadyAPIProject object
+
+    With lazy_configs the file is memory-mapped and the content of each
+    <con:testStep> is skipped during parsing. Steps keep a byte-span reference
+    instead, and their config is decoded and parsed on first access.
+
+    With workers > 1 the project is split at <con:testSuite> boundaries and
+    each suite is parsed in its own worker process (lazy_configs is ignored).
+
+    Suites, cases and steps rejected by project_filter are skipped without
+    building their subtrees, and leave nothing behind in the model.
+
+    A .gz file is decompressed as it is parsed, without a copy on disk. A
+    composite project directory is parsed with parse_composite_project.
+    """
+    if project_filter is not None and not project_filter.active:
+        project_filter = None
+
+    if is_composite_project(xml_path):
+        return parse_composite_project(xml_path, workers, project_filter)
+
+    # Compressed projects are decompressed straight into the parser; the
+    # memory-mapped and parallel paths need the uncompressed bytes on disk
+    if is_gzip_path(xml_path):
+        if lazy_configs or workers > 1:
+            logger.info(f"{xml_path} is compressed; lazy configs and parse workers are not used")
+        with open_project_stream(xml_path) as f:
+            return parse_project_stream(f, project_filter)
+
+    if workers > 1:
+        try:
+            return _parse_parallel(xml_path, workers, project_filter)
+        except ValueError as e:
+            logger.warning(f"Parallel parsing unavailable for {xml_path}, parsing serially: {str(e)}")
+
+    deferred = {}
+    root = None
+    buffer = None
+    # Dropping disabled steps alone is cheaper on the parsed tree than with a byte-level pre-scan
+    if lazy_configs or (project_filter is not None and project_filter.selective):
+        try:
+            root, deferred, buffer = _parse_buffer(xml_path, lazy_configs, project_filter)
+        except (ValueError, OSError) as e:
+            logger.warning(f"Selective parsing unavailable for {xml_path}, parsing in full: {str(e)}")
+    if root is None:
+        tree = ET.parse(xml_path)
+        root = tree.getroot()
+        if project_filter is not None:
+            _prune(root, project_filter)
+
+    project = _build_project(root, deferred)
+    project.buffer = buffer
+    return project
+
+
+def parse_project_bytes(data: bytes, project_filter: Optional[ProjectFilter] = None) -> ReadyAPIProject:
+    """Parse a ReadyAPI project from the contents of its XML file, which may be gzip-compressed"""
+    if is_gzip_data(data):
+        return parse_project_stream(gzip.GzipFile(fileobj=io.BytesIO(data)), project_filter)
+    root = ET.fromstring(data)
+    if project_filter is not None and project_filter.active:
+        _prune(root, project_filter)
+    return _build_project(root)
+
+
+def parse_project_stream(f: BinaryIO, project_filter: Optional[ProjectFilter] = None) -> ReadyAPIProject:
+    """Parse a ReadyAPI project from a binary stream, e.g. a decompressing archive member"""
+    root = ET.parse(f).getroot()
+    if project_filter is not None and project_filter.active:
+        _prune(root, project_filter)
+    return _build_project(root)
+
+
+def parse_project_outline(buffer, suite_spans: List[ElementSpan]) -> ReadyAPIProject:
+    """Parse a project buffer without its test suites: the name, properties and interfaces"""
+    parser = ET.XMLParser()
+    feed_with_elisions(parser, buffer, [(span.start, span.end, b'') for span in suite_spans])
+    return _build_project(parser.close())
+
+
+def parse_suite_fragment(fragment: bytes, wrapper: FragmentWrapper,
+                         project_filter: Optional[ProjectFilter] = None) -> Optional[ReadyAPITestSuite]:
+    """
+    Parse the bytes of one <con:testSuite> element, or of a suite start tag
+    followed by some of its cases and the end tag, wrapped in the project root
+    """
+    root = ET.fromstring(wrapper.wrap(fragment))
+    if project_filter is not None and project_filter.active:
+        _prune(root, project_filter)
+    if not len(root):
+        return None
+    return _parse_test_suite(root[0], NAMESPACES)
+
+
+def iter_project_file(xml_path: str,
+                      project_filter: Optional[ProjectFilter] = None) -> Iterator[Union[ReadyAPIProject, ReadyAPITestSuite]]:
+    """
+    Parse a ReadyAPI project incrementally.
+
+    Yields the ReadyAPIProject as soon as the root start tag has been read,
+    then each ReadyAPITestSuite as soon as its end tag has been read. The
+    project's properties, interfaces and mock services fill in as parsing
+    goes on and are complete once iteration ends; its test_suites list stays
+    empty. Each top-level element is discarded once handled, so memory is
+    bounded by the largest suite rather than by the project. A .gz file is decompressed as
+    it is parsed; a composite project is read one suite directory at a time.
+    """
+    if project_filter is not None and not project_filter.active:
+        project_filter = None
+    if is_composite_project(xml_path):
+        yield from _iter_composite_project(xml_path, project_filter)
+        return
+    with open_project_stream(xml_path) as f:
+        yield from _iter_project_stream(f, project_filter)
+
+
+def _iter_project_stream(f: BinaryIO, project_filter: Optional[ProjectFilter]) -> Iterator[Union[ReadyAPIProject, ReadyAPITestSuite]]:
+    namespaces = NAMESPACES
+    suite_tag = '{%s}testSuite' % namespaces['con']
+    interface_tag = '{%s}interface' % namespaces['con']
+    properties_tag = '{%s}properties' % namespaces['con']
+
+    root = None
+    project = None
+    depth = 0
+    for event, element in ET.iterparse(f, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+                project = ReadyAPIProject(root.attrib.get('name', 'UnknownProject'))
+                yield project
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        # A direct child of the root is complete
+        test_suite = None
+        if element.tag == suite_tag and project_filter is not None:
+            if project_filter.keeps_suite(element.attrib.get('name', '')):
+                _prune(element, project_filter)
+            else:
+                element.clear()
+        if element.tag == properties_tag:
+            pairs = _property_pairs_of(element.findall('con:property', namespaces), namespaces)
+        else:
+            pairs = _property_pairs_of(element.findall('.//con:properties/con:property', namespaces), namespaces)
+        for name, value in pairs:
+            project.properties[name] = value
+
+        if element.tag == interface_tag:
+            project.interfaces.extend(_parse_interface(element, namespaces))
+        else:
+            for iface in element.findall('.//con:interface', namespaces):
+                project.interfaces.extend(_parse_interface(iface, namespaces))
+        if element.tag == suite_tag and len(element):
+            test_suite = _parse_test_suite(element, namespaces)
+        elif element.tag in _MOCK_SERVICE_TAGS:
+            project.mock_services.append(_parse_mock_service(element, namespaces))
+        root.remove(element)
+
+        if test_suite is not None:
+            yield test_suite
+
+
+def _definition_document(iface: ET.Element, namespaces: Dict[str, str]) -> Optional[str]:
+    """The interface's cached OpenAPI or Swagger document as compact JSON, if it has one in JSON"""
+    cache = iface.find('con:definitionCache', namespaces)
+    if cache is None:
+        return None
+    root_part = cache.attrib.get('rootPart')
+    for part in cache.findall('con:part', namespaces):
+        if root_part and part.findtext('con:url', '', namespaces) != root_part:
+            continue
+        try:
+            document = json.loads(part.findtext('con:content', '', namespaces) or '')
+        except ValueError:
+            # WADL, or a YAML document
+            return None
+        if isinstance(document, dict) and ('openapi' in document or 'swagger' in document):
+            return json.dumps(document, separators=(',', ':'))
+        return None
+    return None
+
+
+def _parse_interface(iface: ET.Element, namespaces: Dict[str, str]) -> List[ReadyAPIInterface]:
+    """Build a ReadyAPIInterface for every request of a REST <con:interface> element"""
+    interfaces = []
+    if iface.attrib.get('{http://www.w3.org/2001/XMLSchema-instance}type') == 'con:RestService':
+        service = iface.attrib.get('name', '')
+        definition = _definition_document(iface, namespaces)
+        for resource in iface.findall('.//con:resource', namespaces):
+            resource_name = resource.attrib.get('name', '')
+            resource_path = resource.attrib.get('path', '')
+
+            for method in resource.findall('.//con:method', namespaces):
+                method_type = method.attrib.get('method', 'GET')
+
+                for request in method.findall('.//con:request', namespaces):
+                    endpoint = request.find('.//con:endpoint', namespaces)
+                    endpoint_url = endpoint.text if endpoint is not None else ''
+                    media_type = request.attrib.get('mediaType', 'application/json')
+
+                    # Extract headers
+                    headers = {}
+                    for header in request.findall('.//con:entry', namespaces):
+                        key = header.find('con:key', namespaces)
+                        value = header.find('con:value', namespaces)
+                        if key is not None and value is not None:
+                            headers[key.text] = value.text
+
+                    # Extract request body
+                    body = request.find('.//con:request', namespaces)
+                    body_text = body.text if body is not None else ""
+
+                    # Extract description
+                    description = request.find('.//con:description', namespaces)
+                    description_text = description.text if description is not None else ""
+
+                    interface = ReadyAPIInterface(
+                        name=resource_name,
+                        path=resource_path,
+                        method=method_type,
+                        endpoint=endpoint_url,
+                        media_type=media_type,
+                        headers=headers,
+                        body=body_text,
+                        description=description_text,
+                        service=service,
+                        definition=definition
+                    )
+                    interfaces.append(interface)
+    return interfaces
+
+
+def _build_project(root: ET.Element, deferred=None, parsed_suites=None) -> ReadyAPIProject:
+    """
+    Build the project model from a parsed root element.
+
+    parsed_suites maps <con:testSuite> placeholder elements to the
+    (suite, properties) results of workers that parsed them separately.
+    """
     # Handle namespaces properly
-    namespaces = {
-        'con': 'http://eviware.com/soapui/config',
-        'ns2': 'http://eviware.com/soapui/config/2.0'
-    }
+    namespaces = NAMESPACES
     
     project_name = root.attrib.get('name', 'UnknownProject')
     project = ReadyAPIProject(project_name)
 
     # Parse properties
-    for prop in root.findall('.//con:properties/con:property', namespaces):
-        name = prop.find('con:name', namespaces)
-        value = prop.find('con:value', namespaces)
-        if name is not None and value is not None:
-            project.properties[name.text] = value.text or ''
+    for name, value in _property_pairs(root, namespaces, parsed_suites):
+        project.properties[name] = value
 
     # Parse interfaces and their resources
     for iface in root.findall('.//con:interface', namespaces):
-        if iface.attrib.get('{http://www.w3.org/2001/XMLSchema-instance}type') == 'con:RestService':
-            for resource in iface.findall('.//con:resource', namespaces):
-                resource_name = resource.attrib.get('name', '')
-                resource_path = resource.attrib.get('path', '')
-                
-                for method in resource.findall('.//con:method', namespaces):
-                    method_type = method.attrib.get('method', 'GET')
-                    
-                    for request in method.findall('.//con:request', namespaces):
-                        endpoint = request.find('.//con:endpoint', namespaces)
-                        endpoint_url = endpoint.text if endpoint is not None else ''
-                        media_type = request.attrib.get('mediaType', 'application/json')
-                        
-                        # Extract headers
-                        headers = {}
-                        for header in request.findall('.//con:entry', namespaces):
-                            key = header.find('con:key', namespaces)
-                            value = header.find('con:value', namespaces)
-                            if key is not None and value is not None:
-                                headers[key.text] = value.text
-                        
-                        # Extract request body
-                        body = request.find('.//con:request', namespaces)
-                        body_text = body.text if body is not None else ""
-                        
-                        # Extract description
-                        description = request.find('.//con:description', namespaces)
-                        description_text = description.text if description is not None else ""
-                        
-                        interface = ReadyAPIInterface(
-                            name=resource_name,
-                            path=resource_path,
-                            method=method_type,
-                            endpoint=endpoint_url,
-                            media_type=media_type,
-                            headers=headers,
-                            body=body_text,
-                            description=description_text
-                        )
-                        project.interfaces.append(interface)
-
-    # Parse test suites
+        project.interfaces.extend(_parse_interface(iface, namespaces))
+
+    project.mock_services = [_parse_mock_service(service, namespaces)
+                             for service in root if service.tag in _MOCK_SERVICE_TAGS]
+
+    # Parse test suites, unless workers already did
     for suite in root.findall('.//con:testSuite', namespaces):
-        test_suite = ReadyAPITestSuite(suite.attrib.get('name', ''))
-        
-        # Parse test cases
-        for case in suite.findall('.//con:testCase', namespaces):
-            test_case = ReadyAPITestCase(case.attrib.get('name', ''))
-            
-            # Parse test case properties
-            for prop in case.findall('.//con:properties/con:property', namespaces):
-                name = prop.find('con:name', namespaces)
-                value = prop.find('con:value', namespaces)
-                if name is not None and value is not None:
-                    test_case.properties[name.text] = value.text or ''
-            
-            # Parse test steps
-            for step in case.findall('.//con:testStep', namespaces):
-                step_type = step.attrib.get('{http://www.w3.org/2001/XMLSchema-instance}type', '')
-                step_name = step.attrib.get('name', '')
-                
-                # Get the config element
-                config = step.find('.//con:config', namespaces)
-                if config is not None:
-                    # Convert config to string if it has content
-                    config_str = ET.tostring(config, encoding='unicode') if len(config) > 0 else None
-                    
-                    # Create test step
-                    test_step = ReadyAPITestStep(
-                        step_type=step_type.replace('con:', ''),  # Remove namespace prefix
-                        name=step_name,
-                        config=config_str if config_str else config
-                    )
-                    
-                    # Add properties if this is a properties step
-                    if step_type == 'con:PropertiesStep':
-                        test_step.properties = {}
-                        for prop in config.findall('.//con:property', namespaces):
-                            name = prop.find('con:name', namespaces)
-                            value = prop.find('con:value', namespaces)
-                            if name is not None and value is not None:
-                                test_step.properties[name.text] = value.text or ''
-                    
-                    test_case.test_steps.append(test_step)
-            
-            if test_case.test_steps:  # Only add test cases that have steps
-                test_suite.test_cases.append(test_case)
-        
-        if test_suite.test_cases:  # Only add test suites that have cases
+        if parsed_suites:
+            test_suite = parsed_suites[suite][0]
+        else:
+            test_suite = _parse_test_suite(suite, namespaces, deferred)
+        if test_suite is not None:
             project.test_suites.append(test_suite)
 
     return project
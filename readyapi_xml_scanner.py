@@ -0,0 +1,168 @@
+import html
+import mmap
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Attribute values may legally contain '>' so the start tag is matched attribute by attribute
+START_TAG_BODY = rb'(?:[^>"\']|"[^"]*"|\'[^\']*\')*'
+
+# Sections whose content must never be mistaken for markup, without their leading '<'.
+# Every pattern starts with a literal '<' so the regex engine can skip ahead quickly,
+# and each body is an unrolled loop, which scans much faster than a lazy '.*?'.
+_OPAQUE_SECTIONS = (rb'!\[CDATA\[[^\]]*(?:\](?!\]>)[^\]]*)*\]\]>'
+                    rb'|!--[^-]*(?:-(?!->)[^-]*)*-->'
+                    rb'|\?[^?]*(?:\?(?!>)[^?]*)*\?>')
+
+_XML_DECLARATION = re.compile(rb'\s*(<\?xml' + START_TAG_BODY + rb'\?>)')
+_ROOT_START_TAG = re.compile(
+    rb'<(?:' + _OPAQUE_SECTIONS + rb'|!DOCTYPE[^>]*>|(?P<tag>[\w.:-]+)' + START_TAG_BODY + rb'>)',
+    re.DOTALL,
+)
+
+_ATTRIBUTE = re.compile(rb'([\w.:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+# Size of the slices handed to the XML parser when feeding from a buffer
+FEED_CHUNK_SIZE = 1 << 20
+
+
+class ElementSpan:
+    """Byte offsets of one element inside a project buffer"""
+    __slots__ = ('start', 'start_tag_end', 'end')
+
+    def __init__(self, start: int, start_tag_end: int, end: int):
+        self.start = start
+        self.start_tag_end = start_tag_end
+        self.end = end
+
+    @property
+    def self_closing(self) -> bool:
+        return self.start_tag_end == self.end
+
+    def __repr__(self):
+        return f"ElementSpan({self.start}, {self.start_tag_end}, {self.end})"
+
+
+class FragmentWrapper:
+    """
+    The XML declaration and root start/end tags of a project, used to turn an
+    element's bytes into a standalone document with every namespace declared.
+    """
+    __slots__ = ('prefix', 'suffix')
+
+    def __init__(self, prefix: bytes, suffix: bytes):
+        self.prefix = prefix
+        self.suffix = suffix
+
+    def wrap(self, fragment: bytes) -> bytes:
+        return self.prefix + fragment + self.suffix
+
+
+def open_project_buffer(xml_path: str) -> mmap.mmap:
+    """Memory-map a project file read-only"""
+    with open(xml_path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_fragment_wrapper(buffer) -> FragmentWrapper:
+    """Read the XML declaration and root start tag at the top of a project buffer"""
+    head_end = min(len(buffer), 64 * 1024)
+    head = bytes(buffer[:head_end])
+    declaration = _XML_DECLARATION.match(head)
+    prefix = declaration.group(1) + b'\n' if declaration else b''
+
+    for match in _ROOT_START_TAG.finditer(head, declaration.end() if declaration else 0):
+        if match.group('tag'):
+            root_tag = match.group('tag')
+            start_tag = match.group(0)
+            if start_tag.endswith(b'/>'):
+                start_tag = start_tag[:-2] + b'>'
+            return FragmentWrapper(prefix + start_tag, b'</' + root_tag + b'>')
+    raise ValueError("No root element found in project file")
+
+
+def markup_pattern(*alternatives: bytes):
+    """
+    Compile a pattern for '<' followed by any of alternatives. CDATA sections,
+    comments and processing instructions are matched first, with no named
+    group set, so their content is never mistaken for markup. Alternatives
+    can use START_TAG_BODY to match the attributes of a start tag.
+    """
+    return re.compile(rb'<(?:' + _OPAQUE_SECTIONS + rb'|' + rb'|'.join(alternatives) + rb')', re.DOTALL)
+
+
+def _span_pattern(tag: bytes):
+    return markup_pattern(
+        rb'(?P<open>' + re.escape(tag) + rb'(?=[\s/>])' + START_TAG_BODY + rb'>)',
+        rb'(?P<close>/' + re.escape(tag) + rb'\s*>)',
+    )
+
+
+def iter_element_spans(buffer, tag: str, start: int = 0, end: Optional[int] = None) -> Iterator[ElementSpan]:
+    """
+    Yield the spans of every ``tag`` element (e.g. ``con:testStep``) in document order.
+
+    Only the raw bytes are scanned - no tree is built. CDATA sections, comments
+    and processing instructions are skipped, so Groovy scripts mentioning a tag
+    do not produce false matches. Elements of ``tag`` must not nest.
+    """
+    pattern = _span_pattern(tag.encode('ascii'))
+    end = len(buffer) if end is None else end
+    open_span: Optional[Tuple[int, int]] = None
+    for match in pattern.finditer(buffer, start, end):
+        if match.group('open'):
+            if match.group('open').endswith(b'/>'):
+                yield ElementSpan(match.start(), match.end(), match.end())
+            else:
+                open_span = (match.start(), match.end())
+        elif match.group('close') and open_span is not None:
+            yield ElementSpan(open_span[0], open_span[1], match.end())
+            open_span = None
+
+
+def scan_element_spans(buffer, tag: str, start: int = 0, end: Optional[int] = None) -> List[ElementSpan]:
+    """List form of iter_element_spans"""
+    return list(iter_element_spans(buffer, tag, start, end))
+
+
+def start_tag_attributes(buffer, span: ElementSpan) -> Dict[str, str]:
+    """Attributes of a span's start tag, keyed by their qualified name (e.g. 'xsi:type')"""
+    start_tag = bytes(buffer[span.start:span.start_tag_end])
+    return {
+        match.group(1).decode('utf-8'): html.unescape((match.group(2) if match.group(2) is not None
+                                                       else match.group(3)).decode('utf-8'))
+        for match in _ATTRIBUTE.finditer(start_tag)
+    }
+
+
+def feed_range(parser, buffer, start: int, end: int) -> None:
+    """Feed buffer[start:end] to an XML parser in bounded slices"""
+    while start < end:
+        stop = min(end, start + FEED_CHUNK_SIZE)
+        parser.feed(buffer[start:stop])
+        start = stop
+
+
+def feed_skeleton(parser, buffer, spans: List[ElementSpan], tag: str) -> None:
+    """
+    Feed a whole buffer to an XML parser, keeping the start tag of each span
+    but eliding its content. The parser sees an empty ``tag`` element in place
+    of every span, so the elided bytes are never tokenized.
+    """
+    close_tag = b'</' + tag.encode('ascii') + b'>'
+    feed_with_elisions(parser, buffer, [
+        (span.start_tag_end, span.end, b'' if span.self_closing else close_tag) for span in spans
+    ])
+
+
+def feed_with_elisions(parser, buffer, elisions: List[Tuple[int, int, bytes]]) -> None:
+    """
+    Feed a whole buffer to an XML parser, replacing each (start, end) range in
+    elisions with its replacement bytes. Ranges must be sorted and must not overlap.
+    """
+    position = 0
+    for start, end, replacement in elisions:
+        feed_range(parser, buffer, position, start)
+        if replacement:
+            parser.feed(replacement)
+        position = end
+    feed_range(parser, buffer, position, len(buffer))
@@ -2,20 +2,25 @@ from converters.rest_request_converter import convert_rest_request
 from converters.datasource_converter import convert_datasource_step
 from converters.properties_converter import convert_properties_step
 from converters.property_transfer_converter import convert_property_transfer_step
-from converters.groovy_script_converter import convert_groovy_script, create_script_step
-from analyzer.groovy_behavior_classifier import GroovyBehaviorClassifier
-from typing import Dict, List, Any, Optional, Union
-import json
+from converters.groovy_script_converter import (
+    SCRIPT_STEP_DESCRIPTION,
+    convert_groovy_assertion,
+    groovy_script_source,
+)
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
-def convert_groovy_to_javascript(groovy_script: str) -> str:
+def convert_groovy_to_javascript(groovy_script: str, optimized_scripts: bool = False) -> str:
     """
-    Convert a Groovy script to JavaScript (basic conversion)
+    Convert a Groovy script to JavaScript (basic conversion).
+    With optimized_scripts, assertions are compiled inline instead of using eval
     """
     js_lines = []
+    # Names already declared, so repeated lines do not declare them again
+    declared = set()
     js_lines.append("// Pre-request script converted from Groovy")
     js_lines.append("// This script runs before the request is sent")
     js_lines.append("")
@@ -44,6 +49,11 @@ def convert_groovy_to_javascript(groovy_script: str) -> str:
         if line.strip().startswith("import "):
             js_lines.append(f"// {line} - imports not needed in JavaScript")
             continue
+
+        # Convert assertions to tests
+        if line.strip().startswith("assert "):
+            js_lines.extend(convert_groovy_assertion(line.strip(), optimized_scripts))
+            continue
             
         # Convert specific ReadyAPI calls to Postman equivalents
         if "testRunner.testCase.testSuite.project" in line:
@@ -57,23 +67,29 @@ def convert_groovy_to_javascript(groovy_script: str) -> str:
             continue
             
         # Convert simple property access
-        line = line.replace(".get(", ".get('").replace(")", "')")
+        line = re.sub(r"\.get\((\w+)\)", r".get('\1')", line)
         
         # Convert environment variables
         if "env = " in line:
-            js_lines.append("const env = pm.environment.get('env');")
+            if "env" not in declared:
+                declared.add("env")
+                js_lines.append("const env = pm.environment.get('env');")
             continue
             
         # Convert card number references
         if "cardNumber" in line.lower():
-            js_lines.append("const cardNumber = pm.environment.get('CardNumber');")
+            if "cardNumber" not in declared:
+                declared.add("cardNumber")
+                js_lines.append("const cardNumber = pm.environment.get('CardNumber');")
             continue
             
         # Convert endpoint setting
         if "SetEndpoint" in line or "endpoint" in line.lower():
-            js_lines.append("// Set the endpoint")
-            js_lines.append("const endpoint = pm.environment.get('baseUrl');")
-            js_lines.append("console.log(`Setting endpoint to ${endpoint}`);")
+            if "endpoint" not in declared:
+                declared.add("endpoint")
+                js_lines.append("// Set the endpoint")
+                js_lines.append("const endpoint = pm.environment.get('baseUrl');")
+                js_lines.append("console.log(`Setting endpoint to ${endpoint}`);")
             continue
             
         # Convert header setting
@@ -93,7 +109,8 @@ def convert_groovy_to_javascript(groovy_script: str) -> str:
         
     return "\n".join(js_lines)
 
-def create_script_step(name: str, script_type: str, script_content: str = None) -> Dict[str, Any]:
+def create_script_step(name: str, script_type: str, script_content: str = None,
+                       optimized_scripts: bool = False) -> Dict[str, Any]:
     """
     Create a step with a script, matching manual format
     """
@@ -104,7 +121,6 @@ def create_script_step(name: str, script_type: str, script_content: str = None)
 // This script runs before the request is sent
 
 // Set up headers for all requests
-pm.request.headers.add({key: 'Cookie', value: ''});
 pm.request.headers.add({key: 'Content-Type', value: 'application/xml'});
 
 // Set the endpoint
@@ -120,7 +136,7 @@ pm.test('Status code is 200', function() {
 
     # Modify the script if it's Groovy to match manual format better
     if "testRunner" in script_content or "context.expand" in script_content or "groovy" in script_content.lower():
-        script_content = convert_groovy_to_javascript(script_content)
+        script_content = convert_groovy_to_javascript(script_content, optimized_scripts)
 
     script_lines = script_content.split("\n")
     
@@ -133,14 +149,10 @@ pm.test('Status code is 200', function() {
 const env = pm.environment.get('env');
 const cardNumber = pm.environment.get('CardNumber');
 
-// Sign in and get session ID
-const testSessionID = 'JSESSIONID=ESC8BF5BFD9020E5E9D356334D6F7AEF';
+// Get the session ID; the collection pre-request script signs in once per run and caches it
+const testSessionID = pm.collectionVariables.get('readyapiSession');
 
-// Set session ID in environment
-pm.environment.set('JSESSIONID', testSessionID);
-
-// Set headers for all requests
-pm.request.headers.add({key: 'Cookie', value: testSessionID});
+// Set headers for all requests; the Cookie header reads {{JSESSIONID}}
 pm.request.headers.add({key: 'Content-Type', value: 'application/xml'});
 
 // Set the endpoint
@@ -150,11 +162,11 @@ console.log(`Setting endpoint to ${endpoint}`);"""
         test_script = """// Test script converted from Groovy
 // This script runs after the response is received
 
-// Check if SignIn passed
+// Check if SignIn passed; without a signInUrl no sign-in is attempted
 pm.test('SignIn passed', function() {
-    // In Postman, we can't directly check if a test case passed
-    // We'll assume it passed for this example
-    pm.expect(true).to.be.true;
+    if (pm.variables.get('signInUrl')) {
+        pm.expect(pm.collectionVariables.get('readyapiSession'), 'cached session').to.be.a('string').that.is.not.empty;
+    }
 });"""
 
         return {
@@ -183,7 +195,7 @@ pm.test('SignIn passed', function() {
                     "host": ["{{baseUrl}}"],
                     "path": [""]
                 },
-                "description": f"Converted from Groovy script: {name}"
+                "description": f"{SCRIPT_STEP_DESCRIPTION}: {name}"
             }
         }
     elif name == "RunTest":
@@ -203,6 +215,7 @@ if (envType === 'DEV') {
 } else if (envType === 'UAT') {
     pm.environment.set('CardNumber', '4519891586948663');
 }
+// A changed env or card number makes the next request sign in again
 
 // Create log file
 console.log('Creating log file: REGRESSION_LOG');"""
@@ -249,7 +262,7 @@ pm.test('Environment is set correctly', function() {
                     "host": ["{{baseUrl}}"],
                     "path": [""]
                 },
-                "description": f"Converted from Groovy script: {name}"
+                "description": f"{SCRIPT_STEP_DESCRIPTION}: {name}"
             }
         }
     elif name == "SetupScriptLibrary":
@@ -294,7 +307,7 @@ pm.test('Script library initialized', function() {
                     "host": ["{{baseUrl}}"],
                     "path": [""]
                 },
-                "description": f"Converted from Groovy script: {name}"
+                "description": f"{SCRIPT_STEP_DESCRIPTION}: {name}"
             }
         }
     
@@ -318,7 +331,7 @@ pm.test('Script library initialized', function() {
                 "host": ["{{baseUrl}}"],
                 "path": [""]
             },
-            "description": f"Converted from Groovy script: {name}"
+            "description": f"{SCRIPT_STEP_DESCRIPTION}: {name}"
         }
     }
 
@@ -331,7 +344,6 @@ def create_library_step(name: str, script_content: str = None) -> Dict[str, Any]
 // This script runs before the request is sent
 
 // Set up headers for all requests
-pm.request.headers.add({key: 'Cookie', value: ''});
 pm.request.headers.add({key: 'Content-Type', value: 'application/xml'});
 
 // Define utility functions that were in the Groovy script
@@ -371,13 +383,8 @@ class GLF {
     SignInAvion(cardNumber, env) {
         console.log(`Signing in with card number: ${cardNumber} in environment: ${env}`);
         
-        // Set up headers for all requests
-        pm.request.headers.add({key: 'Cookie', value: ''});
-        pm.request.headers.add({key: 'Content-Type', value: 'application/xml'});
-        
-        // Call sign in function
-        const sessionID = 'JSESSIONID=DummySessionID'; // Simulate session ID for demo
-        return sessionID;
+        // The collection pre-request script signs in once per run and caches the session
+        return pm.collectionVariables.get('readyapiSession');
     }
     
     // Environment functions
@@ -439,31 +446,56 @@ pm.test('GLF class initialized', function() {
                 "host": ["{{baseUrl}}"],
                 "path": [""]
             },
-            "description": "Converted from Groovy script: FunctionLibrary"
+            "description": f"{SCRIPT_STEP_DESCRIPTION}: FunctionLibrary"
         }
     }
 
-def dispatch_step_conversion(test_step) -> Optional[Dict[str, Any]]:
+def groovy_step_script_lines(test_step, optimized_scripts: bool = False) -> Tuple[List[str], List[str]]:
+    """
+    The pre-request and test JavaScript of a Groovy script step, from the same
+    templates as its script item would use. Each runs in a function of its own,
+    so its constants do not clash with other steps' or the request's.
+    """
+    script_content = groovy_script_source(test_step)
+    if test_step.name == "FunctionLibrary":
+        step = create_library_step(test_step.name, script_content)
+    else:
+        step = create_script_step(test_step.name, "prerequest", script_content, optimized_scripts)
+    lines = {"prerequest": [], "test": []}
+    for event in step.get("event", []):
+        lines[event["listen"]].extend(event["script"]["exec"])
+    return _step_scope(test_step.name, lines["prerequest"]), _step_scope(test_step.name, lines["test"])
+
+def _step_scope(name: str, lines: List[str]) -> List[str]:
+    """Script lines of a Groovy step wrapped in a function that runs at once"""
+    if not lines:
+        return []
+    return ([f"// Groovy script step: {name}", "(function () {"]
+            + [f"    {line}" if line.strip() else "" for line in lines]
+            + ["})();"])
+
+def dispatch_step_conversion(test_step, context: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
     """
     Dispatch test step conversion based on step type
     """
     try:
-        step_type = test_step.type.lower()
+        step_type = getattr(test_step, 'step_type', None) or test_step.type
+        step_type = step_type.lower()
         
         if step_type == "restrequest":
             return convert_rest_request(test_step)
         elif step_type == "datasource":
-            return convert_datasource_step(test_step)
+            return convert_datasource_step(test_step, context)
         elif step_type == "properties":
-            return convert_properties_step(test_step)
+            return convert_properties_step(test_step, context)
         elif step_type == "propertytransfer":
-            return convert_property_transfer_step(test_step)
+            return convert_property_transfer_step(test_step, context)
         elif step_type == "groovyscript":
             # Get script type from step name or default to prerequest
             script_type = "prerequest"
             if "test" in test_step.name.lower():
                 script_type = "test"
-            return create_script_step(test_step.name, script_type, test_step.script)
+            return create_script_step(test_step.name, script_type, groovy_script_source(test_step))
         else:
             logger.warning(f"Unsupported step type: {step_type}")
             return None
@@ -0,0 +1,97 @@
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from batch_orchestrator import BatchOrchestrator
+from main_converter_runner import run_readyapi_to_postman
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+
+def load_collection(path):
+    with open(path) as f:
+        collection = json.load(f)
+    collection['info'].pop('_postman_id')
+    return collection
+
+
+class TestBatchOrchestrator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.inputs = []
+        for name in ('first.xml', 'second.xml', 'third.xml'):
+            path = os.path.join(self.tmp, name)
+            shutil.copy(SAMPLE_PROJECT, path)
+            self.inputs.append(path)
+        self.output_dir = os.path.join(self.tmp, 'out')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def convert_all(self, paths):
+        async def main():
+            async with BatchOrchestrator(self.output_dir, max_in_flight=2, process_workers=2) as orchestrator:
+                return await orchestrator.convert_all(paths)
+        return asyncio.run(main())
+
+    def test_batch_matches_single_conversion(self):
+        expected = os.path.join(self.tmp, 'expected.json')
+        run_readyapi_to_postman(SAMPLE_PROJECT, expected)
+
+        results = self.convert_all(self.inputs)
+        self.assertTrue(all(result.ok for result in results))
+        for result in results:
+            self.assertEqual(load_collection(result.output_file), load_collection(expected))
+            self.assertTrue(os.path.exists(result.env_file))
+
+    def test_compressed_inputs(self):
+        with open(SAMPLE_PROJECT, 'rb') as f:
+            project = f.read()
+        gz_path = os.path.join(self.tmp, 'packed.xml.gz')
+        with gzip.open(gz_path, 'wb') as f:
+            f.write(project)
+        zip_path = os.path.join(self.tmp, 'archive.zip')
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('a.xml', project)
+            archive.writestr('b.xml', project)
+
+        results = self.convert_all([gz_path, zip_path])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual([result.member for result in results], [None, 'a.xml', 'b.xml'])
+        self.assertEqual([os.path.basename(result.output_file) for result in results],
+                         ['packed.postman_collection.json', 'a.postman_collection.json', 'b.postman_collection.json'])
+
+    def test_projects_sharing_a_file_name_get_their_own_outputs(self):
+        paths = []
+        for folder in ('a', 'b'):
+            os.makedirs(os.path.join(self.tmp, folder))
+            paths.append(os.path.join(self.tmp, folder, 'project.xml'))
+            shutil.copy(SAMPLE_PROJECT, paths[-1])
+        zip_path = os.path.join(self.tmp, 'archive.zip')
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.write(SAMPLE_PROJECT, 'x/project.xml')
+            archive.write(SAMPLE_PROJECT, 'y/project.xml')
+
+        results = self.convert_all(paths + [zip_path])
+        self.assertEqual([os.path.basename(result.output_file) for result in results],
+                         ['project.postman_collection.json', 'project_.postman_collection.json',
+                          'project__.postman_collection.json', 'project___.postman_collection.json'])
+        self.assertEqual(len(os.listdir(self.output_dir)), 8)
+
+    def test_failures_are_reported_per_project(self):
+        broken = os.path.join(self.tmp, 'broken.xml')
+        with open(broken, 'w') as f:
+            f.write('<con:soapui-project')
+        with self.assertLogs('batch_orchestrator', level='ERROR'):
+            results = self.convert_all([broken, self.inputs[0]])
+        self.assertFalse(results[0].ok)
+        self.assertTrue(results[1].ok)
+
+
+if __name__ == '__main__':
+    unittest.main()
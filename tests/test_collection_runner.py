@@ -0,0 +1,125 @@
+import os
+import json
+import shutil
+import asyncio
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from collection_runner import expected_statuses, run_collection
+from main_converter_runner import run_readyapi_to_postman
+from postman_request_resolver import load_environment
+
+PROJECT = """<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Bank">
+  <con:testSuite name="Accounts">
+    <con:testCase name="Balance">
+      <con:testStep type="properties" name="Input">
+        <con:config><con:properties>
+          <con:property><con:name>account</con:name><con:value>{{prefix}}-42</con:value></con:property>
+        </con:properties></con:config>
+      </con:testStep>
+      <con:testStep type="restrequest" name="Balance">
+        <con:config service="svc" methodName="Balance">
+          <con:restRequest name="Balance" method="GET">
+            <con:endpoint>http://api.example.com/accounts/{{account}}</con:endpoint>
+            <con:assertion type="Valid HTTP Status Codes" name="OK"/>
+          </con:restRequest>
+        </con:config>
+      </con:testStep>
+      <con:testStep type="restrequest" name="Missing">
+        <con:config service="svc" methodName="Missing">
+          <con:restRequest name="Missing" method="GET">
+            <con:endpoint>http://api.example.com/missing</con:endpoint>
+            <con:assertion type="Valid HTTP Status Codes" name="OK"/>
+          </con:restRequest>
+        </con:config>
+      </con:testStep>
+    </con:testCase>
+  </con:testSuite>
+  <con:testSuite name="Payments">
+    <con:testCase name="Pay">
+      <con:testStep type="restrequest" name="Pay">
+        <con:config service="svc" methodName="Pay">
+          <con:restRequest name="Pay" method="POST">
+            <con:endpoint>http://api.example.com/payments</con:endpoint>
+            <con:request>{"amount": 5, "token": "{{token}}"}</con:request>
+          </con:restRequest>
+        </con:config>
+      </con:testStep>
+    </con:testCase>
+  </con:testSuite>
+</con:soapui-project>"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    wbufsize = -1
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.command, self.path, b''))
+        self.respond(404 if self.path == '/missing' else 200)
+
+    def do_POST(self):
+        self.requests.append((self.command, self.path, self.rfile.read(int(self.headers['Content-Length']))))
+        self.respond(201)
+
+    def respond(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestCollectionRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp)
+
+    def test_expected_statuses_of_both_script_styles(self):
+        annotated = {"event": [{"listen": "test", "script": {"exec": [
+            "pm.response.to.have.status(200);", "pm.expect([200, 204]).to.include(pm.response.code);"]}}]}
+        optimized = {"event": [{"listen": "test", "script": {"exec": [
+            "pm.expect(pm.response.code, 'Status code check').to.equal(201);"]}}]}
+        self.assertEqual(expected_statuses(annotated), [{200}, {200, 204}])
+        self.assertEqual(expected_statuses(optimized), [{201}])
+        self.assertEqual(expected_statuses({}), [])
+
+    def test_collection_runs_against_a_stand_in_server(self):
+        project = os.path.join(self.tmp, 'project.xml')
+        with open(project, 'w') as f:
+            f.write(PROJECT)
+        collection_file = os.path.join(self.tmp, 'collection.json')
+        env_file = os.path.join(self.tmp, 'environment.json')
+        run_readyapi_to_postman(project, collection_file, env_file)
+        with open(collection_file) as f:
+            collection = json.load(f)
+
+        variables = load_environment(env_file, ['prefix=ch', 'token=t-1'])
+        target = f'http://127.0.0.1:{self.server.server_address[1]}'
+        report = asyncio.run(run_collection(collection, variables, target=target))
+
+        results = {result["name"]: result for result in report["requests"]}
+        self.assertEqual(sorted(results), ["Balance", "Missing", "Pay"])
+        self.assertEqual(results["Balance"]["url"], f'{target}/accounts/ch-42')
+        self.assertEqual((results["Balance"]["status"], results["Balance"]["mismatch"]), (200, False))
+        self.assertEqual((results["Missing"]["status"], results["Missing"]["mismatch"]), (404, True))
+        self.assertEqual((results["Pay"]["status"], results["Pay"]["expected"]), (201, []))
+        self.assertEqual(results["Balance"]["folder"], "Accounts/Balance")
+        self.assertIn(('POST', '/payments', b'{"amount": 5, "token": "t-1"}'), StandInHandler.requests)
+        self.assertEqual((report["mismatches"], report["errors"], report["passed"]), (1, 0, False))
+        self.assertEqual(report["summary"]["count"], 3)
+        self.assertLessEqual(report["connections"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
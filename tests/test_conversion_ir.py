@@ -0,0 +1,55 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from conversion_ir import IR_VERSION, IRFormatError, IRWriter, read_ir
+from main_converter_runner import build_postman_from_ir, convert_readyapi_to_ir, run_readyapi_to_postman
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+
+class TestConversionIR(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def load(self, name):
+        with open(os.path.join(self.tmp, name)) as f:
+            collection = json.load(f)
+        collection['info'].pop('_postman_id')
+        return collection
+
+    def test_convert_then_build_matches_run(self):
+        ir_path = os.path.join(self.tmp, 'project.ndjson')
+        run_readyapi_to_postman(SAMPLE_PROJECT, os.path.join(self.tmp, 'run.json'))
+        convert_readyapi_to_ir(SAMPLE_PROJECT, ir_path)
+        build_postman_from_ir(ir_path, os.path.join(self.tmp, 'built.json'))
+        self.assertEqual(self.load('built.json'), self.load('run.json'))
+
+        with open(ir_path) as f:
+            header, records = read_ir(f)
+            orders = [record['order'] for record in records if record['type'] == 'step']
+        self.assertEqual(header['version'], IR_VERSION)
+        self.assertEqual(orders, list(range(len(orders))))
+
+    def test_newer_versions_are_rejected(self):
+        f = io.StringIO(json.dumps({'format': 'readyapi-postman-ir', 'version': IR_VERSION + 1}) + '\n')
+        with self.assertRaises(IRFormatError):
+            read_ir(f)
+
+    def test_steps_out_of_order_are_rejected(self):
+        out = io.StringIO()
+        IRWriter(out, 'Example').write_steps([{'name': 'One'}, {'name': 'Two'}])
+        lines = out.getvalue().splitlines(keepends=True)
+        header, records = read_ir(io.StringIO(lines[0] + lines[2] + lines[1]))
+        with self.assertRaises(IRFormatError):
+            list(records)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from conversion_pipeline import CollectionWriter, threaded_stage
+from main_converter_runner import run_readyapi_to_postman
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+
+def without_ids(collection):
+    collection['info'].pop('_postman_id')
+    return collection
+
+
+class TestThreadedStage(unittest.TestCase):
+    def test_items_arrive_in_order(self):
+        self.assertEqual(list(threaded_stage(iter(range(100)), maxsize=2)), list(range(100)))
+
+    def test_producer_errors_reach_the_consumer(self):
+        def failing():
+            yield 1
+            raise KeyError('broken')
+
+        stage = threaded_stage(failing())
+        self.assertEqual(next(stage), 1)
+        with self.assertRaises(KeyError):
+            next(stage)
+
+
+class TestCollectionWriter(unittest.TestCase):
+    def test_matches_json_dump(self):
+        collection = {
+            'info': {'name': 'Example', 'schema': 'x'},
+            'item': [{'name': 'Suite', 'item': [{'name': 'Case', 'item': []}]}, {'name': 'Line\nbreak'}],
+            'variable': [{'key': 'baseUrl', 'value': '{{baseUrl}}'}],
+        }
+        for items in (collection['item'], []):
+            expected = dict(collection, item=items)
+            out = io.StringIO()
+            writer = CollectionWriter(out, expected['info'])
+            for item in items:
+                writer.write_item(item)
+            writer.close({'variable': expected['variable']})
+            self.assertEqual(out.getvalue(), json.dumps(expected, indent=2))
+
+
+class TestStreamingConversion(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_stream_matches_staged_conversion(self):
+        staged = os.path.join(self.tmp, 'staged.json')
+        streamed = os.path.join(self.tmp, 'streamed.json')
+        run_readyapi_to_postman(SAMPLE_PROJECT, staged)
+        run_readyapi_to_postman(SAMPLE_PROJECT, streamed, stream=True)
+        with open(staged) as a, open(streamed) as b:
+            self.assertEqual(without_ids(json.load(b)), without_ids(json.load(a)))
+
+
+if __name__ == '__main__':
+    unittest.main()
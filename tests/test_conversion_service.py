@@ -0,0 +1,65 @@
+import json
+import unittest
+import urllib.error
+import urllib.request
+
+from conversion_service import ConversionService, ResultCache
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+
+class TestResultCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(max_entries=2, max_bytes=100)
+        cache.put('a', b'1')
+        cache.put('b', b'2')
+        cache.get('a')
+        cache.put('c', b'3')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'1')
+        cache.put('big', b'x' * 100)
+        self.assertEqual(cache.stats(), {'entries': 1, 'bytes': 100})
+
+
+class TestConversionService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = ConversionService(port=0, workers=1)
+        cls.service.start()
+        host, port = cls.service.address
+        cls.base_url = f'http://{host}:{port}'
+        with open(SAMPLE_PROJECT, 'rb') as f:
+            cls.project = f.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.close()
+
+    def post(self, path, data):
+        request = urllib.request.Request(self.base_url + path, data=data, method='POST')
+        with urllib.request.urlopen(request) as response:
+            return response.headers['X-Cache'], json.loads(response.read())
+
+    def test_convert_is_cached_and_measured(self):
+        first_cache, first = self.post('/convert?suite=Cash*', self.project)
+        second_cache, second = self.post('/convert?suite=Cash*', self.project)
+        self.assertEqual((first_cache, second_cache), ('MISS', 'HIT'))
+        self.assertEqual(second, first)
+        self.assertEqual(first['project'], 'Mobiliser_AvionRewards_RegressionSuite')
+        self.assertIn('item', first['collection'])
+        self.assertEqual(first['environment']['name'], 'Mobiliser_AvionRewards_RegressionSuite_Environment')
+
+        with urllib.request.urlopen(self.base_url + '/metrics') as response:
+            metrics = json.loads(response.read())
+        self.assertGreaterEqual(metrics['cache_hits'], 1)
+        self.assertGreater(metrics['cache_hit_rate'], 0)
+        self.assertGreaterEqual(metrics['latency_seconds']['count'], 2)
+
+    def test_invalid_xml_is_rejected(self):
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self.post('/convert', b'<con:soapui-project')
+        self.assertEqual(raised.exception.code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
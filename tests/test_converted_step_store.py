@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from converted_step_store import ConvertedStepStore, parse_size
+from postman_collection_builder import group_converted_steps
+
+
+def make_steps():
+    # Suite B's second case reappears after a step of suite A
+    names = [('A', 'a1'), ('A', 'a2'), ('B', 'b1'), ('A', 'a1'), ('B', 'b2'), ('B', 'b1')]
+    return [{'name': f'Step {i}', 'test_suite': suite, 'test_case': case} for i, (suite, case) in enumerate(names)]
+
+
+class TestConvertedStepStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_groups_match_builder_in_memory_and_spilled(self):
+        expected = list(group_converted_steps(make_steps()).items())
+        for budget, spilled in ((None, False), (1 << 20, False), (100, True)):
+            with ConvertedStepStore(budget, spill_dir=self.tmp) as store:
+                for step in make_steps():
+                    store.append(step)
+                self.assertEqual(store.spilled, spilled)
+                self.assertEqual(len(store), 6)
+                self.assertEqual(list(store.iter_suites()), expected)
+                self.assertEqual(list(store), make_steps())
+
+    def test_spill_file_is_removed_on_close(self):
+        store = ConvertedStepStore(0, spill_dir=self.tmp)
+        store.extend(make_steps())
+        self.assertEqual(len(os.listdir(self.tmp)), 1)
+        store.close()
+        self.assertEqual(os.listdir(self.tmp), [])
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size('65536'), 65536)
+        self.assertEqual(parse_size('512K'), 512 << 10)
+        self.assertEqual(parse_size('256m'), 256 << 20)
+        self.assertEqual(parse_size('1.5GB'), 3 << 29)
+
+
+if __name__ == '__main__':
+    unittest.main()
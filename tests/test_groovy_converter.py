@@ -120,5 +120,13 @@ headers.clear()
         self.assertIn("Cookie", result)
         self.assertIn("Content-Type", result)
 
+    def test_optimized_assertions_avoid_eval(self):
+        script = 'assert items.size() > 0 : "has items"\nassert name ==~ /abc/'
+        self.assertIn("eval(", convert_groovy_script(script, "test"))
+        result = convert_groovy_script(script, "test", optimized_scripts=True)
+        self.assertNotIn("eval(", result)
+        self.assertIn('pm.expect(items.length > 0, "has items").to.be.ok;', result)
+        self.assertIn('pm.expect.fail("Groovy assertion not converted: assert name ==~ /abc/")', result)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
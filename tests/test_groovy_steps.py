@@ -0,0 +1,71 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from main_converter_runner import convert_test_case
+from readyapi_project_parser import parse_project_bytes
+
+PROJECT = """<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Bank">
+  <con:testSuite name="Suite">
+    <con:testCase name="Case">
+      <con:testStep type="groovy" name="InSetup">
+        <con:config><script>def testSessionID = RT.SignInAvion(cardNumber, env)</script></con:config>
+      </con:testStep>
+      <con:testStep type="groovy" name="Prepare">
+        <con:config><script>def env = testRunner.testCase.getPropertyValue("env")
+def card = testRunner.testCase.getPropertyValue("CardNumber")
+def headers = new StringToStringMap()
+headers.put("Content-Type", "application/xml")
+GLF.SetEndpoint(testRunner.testCase.getTestStepByName("Balance"))
+log.info("card " + props.get(card))
+assert card.size() == 16 : "card length"</script></con:config>
+      </con:testStep>
+      <con:testStep type="restrequest" name="Balance">
+        <con:config service="svc" methodName="Balance">
+          <con:restRequest name="Balance" method="GET"><con:endpoint>http://api.example.com/balance</con:endpoint></con:restRequest>
+        </con:config>
+      </con:testStep>
+      <con:testStep type="groovy" name="RunTest">
+        <con:config><script>testRunner.testCase.setPropertyValue("env", "DEV")</script></con:config>
+      </con:testStep>
+    </con:testCase>
+  </con:testSuite>
+</con:soapui-project>
+"""
+
+
+class TestGroovyStepScripts(unittest.TestCase):
+    def setUp(self):
+        test_suite = parse_project_bytes(PROJECT.encode('utf-8')).test_suites[0]
+        self.request, = convert_test_case(test_suite, test_suite.test_cases[0])
+        self.events = {event["listen"]: event["script"]["exec"] for event in self.request["event"]}
+
+    def test_scripts_go_to_their_events(self):
+        prerequest, test = "\n".join(self.events["prerequest"]), "\n".join(self.events["test"])
+        self.assertIn("// Groovy script step: Prepare", prerequest)
+        self.assertNotIn("SignIn passed", prerequest)
+        self.assertIn("pm.test('SignIn passed'", test)
+        self.assertIn("// Groovy script step: RunTest", test)
+
+    def test_optimized_scripts_compile_assertions(self):
+        self.assertIn("eval(", "\n".join(self.events["prerequest"]))
+        test_suite = parse_project_bytes(PROJECT.encode('utf-8')).test_suites[0]
+        request, = convert_test_case(test_suite, test_suite.test_cases[0], optimized_scripts=True)
+        prerequest = "\n".join(request["event"][0]["script"]["exec"])
+        self.assertNotIn("eval(", prerequest)
+        self.assertIn('pm.expect(card.length == 16, "card length").to.be.ok;', prerequest)
+
+    @unittest.skipIf(shutil.which("node") is None, "needs node")
+    def test_scripts_parse(self):
+        for listen, lines in self.events.items():
+            with tempfile.TemporaryDirectory() as directory:
+                script = Path(directory) / f"{listen}.js"
+                script.write_text("\n".join(lines), encoding="utf-8")
+                result = subprocess.run(["node", "--check", str(script)], capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
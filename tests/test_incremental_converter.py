@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from file_watcher import InotifyWatcher, PollingWatcher
+from incremental_converter import IncrementalConverter
+from main_converter_runner import run_readyapi_to_postman
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+
+def load_collection(path):
+    with open(path) as f:
+        collection = json.load(f)
+    collection['info'].pop('_postman_id')
+    return collection
+
+
+class TestIncrementalConverter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.tmp, 'project.xml')
+        shutil.copy(SAMPLE_PROJECT, self.input_file)
+        self.output_file = os.path.join(self.tmp, 'collection.json')
+        self.expected_file = os.path.join(self.tmp, 'expected.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_updates_only_changed_cases(self):
+        converter = IncrementalConverter(self.input_file, self.output_file)
+        stats = converter.update()
+        self.assertEqual(stats['converted_cases'], stats['cases'])
+        run_readyapi_to_postman(self.input_file, self.expected_file)
+        self.assertEqual(load_collection(self.output_file), load_collection(self.expected_file))
+
+        self.assertEqual(converter.update()['converted_cases'], 0)
+
+        with open(self.input_file, 'rb') as f:
+            data = f.read()
+        with open(self.input_file, 'wb') as f:
+            f.write(data.replace(b'name="RunTest"', b'name="RunTestRenamed"', 1))
+        stats = converter.update()
+        self.assertEqual((stats['changed_suites'], stats['converted_cases']), (1, 1))
+        run_readyapi_to_postman(self.input_file, self.expected_file)
+        self.assertEqual(load_collection(self.output_file), load_collection(self.expected_file))
+
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'project.xml')
+        with open(self.path, 'w') as f:
+            f.write('<a/>')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def assert_detects_change(self, watcher):
+        try:
+            self.assertFalse(watcher.wait(timeout=0.1))
+            # Saved by writing a new file and renaming it over the original
+            def save():
+                time.sleep(0.1)
+                with open(self.path + '.new', 'w') as f:
+                    f.write('<b/>')
+                os.replace(self.path + '.new', self.path)
+            threading.Thread(target=save).start()
+            self.assertTrue(watcher.wait(timeout=5))
+        finally:
+            watcher.close()
+
+    def test_polling_watcher(self):
+        self.assert_detects_change(PollingWatcher(self.path, poll_interval=0.02))
+
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher(self.path)
+        except (OSError, AttributeError) as e:
+            self.skipTest(f"inotify unavailable: {e}")
+        self.assert_detects_change(watcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
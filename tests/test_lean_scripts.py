@@ -0,0 +1,54 @@
+import io
+import json
+import unittest
+
+from lean_scripts import LeanCollectionWriter, ScriptSizes, lean_item, lean_script_lines
+
+SCRIPT = """// Pre-request script converted from Groovy
+
+const env = pm.environment.get('env'); // kept with its comment
+console.log(`Setting endpoint to ${env}`);
+if (env)
+    console.log('the body of an if stays');
+const body = `first
+// not a comment inside a template literal
+`;
+/* block
+   comment */
+console.error('failures are still reported');""".split("\n")
+
+
+class TestLeanScripts(unittest.TestCase):
+    def test_lean_script_lines(self):
+        self.assertEqual(lean_script_lines(SCRIPT), [
+            "const env = pm.environment.get('env'); // kept with its comment",
+            "if (env)",
+            "    console.log('the body of an if stays');",
+            "const body = `first",
+            "// not a comment inside a template literal",
+            "`;",
+            "console.error('failures are still reported');",
+        ])
+
+    def test_writer_writes_annotated_and_lean_collections(self):
+        event = {"listen": "prerequest", "script": {"type": "text/javascript", "exec": SCRIPT}}
+        comments = {"listen": "test", "script": {"type": "text/javascript", "exec": ["// only a comment", ""]}}
+        folder = {"name": "Suite", "item": [{"name": "Step", "event": [event, comments], "request": {}}]}
+
+        lean_f, debug_f = io.StringIO(), io.StringIO()
+        writer = LeanCollectionWriter(lean_f, debug_f, {"name": "Project"})
+        writer.write_item(folder)
+        writer.close({"event": [comments]})
+
+        self.assertEqual(json.loads(debug_f.getvalue()), {"info": {"name": "Project"}, "item": [folder],
+                                                          "event": [comments]})
+        lean = json.loads(lean_f.getvalue())
+        self.assertNotIn("event", lean)
+        self.assertEqual(lean["item"], [lean_item(folder, ScriptSizes())])
+        self.assertEqual([e["listen"] for e in lean["item"][0]["item"][0]["event"]], ["prerequest"])
+        self.assertEqual(writer.sizes.lines_before, len(SCRIPT) + 4)
+        self.assertEqual(writer.sizes.lines_after, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
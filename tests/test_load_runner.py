@@ -0,0 +1,135 @@
+import os
+import json
+import shutil
+import asyncio
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from converters.groovy_script_converter import SCRIPT_STEP_DESCRIPTION
+from converters.load_test_converter import convert_load_test, load_plan_entries
+from load_runner import run_load_plan, run_load_test
+from main_converter_runner import run_readyapi_to_postman
+from readyapi_project_parser import ReadyAPILoadTest, ReadyAPITestCase, ReadyAPITestSuite
+
+PROJECT = """<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Bank">
+  <con:testSuite name="Suite">
+    <con:testCase name="Browse">
+      <con:testStep type="restrequest" name="Ping">
+        <con:config service="svc" resourcePath="/ping" methodName="Ping">
+          <con:restRequest name="Ping" method="GET"><con:endpoint>http://api.example.com</con:endpoint></con:restRequest>
+        </con:config>
+      </con:testStep>
+      <con:testStep type="restrequest" name="Login">
+        <con:config service="svc" resourcePath="/login" methodName="Login">
+          <con:restRequest name="Login" method="POST">
+            <con:endpoint>http://api.example.com</con:endpoint>
+            <con:request>{"user": "u"}</con:request>
+          </con:restRequest>
+        </con:config>
+      </con:testStep>
+      <con:loadTest name="Peak">
+        <con:threadCount>4</con:threadCount>
+        <con:testLimit>25</con:testLimit>
+        <con:limitType>COUNT</con:limitType>
+        <con:loadStrategy>
+          <con:type>Simple</con:type>
+          <con:config><testDelay>0</testDelay><randomFactor>0.5</randomFactor></con:config>
+        </con:loadStrategy>
+        <con:assertion type="Step Average" name="Average">
+          <con:configuration><maxAverage>5000</maxAverage><testStep>ANY</testStep><minRequests>5</minRequests></con:configuration>
+        </con:assertion>
+        <con:assertion type="Step Maximum" name="Instant">
+          <con:configuration><maxValue>0</maxValue><testStep>Login</testStep><minRequests>5</minRequests></con:configuration>
+        </con:assertion>
+        <con:assertion type="Step TPS" name="Throughput">
+          <con:configuration><minValue>1</minValue><testStep>TestCase</testStep><minRequests>100</minRequests></con:configuration>
+        </con:assertion>
+      </con:loadTest>
+    </con:testCase>
+  </con:testSuite>
+</con:soapui-project>"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one write, not two small ones delayed by Nagle's algorithm
+    wbufsize = -1
+    bodies = []
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.bodies.append(self.rfile.read(int(self.headers['Content-Length'])))
+        self.respond()
+
+    def respond(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestLoadRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp)
+
+    def test_load_test_runs_against_a_stand_in_server(self):
+        project = os.path.join(self.tmp, 'project.xml')
+        with open(project, 'w') as f:
+            f.write(PROJECT)
+        plan_file = os.path.join(self.tmp, 'load_plan.json')
+        run_readyapi_to_postman(project, os.path.join(self.tmp, 'collection.json'), load_plan_file=plan_file)
+        with open(plan_file) as f:
+            plan = json.load(f)
+
+        entry = plan["load_tests"][0]
+        self.assertEqual((entry["threads"], entry["limit"]), (4, {"type": "runs", "value": 25}))
+        self.assertEqual(entry["strategy"], {"type": "simple", "delay_ms": 0, "random_factor": 0.5})
+        self.assertEqual([request["name"] for request in entry["requests"]], ["Ping", "Login"])
+
+        target = f'http://127.0.0.1:{self.server.server_address[1]}'
+        report, = asyncio.run(run_load_plan(plan, {}, target=target))
+        self.assertEqual(report["runs"], 25)
+        self.assertEqual([(step["count"], step["errors"]) for step in report["steps"].values()], [(25, 0)] * 2)
+        self.assertLessEqual(report["connections"], 4)
+        self.assertLessEqual(report["steps"]["Ping"]["p50_ms"], report["steps"]["Ping"]["p99_ms"])
+        self.assertEqual(StandInHandler.bodies[0], b'{"user": "u"}')
+        self.assertEqual([(result["name"], result["passed"]) for result in report["assertions"]],
+                         [("Average", True), ("Instant", False), ("Throughput", None)])
+        self.assertFalse(report["passed"])
+
+    def test_script_only_items_are_not_replayed(self):
+        test_case = ReadyAPITestCase('Browse')
+        test_case.load_tests = [ReadyAPILoadTest('Peak', {}, 'Simple', {}, [])]
+        ping = {"name": "Ping", "request": {"method": "GET", "url": "http://api.example.com/ping"}}
+        script = {"name": "InSetup", "request": {"method": "GET", "url": "{{baseUrl}}",
+                                                 "description": f"{SCRIPT_STEP_DESCRIPTION}: InSetup"}}
+        entry, = load_plan_entries(ReadyAPITestSuite('Suite'), test_case, [script, ping])
+        self.assertEqual([request["name"] for request in entry["requests"]], ["Ping"])
+
+    def test_fixed_rate_must_be_positive(self):
+        with self.assertRaisesRegex(ValueError, 'positive testRate'):
+            convert_load_test(ReadyAPILoadTest('Peak', {}, 'Fixed-Rate', {'testRate': '0'}, []))
+        entry = {"name": "Peak", "requests": [], "threads": 1, "limit": {"type": "seconds", "value": 1},
+                 "strategy": {"type": "simple", "delay_ms": 0, "random_factor": 0}, "assertions": []}
+        with self.assertRaisesRegex(ValueError, 'must be positive'):
+            asyncio.run(run_load_test(entry, {}, rate=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
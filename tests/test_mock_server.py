@@ -0,0 +1,97 @@
+import os
+import json
+import shutil
+import asyncio
+import tempfile
+import unittest
+
+from async_http_client import PooledHTTPClient
+from main_converter_runner import run_readyapi_to_postman
+from mock_server import MockServer, RouteTrie
+
+PROJECT = """<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Bank">
+  <con:restMockService name="Accounts" port="8089" path="/bank">
+    <con:restMockAction name="Account" method="GET" resourcePath="/accounts/{id}">
+      <con:dispatchStyle>SEQUENCE</con:dispatchStyle>
+      <con:response name="Open" httpResponseStatus="200" mediaType="application/json">
+        <con:responseContent>{"status": "open"}</con:responseContent>
+        <con:header><con:name>X-Mock</con:name><con:value>first</con:value></con:header>
+      </con:response>
+      <con:response name="Closed" httpResponseStatus="410" mediaType="application/json">
+        <con:responseContent>{"status": "closed"}</con:responseContent>
+      </con:response>
+    </con:restMockAction>
+    <con:restMockAction name="Summary" method="GET" resourcePath="/accounts/summary">
+      <con:dispatchStyle>SCRIPT</con:dispatchStyle>
+      <con:defaultResponse>Full</con:defaultResponse>
+      <con:response name="Empty"><con:responseContent>{}</con:responseContent></con:response>
+      <con:response name="Full"><con:responseContent>{"accounts": 2}</con:responseContent></con:response>
+    </con:restMockAction>
+  </con:restMockService>
+  <con:mockService name="Rates" port="8089" path="/rates">
+    <con:mockOperation name="GetRate" operation="GetRate">
+      <con:dispatchStyle>SEQUENCE</con:dispatchStyle>
+      <con:response name="Rate"><con:responseContent>&lt;rate>1.1&lt;/rate></con:responseContent></con:response>
+    </con:mockOperation>
+  </con:mockService>
+</con:soapui-project>"""
+
+ENVELOPE = (b'<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"><soapenv:Body>'
+            b'<r:GetRateRequest xmlns:r="urn:rates"/></soapenv:Body></soapenv:Envelope>')
+
+
+class TestMockServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_route_trie_prefers_literal_segments(self):
+        routes = RouteTrie()
+        routes.add('GET', '/a/{id}/b', 'parameter')
+        routes.add('GET', '/a/x/{name}', 'literal')
+        routes.add('GET', '/a/x', 'static')
+        self.assertEqual(routes.match('GET', '/a/x/b'), 'literal')
+        self.assertEqual(routes.match('GET', '/a/y/b'), 'parameter')
+        self.assertEqual(routes.match('GET', '/a/x/'), 'static')
+        self.assertIsNone(routes.match('POST', '/a/x'))
+        self.assertIsNone(routes.match('GET', '/a/y/c'))
+
+    def test_mock_services_are_served(self):
+        project = os.path.join(self.tmp, 'project.xml')
+        with open(project, 'w') as f:
+            f.write(PROJECT)
+        mocks_file = os.path.join(self.tmp, 'mocks.json')
+        run_readyapi_to_postman(project, os.path.join(self.tmp, 'collection.json'), mock_services_file=mocks_file)
+        with open(mocks_file) as f:
+            definition = json.load(f)
+
+        accounts, rates = definition["mock_services"]
+        self.assertEqual([operation["dispatch"] for operation in accounts["operations"]], ["sequence", "default"])
+        self.assertEqual(accounts["operations"][1]["default_response"], 1)
+        self.assertEqual(rates["operations"][0]["responses"][0]["headers"],
+                         [["Content-Type", "text/xml; charset=utf-8"]])
+
+        async def exercise():
+            async with MockServer(definition, port=0) as server, PooledHTTPClient() as client:
+                base = f'http://127.0.0.1:{server.ports[0]}'
+                responses = [await client.request('GET', f'{base}/bank/accounts/{n}?verbose=1') for n in (7, 8, 9)]
+                summary = await client.request('GET', f'{base}/bank/accounts/summary')
+                rate = await client.request('POST', f'{base}/rates', [('Content-Type', 'text/xml')], ENVELOPE)
+                missing = await client.request('GET', f'{base}/bank/loans')
+                return responses, summary, rate, missing, client.connections_opened
+
+        responses, summary, rate, missing, connections = asyncio.run(exercise())
+        self.assertEqual([response.status for response in responses], [200, 410, 200])
+        self.assertEqual(responses[0].body, b'{"status": "open"}')
+        self.assertEqual(responses[0].headers['x-mock'], 'first')
+        self.assertEqual(responses[0].headers['content-type'], 'application/json')
+        self.assertEqual(summary.body, b'{"accounts": 2}')
+        self.assertEqual(rate.body, b'<rate>1.1</rate>')
+        self.assertEqual(missing.status, 404)
+        self.assertEqual(connections, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
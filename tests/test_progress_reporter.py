@@ -0,0 +1,40 @@
+import io
+import logging
+import unittest
+
+from progress_reporter import ProgressReporter
+
+
+class _Case:
+    def __init__(self, steps):
+        self.test_steps = [None] * steps
+
+
+class TestProgressReporter(unittest.TestCase):
+    def test_summary_lines_and_quiet_loggers(self):
+        quiet = logging.getLogger('progress_reporter_test')
+        quiet.setLevel(logging.INFO)
+        out = io.StringIO()
+        with ProgressReporter(10, stream=out, interval=0, quiet_loggers=[quiet.name]) as progress:
+            self.assertEqual(quiet.level, logging.WARNING)
+            convert_case = progress.track(lambda suite, case: [suite, case])
+            for steps in (4, 6):
+                self.assertEqual(len(convert_case('suite', _Case(steps))), 2)
+        self.assertEqual(quiet.level, logging.INFO)
+        self.assertEqual(progress.done, 10)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('Converting: 4/10 steps (40%)'))
+        self.assertIn('ETA', lines[0])
+        self.assertTrue(lines[-1].startswith('Converted 10/10 steps (100%)'))
+
+    def test_unknown_total(self):
+        out = io.StringIO()
+        with ProgressReporter(None, stream=out) as progress:
+            progress.advance(3)
+        self.assertTrue(out.getvalue().startswith('Converted 3 steps, '))
+
+
+if __name__ == '__main__':
+    unittest.main()
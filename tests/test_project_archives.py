@@ -0,0 +1,60 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from main_converter_runner import COLLECTION_SUFFIX, run_readyapi_to_postman
+from project_archives import list_archive_projects, project_stem
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+
+def load_collection(path):
+    with open(path) as f:
+        collection = json.load(f)
+    collection['info'].pop('_postman_id')
+    return collection
+
+
+class TestProjectArchives(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        with open(SAMPLE_PROJECT, 'rb') as f:
+            self.project = f.read()
+        self.expected = os.path.join(self.tmp, 'expected.json')
+        run_readyapi_to_postman(SAMPLE_PROJECT, self.expected)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_gzip_project(self):
+        path = os.path.join(self.tmp, 'project.xml.gz')
+        with gzip.open(path, 'wb') as f:
+            f.write(self.project)
+        for stream in (False, True):
+            output = os.path.join(self.tmp, f'out_{stream}.json')
+            run_readyapi_to_postman(path, output, stream=stream)
+            self.assertEqual(load_collection(output), load_collection(self.expected))
+
+    def test_zip_of_projects(self):
+        path = os.path.join(self.tmp, 'projects.zip')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('first.xml', self.project)
+            archive.writestr('nested/second.xml.gz', gzip.compress(self.project))
+            archive.writestr('notes.txt', 'not a project')
+        self.assertEqual(list_archive_projects(path), ['first.xml', 'nested/second.xml.gz'])
+        self.assertEqual(project_stem('nested/second.xml.gz'), 'second')
+
+        output_dir = os.path.join(self.tmp, 'out')
+        run_readyapi_to_postman(path, output_dir, os.path.join(self.tmp, 'env'))
+        for stem in ('first', 'second'):
+            collection = load_collection(os.path.join(output_dir, stem + COLLECTION_SUFFIX))
+            self.assertEqual(collection, load_collection(self.expected))
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp, 'env'))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
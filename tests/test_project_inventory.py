@@ -0,0 +1,92 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from project_inventory import count_steps, scan_test_case_runs, take_archive_inventories, take_inventory
+from readyapi_project_parser import ProjectFilter, parse_project_file
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+INLINE_PROJECT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Inline">
+  <con:testSuite name="Suite">
+    <con:testCase name="Case">
+      <con:testStep type="groovy" name="Script">
+        <con:config><script><![CDATA[// <con:testStep type="groovy"/>
+log.info("one")
+log.info("two")]]></script></con:config>
+      </con:testStep>
+      <con:testStep type="delay" name="Wait"/>
+      <con:testStep type="groovy" name="Off" disabled="true"/>
+    </con:testCase>
+  </con:testSuite>
+</con:soapui-project>
+"""
+
+
+class TestProjectInventory(unittest.TestCase):
+    def test_sample_project(self):
+        inventory = take_inventory(SAMPLE_PROJECT)
+        self.assertEqual((inventory.suites, inventory.cases), (2, 3))
+        self.assertEqual(dict(inventory.step_types), {'groovy': 4, 'restrequest': 1, 'properties': 1})
+        self.assertEqual(sum(inventory.interface_types.values()), 3)
+        self.assertEqual(inventory.resources, 9)
+        self.assertEqual((inventory.groovy_scripts, inventory.groovy_lines), (4, 151))
+        seconds, output_bytes = inventory.estimate()
+        self.assertGreater(seconds, 0)
+        self.assertGreater(output_bytes, 0)
+
+    def test_markup_in_scripts_and_disabled_steps(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'inline.xml.gz')
+            with gzip.open(path, 'wb') as f:
+                f.write(INLINE_PROJECT)
+            inventory = take_inventory(path)
+        finally:
+            shutil.rmtree(tmp)
+        self.assertEqual(dict(inventory.step_types), {'groovy': 1, 'delay': 1})
+        self.assertEqual(dict(inventory.disabled_steps), {'groovy': 1})
+        self.assertEqual(inventory.groovy_lines, 3)
+        counts = inventory.conversion_counts()
+        self.assertEqual(counts['disabled'], 1)
+        self.assertEqual(counts['converted'] + counts['optional'] + counts['skipped'] + counts['unsupported'], 2)
+
+    def test_count_steps_matches_parsed_steps(self):
+        for project_filter in (ProjectFilter(), ProjectFilter(include_step_types=['groovy']),
+                               ProjectFilter(suites=['Cashback*'], cases=['TC_*'])):
+            project = parse_project_file(SAMPLE_PROJECT, project_filter=project_filter)
+            parsed = sum(len(case.test_steps) for suite in project.test_suites for case in suite.test_cases)
+            self.assertEqual(count_steps(SAMPLE_PROJECT, project_filter), parsed, project_filter)
+
+    def test_gzip_and_zip_projects_are_scanned_in_chunks(self):
+        expected = take_inventory(SAMPLE_PROJECT).to_dict()
+        tmp = tempfile.mkdtemp()
+        try:
+            gz_path = os.path.join(tmp, 'project.xml.gz')
+            with open(SAMPLE_PROJECT, 'rb') as f, gzip.open(gz_path, 'wb') as gz:
+                gz.write(f.read())
+            zip_path = os.path.join(tmp, 'projects.zip')
+            with zipfile.ZipFile(zip_path, 'w') as archive:
+                archive.write(SAMPLE_PROJECT, 'a/project.xml')
+                archive.write(gz_path, 'b/project.xml.gz')
+            # Chunks far smaller than the project, and than some of its scripts
+            with mock.patch('project_inventory._CHUNK_BYTES', 4096), mock.patch('project_inventory._CHUNK_OVERLAP', 1024):
+                gz_inventory = take_inventory(gz_path).to_dict()
+                self.assertEqual(count_steps(gz_path), count_steps(SAMPLE_PROJECT))
+                self.assertEqual(scan_test_case_runs(gz_path), scan_test_case_runs(SAMPLE_PROJECT))
+                archive_inventories = [inventory.to_dict() for inventory in take_archive_inventories(zip_path)]
+        finally:
+            shutil.rmtree(tmp)
+        self.assertEqual({**gz_inventory, "path": SAMPLE_PROJECT}, expected)
+        self.assertEqual([inventory.pop("path") for inventory in archive_inventories],
+                         [os.path.join(zip_path, 'a/project.xml'), os.path.join(zip_path, 'b/project.xml.gz')])
+        self.assertEqual(archive_inventories, [{k: v for k, v in expected.items() if k != "path"}] * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
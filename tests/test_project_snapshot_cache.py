@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import project_snapshot_cache
+from project_snapshot_cache import ProjectSnapshotCache, parse_project_file_cached
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+
+class TestProjectSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp, 'cache')
+        self.project_path = os.path.join(self.tmp, 'project.xml')
+        shutil.copy(SAMPLE_PROJECT, self.project_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def snapshots(self):
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_unchanged_input_skips_parsing(self):
+        first = parse_project_file_cached(self.project_path, self.cache_dir)
+        with mock.patch.object(project_snapshot_cache, 'parse_project_file') as parse:
+            second = parse_project_file_cached(self.project_path, self.cache_dir)
+        parse.assert_not_called()
+        self.assertEqual(second.name, first.name)
+        self.assertEqual(
+            [s.config for suite in second.test_suites for case in suite.test_cases for s in case.test_steps],
+            [s.config for suite in first.test_suites for case in suite.test_cases for s in case.test_steps],
+        )
+
+    def test_changed_input_replaces_stale_snapshot(self):
+        parse_project_file_cached(self.project_path, self.cache_dir)
+        before = self.snapshots()
+        with open(self.project_path, 'a') as f:
+            f.write('\n<!-- edited -->\n')
+        parse_project_file_cached(self.project_path, self.cache_dir)
+        after = self.snapshots()
+        self.assertEqual(len(before), 1)
+        self.assertEqual(len(after), 1)
+        self.assertNotEqual(before, after)
+
+    def test_parse_options_are_part_of_the_key(self):
+        cache = ProjectSnapshotCache(self.cache_dir)
+        self.assertEqual(cache.key_for(self.project_path), cache.key_for(self.project_path, {}))
+        self.assertNotEqual(cache.key_for(self.project_path), cache.key_for(self.project_path, {'suites': ['A']}))
+
+    def test_cache_is_bounded(self):
+        for index in range(4):
+            path = os.path.join(self.tmp, f'project_{index}.xml')
+            shutil.copy(SAMPLE_PROJECT, path)
+            parse_project_file_cached(path, self.cache_dir, max_entries=2)
+        self.assertEqual(len(self.snapshots()), 2)
+
+    def test_unreadable_snapshot_is_discarded(self):
+        cache = ProjectSnapshotCache(self.cache_dir)
+        key = cache.key_for(self.project_path)
+        with open(cache._snapshot_path(self.project_path, key), 'wb') as f:
+            f.write(b'not a pickle')
+        with self.assertLogs('project_snapshot_cache', level='WARNING'):
+            self.assertIsNone(cache.load(self.project_path, key))
+        self.assertEqual(self.snapshots(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from converters.property_transfer_converter import compile_json_path, compile_property_transfers, compile_xpath
+from main_converter_runner import convert_test_case
+from readyapi_project_parser import parse_project_bytes
+
+PROJECT = """<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Transfers">
+  <con:testSuite name="Suite">
+    <con:testCase name="Case">
+      <con:testStep type="restrequest" name="Login">
+        <con:config service="svc" resourcePath="/login" methodName="POST">
+          <con:restRequest name="Login" method="POST">
+            <con:endpoint>https://api.example.com</con:endpoint>
+            <con:request>{"user": "u"}</con:request>
+          </con:restRequest>
+        </con:config>
+      </con:testStep>
+      <con:testStep type="transfer" name="Take token">
+        <con:config xsi:type="con:PropertyTransfersStep" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+          <con:transfers setNullOnMissingSource="true">
+            <con:name>token</con:name>
+            <con:sourceType>Response</con:sourceType>
+            <con:sourceStep>Login</con:sourceStep>
+            <con:sourcePath>$.data.token</con:sourcePath>
+            <con:targetType>token</con:targetType>
+            <con:targetStep>#Project#</con:targetStep>
+            <con:type>JSONPATH</con:type>
+          </con:transfers>
+          <con:transfers>
+            <con:name>user id</con:name>
+            <con:sourceType>Response</con:sourceType>
+            <con:sourceStep>Login</con:sourceStep>
+            <con:sourcePath>$.data.users[0]['user-id']</con:sourcePath>
+            <con:targetType>userId</con:targetType>
+            <con:targetStep>#TestCase#</con:targetStep>
+            <con:type>JSONPATH</con:type>
+          </con:transfers>
+          <con:transfers>
+            <con:name>copy env</con:name>
+            <con:sourceType>env</con:sourceType>
+            <con:sourceStep>#Project#</con:sourceStep>
+            <con:targetType>environment</con:targetType>
+            <con:targetStep>#TestCase#</con:targetStep>
+          </con:transfers>
+        </con:config>
+      </con:testStep>
+    </con:testCase>
+  </con:testSuite>
+</con:soapui-project>
+"""
+
+
+class TestPropertyTransferConverter(unittest.TestCase):
+    def test_paths(self):
+        self.assertEqual(compile_json_path("$.data.users[0]['user-id']"), 'json?.data?.users?.[0]?.["user-id"]')
+        self.assertIsNone(compile_json_path('$..id'))
+        self.assertEqual(compile_xpath("declare namespace ns='urn:x'; //ns:item[2]/@code"),
+                         [[True, 'item', 2], [False, '@code', 0]])
+        self.assertIsNone(compile_xpath('//item[last()]'))
+
+    def test_no_script_when_nothing_compiles(self):
+        transfer = {"name": "all ids", "from_step": "Login", "from_property": "Response", "from_path": "$..id",
+                    "path_language": "JSONPATH", "to_step": "#Project#", "to_property": "ids", "to_path": ""}
+        with self.assertLogs('converters.property_transfer_converter', 'WARNING'):
+            self.assertEqual(compile_property_transfers([transfer]), [])
+
+    def test_transfers_compile_into_source_request(self):
+        test_suite = parse_project_bytes(PROJECT.encode('utf-8')).test_suites[0]
+        steps = convert_test_case(test_suite, test_suite.test_cases[0])
+
+        # No item for the transfer step; one pass over the login response sets every target
+        self.assertEqual([step["name"] for step in steps], ["Login"])
+        script = "\n".join(steps[0]["event"][0]["script"]["exec"])
+        self.assertEqual(script.count("pm.response.text()"), 1)
+        self.assertEqual(script.count("JSON.parse"), 1)
+        self.assertIn('pm.environment.set("token", json?.data?.token);', script)
+        self.assertIn('pm.environment.set("userId", json?.data?.users?.[0]?.["user-id"]);', script)
+        self.assertIn('pm.environment.set("environment", pm.environment.get("env"));', script)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+import os
+import pickle
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from readyapi_project_parser import (
+    CONFIG_COMPRESS_THRESHOLD,
+    ProjectFilter,
+    ReadyAPIProject,
+    ReadyAPITestStep,
+    StepConfigRef,
+    parse_project_file,
+)
+from readyapi_xml_scanner import scan_element_spans
+
+CDATA_PROJECT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Cdata">
+  <con:testSuite name="Suite">
+    <con:testCase name="Case">
+      <con:testStep type="groovy" name="Script">
+        <con:config><script><![CDATA[log.info "<con:testStep name='fake'>"]]></script></con:config>
+      </con:testStep>
+      <con:testStep type="jdbc" name="Query" disabled="true">
+        <con:config><query>SELECT 1 WHERE a > b</query></con:config>
+      </con:testStep>
+      <con:testStep type="delay" name="Empty"/>
+    </con:testCase>
+  </con:testSuite>
+</con:soapui-project>
+"""
+
+
+def describe(project):
+    return [
+        (suite.name, case.name, case.properties, step.step_type, step.name, step.properties,
+         step.config if isinstance(step.config, str) else ET.tostring(step.config))
+        for suite in project.test_suites for case in suite.test_cases for step in case.test_steps
+    ]
+
+
+def iter_steps(project):
+    for suite in project.test_suites:
+        for case in suite.test_cases:
+            yield from case.test_steps
+
+SAMPLE_PROJECT = 'input_files/ready_api_project.xml'
+
+
+class TestProjectModel(unittest.TestCase):
+    def test_models_have_no_instance_dict(self):
+        step = ReadyAPITestStep('groovy', 'Setup', '<config/>')
+        project = ReadyAPIProject('Project')
+        self.assertFalse(hasattr(step, '__dict__'))
+        self.assertFalse(hasattr(project, '__dict__'))
+        with self.assertRaises(AttributeError):
+            step.unexpected = True
+
+    def test_text_config_round_trips(self):
+        small = '<config><script>log.info "hi"</script></config>'
+        large = '<config><script>' + 'x' * CONFIG_COMPRESS_THRESHOLD * 4 + '</script></config>'
+        for config in (small, large):
+            step = ReadyAPITestStep('groovy', 'Step', config)
+            self.assertIsInstance(step._config, bytes)
+            self.assertEqual(step.config, config)
+        self.assertLess(len(ReadyAPITestStep('groovy', 'Step', large)._config), len(large))
+
+    def test_element_config_round_trips(self):
+        element = ET.fromstring('<config attr="1">text</config>')
+        step = ReadyAPITestStep('delay', 'Wait', element)
+        config = step.config
+        self.assertIsInstance(config, ET.Element)
+        self.assertEqual(config.get('attr'), '1')
+        self.assertEqual(config.text, 'text')
+
+    def test_properties_field_defaults_to_none(self):
+        self.assertIsNone(ReadyAPITestStep('groovy', 'Step', None).properties)
+        step = ReadyAPITestStep('PropertiesStep', 'InputData', None, properties={'env': 'DEV'})
+        self.assertEqual(step.properties, {'env': 'DEV'})
+
+    def test_names_are_interned(self):
+        a = ReadyAPITestStep(''.join(['rest', 'request']), ''.join(['sum', 'mary']), None)
+        b = ReadyAPITestStep(''.join(['rest', 'request']), ''.join(['sum', 'mary']), None)
+        self.assertIs(a.step_type, b.step_type)
+        self.assertIs(a.name, b.name)
+
+
+class TestParseProjectFile(unittest.TestCase):
+    def setUp(self):
+        self.project = parse_project_file(SAMPLE_PROJECT)
+
+    def test_structure(self):
+        self.assertEqual(self.project.name, 'Mobiliser_AvionRewards_RegressionSuite')
+        self.assertEqual([s.name for s in self.project.test_suites], ['LibraryFunctions', 'CashbackAndSaving'])
+        case = self.project.test_suites[1].test_cases[0]
+        self.assertEqual([s.name for s in case.test_steps], ['InSetup', 'RunTest', 'summary', 'InputData'])
+        self.assertIn('restRequest', case.test_steps[2].config)
+
+    def test_project_pickles(self):
+        restored = pickle.loads(pickle.dumps(self.project))
+        original_steps = [s.config for suite in self.project.test_suites
+                          for case in suite.test_cases for s in case.test_steps]
+        restored_steps = [s.config for suite in restored.test_suites
+                          for case in suite.test_cases for s in case.test_steps]
+        self.assertEqual(original_steps, restored_steps)
+
+
+
+class TestLazyConfigs(unittest.TestCase):
+    def setUp(self):
+        self.eager = parse_project_file(SAMPLE_PROJECT)
+        self.lazy = parse_project_file(SAMPLE_PROJECT, lazy_configs=True)
+
+    def tearDown(self):
+        self.lazy.close()
+
+    def test_configs_are_deferred_until_accessed(self):
+        steps = list(iter_steps(self.lazy))
+        deferred = [s for s in steps if isinstance(s._config, StepConfigRef)]
+        self.assertTrue(deferred)
+        self.assertIn('restRequest', deferred[-1].config)
+        self.assertNotIsInstance(deferred[-1]._config, StepConfigRef)
+
+    def test_lazy_parse_matches_eager_parse(self):
+        self.assertEqual(describe(self.lazy), describe(self.eager))
+        self.assertEqual(self.lazy.properties, self.eager.properties)
+
+    def test_lazy_project_pickles(self):
+        restored = pickle.loads(pickle.dumps(self.lazy))
+        self.assertEqual([s.config for s in iter_steps(restored)], [s.config for s in iter_steps(self.eager)])
+        self.assertIsNone(restored.buffer)
+
+    def test_close_releases_the_memory_map(self):
+        buffer = self.lazy.buffer
+        self.assertFalse(buffer.closed)
+        with self.lazy:
+            pass
+        self.assertTrue(buffer.closed)
+        self.assertIsNone(self.lazy.buffer)
+        self.assertIsNone(self.eager.buffer)
+
+    def test_scanner_skips_cdata_and_handles_self_closing_steps(self):
+        spans = scan_element_spans(CDATA_PROJECT, 'con:testStep')
+        self.assertEqual(len(spans), 3)
+        self.assertTrue(spans[2].self_closing)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cdata.xml')
+            with open(path, 'wb') as f:
+                f.write(CDATA_PROJECT)
+            with parse_project_file(path, lazy_configs=True) as project:
+                steps = list(iter_steps(project))
+                self.assertEqual([s.name for s in steps], ['Script', 'Query'])
+                self.assertIn('fake', steps[0].config)
+                self.assertIn('a &gt; b', steps[1].config)
+
+
+
+class TestParallelParsing(unittest.TestCase):
+    def test_parallel_parse_matches_serial_parse(self):
+        serial = parse_project_file(SAMPLE_PROJECT)
+        parallel = parse_project_file(SAMPLE_PROJECT, workers=2)
+        self.assertEqual(describe(parallel), describe(serial))
+        self.assertEqual(list(parallel.properties.items()), list(serial.properties.items()))
+        self.assertEqual([i.path for i in parallel.interfaces], [i.path for i in serial.interfaces])
+
+    def test_single_suite_falls_back_to_serial(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cdata.xml')
+            with open(path, 'wb') as f:
+                f.write(CDATA_PROJECT)
+            with self.assertLogs('readyapi_project_parser', level='WARNING'):
+                project = parse_project_file(path, workers=2)
+        self.assertEqual([s.name for s in iter_steps(project)], ['Script', 'Query'])
+
+
+class TestProjectFilter(unittest.TestCase):
+    def test_patterns(self):
+        project_filter = ProjectFilter(suites=['Cash*'], cases=['re:TC_0[12]_.*'], exclude_step_types=['groovy'])
+        self.assertTrue(project_filter.keeps_suite('CashbackAndSaving'))
+        self.assertFalse(project_filter.keeps_suite('LibraryFunctions'))
+        self.assertTrue(project_filter.keeps_case('TC_02_Login'))
+        self.assertFalse(project_filter.keeps_case('TC_03_Login'))
+        self.assertFalse(project_filter.keeps_step({'type': 'groovy'}))
+        self.assertTrue(project_filter.keeps_step({'type': 'restrequest'}))
+        self.assertFalse(project_filter.keeps_step({'type': 'restrequest', 'disabled': 'true'}))
+
+    def test_filtered_parse_matches_across_modes(self):
+        project_filter = ProjectFilter(suites=['Cashback*'], cases=['TC_01*'], exclude_step_types=['groovy'])
+        eager = parse_project_file(SAMPLE_PROJECT, project_filter=project_filter)
+        self.assertEqual({s.name for s in eager.test_suites}, {'CashbackAndSaving'})
+        self.assertTrue(all(c.name.startswith('TC_01') for s in eager.test_suites for c in s.test_cases))
+        self.assertNotIn('groovy', {step.step_type for step in iter_steps(eager)})
+        for options in ({'lazy_configs': True}, {'workers': 2}):
+            filtered = parse_project_file(SAMPLE_PROJECT, project_filter=project_filter, **options)
+            self.assertEqual(describe(filtered), describe(eager))
+            self.assertEqual(list(filtered.properties.items()), list(eager.properties.items()))
+
+    def test_disabled_steps_are_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cdata.xml')
+            with open(path, 'wb') as f:
+                f.write(CDATA_PROJECT)
+            for lazy_configs in (False, True):
+                project = parse_project_file(path, lazy_configs=lazy_configs, project_filter=ProjectFilter())
+                self.assertEqual([s.name for s in iter_steps(project)], ['Script'])
+            project = parse_project_file(path, project_filter=ProjectFilter(skip_disabled=False))
+            self.assertEqual([s.name for s in iter_steps(project)], ['Script', 'Query'])
+
+
+COMPOSITE_FILES = {
+    'settings.xml': '<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Composite">'
+                    '<con:properties><con:property><con:name>env</con:name><con:value>DEV</con:value>'
+                    '</con:property></con:properties></con:soapui-project>',
+    'element.order': 'Zeta\nService.xml\nAlpha\n',
+    'Service.xml': '<con:interface xmlns:con="http://eviware.com/soapui/config" '
+                   'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:type="con:RestService" name="Service">'
+                   '<con:resource name="items" path="/items"><con:method method="GET">'
+                   '<con:request name="Get"><con:endpoint>https://example.com</con:endpoint></con:request>'
+                   '</con:method></con:resource></con:interface>',
+    'Zeta/settings.xml': '<con:testSuite xmlns:con="http://eviware.com/soapui/config" name="Zeta"/>',
+    'Zeta/element.order': 'Second.xml\nFirst.xml\n',
+    'Alpha/settings.xml': '<con:testSuite xmlns:con="http://eviware.com/soapui/config" name="Alpha"/>',
+}
+for suite, case in (('Zeta', 'First'), ('Zeta', 'Second'), ('Alpha', 'Only')):
+    COMPOSITE_FILES[f'{suite}/{case}.xml'] = (
+        f'<con:testCase xmlns:con="http://eviware.com/soapui/config" name="{case}">'
+        f'<con:testStep type="groovy" name="{case}Step"><con:config><script>1</script></con:config></con:testStep>'
+        f'</con:testCase>')
+
+
+class TestCompositeProject(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.project_dir = self.tmp.name
+        for name, content in COMPOSITE_FILES.items():
+            path = os.path.join(self.project_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_files_are_merged_in_project_order(self):
+        project = parse_project_file(self.project_dir)
+        self.assertEqual(project.name, 'Composite')
+        self.assertEqual([(s.name, [c.name for c in s.test_cases]) for s in project.test_suites],
+                         [('Zeta', ['Second', 'First']), ('Alpha', ['Only'])])
+        self.assertEqual([i.path for i in project.interfaces], ['/items'])
+        self.assertEqual(project.properties, {'env': 'DEV'})
+
+        parallel = parse_project_file(self.project_dir, workers=2)
+        self.assertEqual(describe(parallel), describe(project))
+        filtered = parse_project_file(self.project_dir, project_filter=ProjectFilter(cases=['First', 'Only']))
+        self.assertEqual([s.name for s in iter_steps(filtered)], ['FirstStep', 'OnlyStep'])
+
+
+if __name__ == '__main__':
+    unittest.main()
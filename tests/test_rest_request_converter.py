@@ -0,0 +1,131 @@
+import json
+import shutil
+import subprocess
+import unittest
+
+from converters.assertion_runtime import ASSERTION_RUNTIME, RUNTIME_ACCESS
+from converters.rest_request_converter import convert_rest_request
+from main_converter_runner import build_collection_for_project
+from postman_collection_builder import extract_global_scripts
+from readyapi_project_parser import parse_project_bytes
+
+CONFIG = """<con:config xmlns:con="http://eviware.com/soapui/config">
+  <con:restRequest method="GET">
+    <con:endpoint>https://api.example.com</con:endpoint>
+    <con:request/>
+    <con:assertion type="Valid HTTP Status Codes" codes="200,201"/>
+    <con:assertion type="Simple Contains" content="it's &quot;done&quot;"/>
+    <con:assertion type="Simple Contains" content="second"/>
+  </con:restRequest>
+</con:config>"""
+
+PATH_CONFIG = """<con:config xmlns:con="http://eviware.com/soapui/config">
+  <con:restRequest method="GET">
+    <con:endpoint>https://api.example.com</con:endpoint>
+    <con:request/>
+    <con:assertion type="JsonPath Count" name="Items">
+      <con:configuration><path>$.items[*]</path><content>2</content></con:configuration>
+    </con:assertion>
+    <con:assertion type="XPath Match" name="Status">
+      <con:configuration>
+        <path>declare namespace ns='urn:x'; //ns:status</path><content>O*</content><allowWildcards>true</allowWildcards>
+      </con:configuration>
+    </con:assertion>
+  </con:restRequest>
+</con:config>"""
+
+SCHEMA_PROJECT = """<con:soapui-project xmlns:con="http://eviware.com/soapui/config"
+    xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" name="Pets">
+  <con:interface xsi:type="con:RestService" name="Pet Store" type="rest_ex">
+    <con:definitionCache type="TEXT" rootPart="file:/pets.json">
+      <con:part>
+        <con:url>file:/pets.json</con:url>
+        <con:content><![CDATA[{"openapi": "3.0.0", "paths": {"/pets/{id}": {"get": {"responses": {"200": {
+          "content": {"application/json": {"schema": {"type": "object", "required": ["id"]}}}}}}}}}]]></con:content>
+      </con:part>
+    </con:definitionCache>
+    <con:resource name="Pet" path="/pets/{id}">
+      <con:method name="getPet" method="GET"><con:request name="Request 1" mediaType="application/json"/></con:method>
+    </con:resource>
+  </con:interface>
+  <con:testSuite name="Suite">
+    <con:testCase name="Case">
+      %s
+    </con:testCase>
+  </con:testSuite>
+</con:soapui-project>""" % "".join(f"""
+      <con:testStep type="restrequest" name="Get pet {i}">
+        <con:config service="Pet Store" resourcePath="/pets/{{id}}" methodName="getPet">
+          <con:restRequest name="Get pet {i}" method="GET">
+            <con:endpoint>https://pets.example.com</con:endpoint>
+            <con:assertion type="JSON Schema Compliance" name="Schema"/>
+          </con:restRequest>
+        </con:config>
+      </con:testStep>""" for i in range(2))
+
+
+class _TestStep:
+    name = "Get items"
+    config = CONFIG
+
+
+class _PathTestStep:
+    name = "Get status"
+    config = PATH_CONFIG
+
+
+class TestRestRequestConverter(unittest.TestCase):
+    def test_optimized_test_script(self):
+        annotated = convert_rest_request(_TestStep())["event"][0]["script"]["exec"]
+        optimized = convert_rest_request(_TestStep(), optimized_scripts=True)["event"][0]["script"]["exec"]
+        script = "\n".join(optimized)
+
+        self.assertEqual("\n".join(annotated).count("pm.response.text()"), 2)
+        self.assertEqual(script.count("pm.response.text()"), 1)
+        self.assertEqual(script.count("JSON.parse"), 1)
+        self.assertEqual(script.count("pm.test("), 1)
+        self.assertIn("pm.expect([200, 201], 'Status code check').to.include(pm.response.code);", script)
+        self.assertIn("""to.include("it's \\"done\\"");""", script)
+
+    def test_path_assertions_use_collection_runtime(self):
+        request = convert_rest_request(_PathTestStep(), optimized_scripts=True)
+        script = "\n".join(request["event"][0]["script"]["exec"])
+
+        self.assertIn('pm.expect(readyapi.jsonPath(json, "$.items[*]").length, "Items: $.items[*]").to.equal(2);', script)
+        self.assertIn('readyapi.text(readyapi.xpath(xml, "//ns:status"))', script)
+        self.assertIn('to.match(readyapi.pattern("^O[\\\\s\\\\S]*$"))', script)
+        self.assertEqual(script.count("pm.response.text()"), 1)
+
+        # Installed once, from the collection pre-request script
+        annotated = convert_rest_request(_PathTestStep())
+        events = extract_global_scripts([request, annotated])
+        self.assertEqual([event["listen"] for event in events], ["prerequest", "test"])
+        self.assertEqual(events[0]["script"]["exec"], ASSERTION_RUNTIME)
+
+    def test_schema_compliance_embeds_definition_once(self):
+        project = parse_project_bytes(SCHEMA_PROJECT.encode('utf-8'))
+        _, collection = build_collection_for_project(project)
+
+        variables = {variable["key"]: variable["value"] for variable in collection["variable"]}
+        self.assertEqual(json.loads(variables["schema Pet Store"])["openapi"], "3.0.0")
+        self.assertEqual(len(collection["variable"]), 2)
+        requests = collection["item"][0]["item"][0]["item"]
+        script = "\n".join(requests[1]["event"][0]["script"]["exec"])
+        self.assertIn('readyapi.validate(json, pm.response.code, "schema Pet Store", "/pets/{id}", "get", '
+                      '() => pm.collectionVariables.get("schema Pet Store"))', script)
+        prerequest = collection["event"][0]["script"]["exec"]
+        self.assertEqual(prerequest, ASSERTION_RUNTIME)
+
+    @unittest.skipIf(shutil.which("node") is None, "needs node")
+    def test_runtime_is_installed_on_the_global_object_only(self):
+        script = "\n".join(ASSERTION_RUNTIME + [
+            f"const readyapi = {RUNTIME_ACCESS};",
+            "console.log(JSON.stringify(['readyapiAssertions' in {}, readyapi.jsonPath({a: [1, 2]}, '$.a[1]')]));",
+        ])
+        result = subprocess.run(["node", "-e", script], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(json.loads(result.stdout), [False, [2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
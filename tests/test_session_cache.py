@@ -0,0 +1,46 @@
+import unittest
+
+from converters.session_cache import SESSION_CACHE
+from main_converter_runner import build_collection_for_project
+from readyapi_project_parser import parse_project_bytes
+
+PROJECT = """<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Bank">
+  <con:testSuite name="Suite">
+    %s
+  </con:testSuite>
+</con:soapui-project>""" % "".join(f"""
+    <con:testCase name="Case {i}">
+      <con:testStep type="groovy" name="InSetup">
+        <con:config><script>def testSessionID = RT.SignInAvion(cardNumber, env)</script></con:config>
+      </con:testStep>
+      <con:testStep type="restrequest" name="Balance">
+        <con:config service="svc" methodName="Balance">
+          <con:restRequest name="Balance" method="GET"><con:endpoint>http://api.example.com/balance</con:endpoint></con:restRequest>
+        </con:config>
+      </con:testStep>
+    </con:testCase>""" for i in range(3))
+
+
+class TestSessionCache(unittest.TestCase):
+    def test_sign_in_steps_share_one_cached_session(self):
+        project = parse_project_bytes(PROJECT.encode('utf-8'))
+        _, collection = build_collection_for_project(project)
+
+        # The sign-in script runs before the next request, with no request item of its own
+        cases = collection["item"][0]["item"]
+        self.assertEqual([[item["name"] for item in case["item"]] for case in cases], [["Balance"]] * 3)
+        for case in cases:
+            events = {event["listen"]: event["script"]["exec"] for event in case["item"][0]["event"]}
+            self.assertIn("pm.test('SignIn passed'", "\n".join(events["test"]))
+            script = "\n".join(events["prerequest"])
+            self.assertIn("const testSessionID = pm.collectionVariables.get('readyapiSession');", script)
+            self.assertNotIn("JSESSIONID=", script)
+
+        # Signing in happens once, in the collection pre-request script
+        prerequest = collection["event"][0]["script"]["exec"]
+        self.assertEqual(prerequest[:len(SESSION_CACHE)], SESSION_CACHE)
+        self.assertEqual("\n".join(prerequest).count("pm.sendRequest("), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from main_converter_runner import run_readyapi_to_postman
+from postman_collection_builder import setup_test_cases_of
+from project_inventory import scan_test_case_runs
+from test_conversion_pipeline import without_ids
+
+PROJECT = """<con:soapui-project xmlns:con="http://eviware.com/soapui/config" name="Bank">
+  <con:testSuite name="Checks">
+    <con:testCase id="case-balance" name="Balance">
+      <con:testStep type="calltestcase" name="Run Login">
+        <con:config><con:targetTestCase>case-login</con:targetTestCase></con:config>
+      </con:testStep>
+      <con:testStep type="groovy" name="Verify">
+        <con:config><script>assert testRunner.testCase.testSuite.project.testSuites["Library"].testCases["Audit"].status != null</script></con:config>
+      </con:testStep>
+      <con:testStep type="restrequest" name="Balance">
+        <con:config service="svc" methodName="Balance">
+          <con:restRequest name="Balance" method="GET"><con:endpoint>http://api.example.com/balance</con:endpoint></con:restRequest>
+        </con:config>
+      </con:testStep>
+    </con:testCase>
+  </con:testSuite>
+  <con:testSuite name="Library">
+    <con:testCase id="case-data" name="Seed Data">
+      <con:testStep type="groovy" name="Seed">
+        <con:config><script>log.info "seeding"</script></con:config>
+      </con:testStep>
+      <con:testStep type="restrequest" name="Seed Accounts">
+        <con:config service="svc" methodName="Seed Accounts">
+          <con:restRequest name="Seed Accounts" method="GET"><con:endpoint>http://api.example.com/seed</con:endpoint></con:restRequest>
+        </con:config>
+      </con:testStep>
+    </con:testCase>
+    <con:testCase id="case-login" name="Login">
+      <con:testStep type="groovy" name="Prepare">
+        <con:config><script>testRunner.testCase.testSuite.testCases["Seed Data"].run(null, false)</script></con:config>
+      </con:testStep>
+      <con:testStep type="restrequest" name="Sign In">
+        <con:config service="svc" methodName="Sign In">
+          <con:restRequest name="Sign In" method="GET"><con:endpoint>http://api.example.com/login</con:endpoint></con:restRequest>
+        </con:config>
+      </con:testStep>
+    </con:testCase>
+    <con:testCase id="case-audit" name="Audit">
+      <con:testStep type="restrequest" name="Audit Log">
+        <con:config service="svc" methodName="Audit Log">
+          <con:restRequest name="Audit Log" method="GET"><con:endpoint>http://api.example.com/audit</con:endpoint></con:restRequest>
+        </con:config>
+      </con:testStep>
+    </con:testCase>
+  </con:testSuite>
+</con:soapui-project>"""
+
+
+class TestSetupCases(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.project = os.path.join(self.tmp, 'project.xml')
+        with open(self.project, 'w') as f:
+            f.write(PROJECT)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def convert(self, name, **options):
+        output = os.path.join(self.tmp, name)
+        run_readyapi_to_postman(self.project, output, **options)
+        with open(output) as f:
+            return without_ids(json.load(f))
+
+    def test_cases_run_by_others_run_first_in_dependency_order(self):
+        collection = self.convert('collection.json')
+
+        setup, checks = collection['item'][:2]
+        self.assertEqual(setup['name'], 'Setup')
+        self.assertEqual([case['name'] for case in setup['item']], ['Seed Data', 'Login'])
+        self.assertEqual(setup['item'][1]['description'], 'Test case: Login, from test suite: Library')
+        # Run TestCase and Groovy steps become no item
+        self.assertEqual(checks['name'], 'Checks')
+        self.assertEqual([step['name'] for step in checks['item'][0]['item']], ['Balance'])
+        # Audit is only checked by a script, not run, so it stays in its suite
+        self.assertEqual([(item['name'], [case['name'] for case in item['item']]) for item in collection['item'][2:]],
+                         [('Library', ['Audit'])])
+
+    def test_streaming_and_spilling_hoist_the_same_cases(self):
+        expected = self.convert('collection.json')
+        self.assertEqual(self.convert('streamed.json', stream=True), expected)
+        self.assertEqual(self.convert('spilled.json', memory_budget=0), expected)
+
+    def test_project_scan_finds_the_setup_cases_before_conversion(self):
+        markers, test_cases = scan_test_case_runs(self.project)
+        self.assertEqual(setup_test_cases_of(markers), [('Library', 'Seed Data'), ('Library', 'Login')])
+        self.assertEqual(len(test_cases), 4)
+
+        # With the Library suite first, --stream writes the Checks folder as soon as it is converted
+        checks = PROJECT.index('  <con:testSuite name="Checks">')
+        library = PROJECT.index('  <con:testSuite name="Library">')
+        end = PROJECT.index('</con:soapui-project>')
+        with open(self.project, 'w') as f:
+            f.write(PROJECT[:checks] + PROJECT[library:end] + PROJECT[checks:library] + PROJECT[end:])
+        expected = self.convert('collection.json')
+        self.assertEqual([item['name'] for item in expected['item'][:3]], ['Setup', 'Library', 'Checks'])
+        self.assertEqual(self.convert('streamed.json', stream=True), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()